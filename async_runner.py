@@ -0,0 +1,262 @@
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+from battle_v2 import BattleState, ActionType, step
+from bench_harness import (
+    AgentSpec, parse_agent_spec, get_worker_agent, initial_state, default_workers,
+    percentiles, wilson_interval
+)
+
+# Agents cheap enough to answer on the event loop itself
+INLINE_AGENTS = ("random", "greedy")
+
+
+class AsyncAgent:
+    async def choose_action(self, state: BattleState, player_id: int) -> ActionType:
+        raise NotImplementedError
+
+    async def close(self):
+        # Called once the game is over
+        pass
+
+
+def _stop_ponder(agent):
+    stop_ponder = getattr(agent, "stop_ponder", None)
+    if stop_ponder is not None:
+        stop_ponder()
+
+
+class InlineAgent(AsyncAgent):
+    # A synchronous agent that answers in microseconds (Random, Greedy)
+
+    def __init__(self, agent):
+        self.agent = agent
+
+    async def choose_action(self, state: BattleState, player_id: int) -> ActionType:
+        return self.agent.choose_action(state, player_id)
+
+    async def close(self):
+        _stop_ponder(self.agent)
+
+
+class ExecutorAgent(AsyncAgent):
+    # Runs a synchronous agent in a thread executor. The agent object is used
+    # by one game only, so per-game state (pondering, opponent models) works;
+    # close() stops the ponder thread when the game ends. The threads share
+    # the GIL: this overlaps search with waiting, it does not add CPU.
+
+    def __init__(self, agent, executor: Optional[Executor] = None):
+        self.agent = agent
+        self.executor = executor
+
+    async def choose_action(self, state: BattleState, player_id: int) -> ActionType:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.agent.choose_action, state, player_id)
+
+    async def close(self):
+        # Joining the ponder thread blocks, so it runs off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, _stop_ponder, self.agent)
+
+
+def _choose_action_task(spec: AgentSpec, player_id: int, state: BattleState) -> ActionType:
+    # Reseeded per move, so a game's moves do not depend on which worker ran
+    # them or on how the games were interleaved
+    random.seed(state.rng_seed * 1000 + state.turn_number * 2 + player_id)
+    return get_worker_agent(spec, player_id).choose_action(state, player_id)
+
+
+class ProcessPoolAgent(AsyncAgent):
+    # Runs each search in a process pool worker on that worker's cached agent
+    # for the spec. Moves of one game can land on different workers and
+    # workers interleave games, so the agent must not carry state between
+    # moves (use ExecutorAgent for pondering or opponent models).
+
+    def __init__(self, spec: AgentSpec, executor: ProcessPoolExecutor):
+        self.spec = spec
+        self.executor = executor
+
+    async def choose_action(self, state: BattleState, player_id: int) -> ActionType:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _choose_action_task, self.spec, player_id, state)
+
+
+async def _timed_action(agent: AsyncAgent, state: BattleState, player_id: int) -> Tuple[ActionType, float]:
+    start = time.perf_counter()
+    action = await agent.choose_action(state, player_id)
+    return action, time.perf_counter() - start
+
+
+async def play_game_async(agent1: AsyncAgent, agent2: AsyncAgent, game_seed: int, turn_limit: int = 100,
+                          lineups: Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]] = None) -> Dict[str, Any]:
+    # Same result dict as bench_harness.play_game. Moves are simultaneous, so
+    # both agents are asked at once.
+    state = initial_state(game_seed, lineups)
+    latencies_1 = []
+    latencies_2 = []
+    turns = 0
+
+    try:
+        while not state.terminal and turns < turn_limit:
+            (a1, t1), (a2, t2) = await asyncio.gather(_timed_action(agent1, state, 1),
+                                                      _timed_action(agent2, state, 2))
+            latencies_1.append(t1)
+            latencies_2.append(t2)
+            state = step(state, a1, a2)
+            turns += 1
+    finally:
+        await asyncio.gather(agent1.close(), agent2.close())
+
+    return {
+        "winner": state.winner if state.terminal else 0,
+        "turns": turns,
+        "latencies_1": latencies_1,
+        "latencies_2": latencies_2,
+    }
+
+
+async def run_games(make_agents: Callable[[int], Tuple[AsyncAgent, AsyncAgent]], seeds: Iterable[int],
+                    concurrency: int = 64, queue_size: Optional[int] = None,
+                    turn_limit: int = 100) -> AsyncIterator[Dict[str, Any]]:
+    # Yields finished games in completion order. A fixed set of `concurrency`
+    # game loops pulls seeds from one iterator (no task per game, so millions
+    # of seeds cost nothing up front), and finished games go through a
+    # bounded queue: a slow consumer stalls the game loops instead of letting
+    # results pile up.
+    seeds = iter(seeds)
+    results: asyncio.Queue = asyncio.Queue(maxsize=queue_size or concurrency)
+
+    async def game_loop():
+        for seed in seeds:
+            agent1, agent2 = make_agents(seed)
+            game = await play_game_async(agent1, agent2, seed, turn_limit)
+            game["seed"] = seed
+            await results.put(game)
+
+    async def close(loops: List[asyncio.Task]):
+        try:
+            await asyncio.gather(*loops)
+        finally:
+            await results.put(None)
+
+    loops = [asyncio.create_task(game_loop()) for _ in range(concurrency)]
+    closer = asyncio.create_task(close(loops))
+    try:
+        while True:
+            game = await results.get()
+            if game is None:
+                break
+            yield game
+        await closer
+    finally:
+        for task in loops + [closer]:
+            task.cancel()
+
+
+def make_agent_factory(spec1: AgentSpec, spec2: AgentSpec, mode: str,
+                       executor: Executor) -> Callable[[int], Tuple[AsyncAgent, AsyncAgent]]:
+    def adapt(spec: AgentSpec, player_id: int) -> AsyncAgent:
+        if spec.name in INLINE_AGENTS:
+            return InlineAgent(spec.build(player_id))
+        if mode == "process":
+            return ProcessPoolAgent(spec, executor)
+        return ExecutorAgent(spec.build(player_id), executor)
+
+    def make_agents(seed: int) -> Tuple[AsyncAgent, AsyncAgent]:
+        return adapt(spec1, 1), adapt(spec2, 2)
+    return make_agents
+
+
+async def run_matchup_async(spec1: AgentSpec, spec2: AgentSpec, games: int, concurrency: int = 64,
+                            workers: Optional[int] = None, mode: str = "process", seed: int = 0,
+                            turn_limit: int = 100, verbose: bool = True) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    seeds = (rng.randint(0, 1000000) for _ in range(games))
+    workers = workers or default_workers()
+    pool_type = ProcessPoolExecutor if mode == "process" else ThreadPoolExecutor
+
+    wins = losses = draws = 0
+    turns = 0
+    lat_1: List[float] = []
+    lat_2: List[float] = []
+    start = time.time()
+    report_every = max(1, games // 10)
+    with pool_type(max_workers=workers) as executor:
+        make_agents = make_agent_factory(spec1, spec2, mode, executor)
+        done = 0
+        async for game in run_games(make_agents, seeds, concurrency, turn_limit=turn_limit):
+            done += 1
+            if game["winner"] == 1:
+                wins += 1
+            elif game["winner"] == 2:
+                losses += 1
+            else:
+                draws += 1
+            turns += game["turns"]
+            lat_1.extend(game["latencies_1"])
+            lat_2.extend(game["latencies_2"])
+            if verbose and (done % report_every == 0 or done == games):
+                elapsed = time.time() - start
+                print(f"  {done}/{games} games ({elapsed:.0f}s, {done / elapsed:.1f} games/s)")
+
+    elapsed = time.time() - start
+    ci_low, ci_high = wilson_interval(wins + 0.5 * draws, games)
+    return {
+        "agent1": spec1.display_name(),
+        "agent2": spec2.display_name(),
+        "games": games,
+        "wins": wins,
+        "losses": losses,
+        "draws": draws,
+        "win_rate": 100 * wins / games,
+        "score_ci": (100 * ci_low, 100 * ci_high),
+        "avg_turns": turns / games,
+        "time_s": elapsed,
+        "games_per_sec": games / elapsed,
+        "latency_ms": {"agent1": percentiles([1000 * t for t in lat_1]),
+                       "agent2": percentiles([1000 * t for t in lat_2])},
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Concurrent asyncio game runner over a fixed worker pool")
+    parser.add_argument("--agent1", default="mcts:50", help="agent spec name[:sims][:k=v,...]")
+    parser.add_argument("--agent2", default="greedy")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64, help="games in flight")
+    parser.add_argument("--workers", type=int, default=None, help="executor size (default: all cores)")
+    parser.add_argument("--mode", choices=["process", "thread"], default="process",
+                        help="run searches in a process pool, or threads with one agent per game")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--turn-limit", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    spec1 = parse_agent_spec(args.agent1)
+    spec2 = parse_agent_spec(args.agent2)
+
+    print("="*60)
+    print(f"Async Runner: {spec1.display_name()} vs {spec2.display_name()}")
+    print("="*60)
+    print(f"{args.games} games, {args.concurrency} in flight, {args.mode} pool of "
+          f"{args.workers or default_workers()} workers")
+
+    result = asyncio.run(run_matchup_async(spec1, spec2, args.games, args.concurrency, args.workers,
+                                           args.mode, args.seed, args.turn_limit))
+
+    print(f"\nResults:")
+    print(f"  {result['agent1']}: {result['wins']} ({result['win_rate']:.1f}%, "
+          f"95% CI {result['score_ci'][0]:.1f}-{result['score_ci'][1]:.1f}%)")
+    print(f"  {result['agent2']}: {result['losses']}")
+    print(f"  Draws: {result['draws']}")
+    print(f"  Time: {result['time_s']:.1f}s ({result['games_per_sec']:.2f} games/s)")
+    print(f"  Move latency p50/p99: {result['agent1']} {result['latency_ms']['agent1']['p50']:.1f}/"
+          f"{result['latency_ms']['agent1']['p99']:.1f}ms, {result['agent2']} "
+          f"{result['latency_ms']['agent2']['p50']:.1f}/{result['latency_ms']['agent2']['p99']:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
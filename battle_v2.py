@@ -28,6 +28,10 @@ class MoveSpec:
     priority: int = 0
     recoil_percent: int = 0
 
+    # Specs are static dex data, so cloned states share them
+    def __deepcopy__(self, memo) -> 'MoveSpec':
+        return self
+
 @dataclass
 class PokemonSpec:
     name: str
@@ -38,6 +42,9 @@ class PokemonSpec:
     speed: int
     moves: List[MoveSpec]
 
+    def __deepcopy__(self, memo) -> 'PokemonSpec':
+        return self
+
 @dataclass
 class PokemonInstance:
     spec: PokemonSpec
@@ -109,6 +116,11 @@ def legal_actions_for_player(state: BattleState, player_id: int) -> List[ActionT
             
     return actions
 
+NUM_ACTIONS = len(ActionType)
+
+def action_index(action: ActionType) -> int:
+    return action.value - 1
+
 def is_switch_action(action: ActionType) -> bool:
     return action in (ActionType.SWITCH_TO_0, ActionType.SWITCH_TO_1, ActionType.SWITCH_TO_2)
 
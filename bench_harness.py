@@ -0,0 +1,624 @@
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from battle_v2 import BattleState, PlayerState, PokemonInstance, step
+from dex_v2 import DEX_V2
+from profiling import add_profile_arguments, export_phase_timers, resolve_profile_mode, run_profiled
+
+
+AGENT_REGISTRY: Dict[str, Callable[..., Any]] = {}
+AGENT_DISPLAY_NAMES: Dict[str, str] = {}
+
+
+def register_agent(name: str, display_name: str):
+    def decorator(factory: Callable[..., Any]):
+        AGENT_REGISTRY[name] = factory
+        AGENT_DISPLAY_NAMES[name] = display_name
+        return factory
+    return decorator
+
+
+@register_agent("random", "Random")
+def _make_random(simulations: int, player_id: int):
+    from main_v2 import RandomAgent
+    return RandomAgent()
+
+
+@register_agent("greedy", "Greedy")
+def _make_greedy(simulations: int, player_id: int):
+    from main_v2 import GreedyAgent
+    return GreedyAgent()
+
+
+@register_agent("mcts", "MCTS")
+def _make_mcts(simulations: int, player_id: int, **options):
+    from mcts_v2 import MCTSAgent
+    return MCTSAgent(simulations_per_move=simulations, player_id=player_id, **options)
+
+
+@register_agent("duct", "DUCT")
+def _make_duct(simulations: int, player_id: int, **options):
+    from mcts_duct import MCTSDUCTAgent
+    return MCTSDUCTAgent(simulations_per_move=simulations, player_id=player_id, **options)
+
+
+@register_agent("opponent", "MCTS-OppModel")
+def _make_opponent(simulations: int, player_id: int, **options):
+    from mcts_opponent_model import MCTSOpponentModelAgent
+    return MCTSOpponentModelAgent(simulations_per_move=simulations, player_id=player_id, **options)
+
+
+@register_agent("rave", "RAVE")
+def _make_rave(simulations: int, player_id: int, rave_k: float = 500, **options):
+    from mcts_rave import MCTSRAVEAgent
+    return MCTSRAVEAgent(simulations_per_move=simulations, player_id=player_id, rave_k=rave_k, **options)
+
+
+@register_agent("rave-greedy", "RAVE-Greedy")
+def _make_rave_greedy(simulations: int, player_id: int, rave_k: float = 500, **options):
+    from mcts_rave import MCTSRAVEGreedyAgent
+    return MCTSRAVEGreedyAgent(simulations_per_move=simulations, player_id=player_id, rave_k=rave_k, **options)
+
+
+@register_agent("valuenet", "ValueNet")
+def _make_valuenet(simulations: int, player_id: int, network_path: Optional[str] = "value_network_v1.pkl",
+                   **options):
+    from mcts_value_net import MCTSAgentValueNet
+    from value_network import create_default_network
+    net = create_default_network()
+    if network_path:
+        net.load(network_path, verbose=False)
+    return MCTSAgentValueNet(net, simulations_per_move=simulations, player_id=player_id, **options)
+
+
+@register_agent("core", "MCTS-Core")
+def _make_core(simulations: int, player_id: int, **options):
+    # e.g. "core:100:selection=puct,evaluation=greedy,final=visits"
+    from mcts_core import build_core_agent
+    return build_core_agent(simulations_per_move=simulations, player_id=player_id, **options)
+
+
+@register_agent("valuetable", "ValueTable")
+def _make_valuetable(simulations: int, player_id: int, table_path: str = "value_table.npy",
+                     network_path: str = "value_network_v1.pkl", **options):
+    from mcts_value_net import MCTSAgentValueNet
+    from value_table import load_or_distill
+    table = load_or_distill(network_path=network_path, table_path=table_path)
+    return MCTSAgentValueNet(table, simulations_per_move=simulations, player_id=player_id, **options)
+
+
+@dataclass
+class AgentSpec:
+    name: str
+    simulations: int = 100
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    label: Optional[str] = None
+
+    def display_name(self) -> str:
+        if self.label:
+            return self.label
+        if self.name in ("random", "greedy"):
+            return AGENT_DISPLAY_NAMES[self.name]
+        return f"{AGENT_DISPLAY_NAMES.get(self.name, self.name)}-{self.simulations}"
+
+    def key(self, player_id: int) -> Tuple:
+        return (self.name, self.simulations, player_id, tuple(sorted(self.kwargs.items())))
+
+    def build(self, player_id: int):
+        if self.name not in AGENT_REGISTRY:
+            raise KeyError(f"Unknown agent '{self.name}'. Registered: {sorted(AGENT_REGISTRY)}")
+        return AGENT_REGISTRY[self.name](self.simulations, player_id, **self.kwargs)
+
+
+@dataclass
+class Matchup:
+    agent1: AgentSpec
+    agent2: AgentSpec
+    games: int = 50
+    seed: int = 0
+    turn_limit: int = 100
+    paired: bool = False
+
+    def label(self) -> str:
+        return f"{self.agent1.display_name()} vs {self.agent2.display_name()}"
+
+    def game_seeds(self) -> List[int]:
+        rng = random.Random(self.seed)
+        return [rng.randint(0, 1000000) for _ in range(self.games)]
+
+
+def parse_agent_spec(text: str) -> AgentSpec:
+    # "name[:simulations][:key=value,...]", e.g. "rave:100:rave_k=1000"
+    parts = text.split(":")
+    spec = AgentSpec(name=parts[0])
+    if len(parts) > 1 and parts[1]:
+        spec.simulations = int(parts[1])
+    if len(parts) > 2 and parts[2]:
+        for item in parts[2].split(","):
+            key, value = item.split("=", 1)
+            try:
+                spec.kwargs[key] = float(value) if "." in value else int(value)
+            except ValueError:
+                spec.kwargs[key] = value
+    return spec
+
+
+def create_teams() -> Tuple[List[PokemonInstance], List[PokemonInstance]]:
+    # Team 1: Flameling, Leaflet, Stonecub / Team 2: Aquaff, Sparkit, Bulkwall
+    t1 = [PokemonInstance.from_spec(DEX_V2[0]),
+          PokemonInstance.from_spec(DEX_V2[2]),
+          PokemonInstance.from_spec(DEX_V2[7])]
+    t2 = [PokemonInstance.from_spec(DEX_V2[1]),
+          PokemonInstance.from_spec(DEX_V2[4]),
+          PokemonInstance.from_spec(DEX_V2[3])]
+    return t1, t2
+
+
+def create_team(lineup: Tuple[int, ...]) -> List[PokemonInstance]:
+    # lineup is a tuple of DEX_V2 indices; the first one leads
+    return [PokemonInstance.from_spec(DEX_V2[i]) for i in lineup]
+
+
+_WORKER_AGENTS: Dict[Tuple, Any] = {}
+
+
+def get_worker_agent(spec: AgentSpec, player_id: int):
+    key = spec.key(player_id)
+    agent = _WORKER_AGENTS.get(key)
+    if agent is None:
+        agent = spec.build(player_id)
+        _WORKER_AGENTS[key] = agent
+    return agent
+
+
+def initial_state(game_seed: int,
+                  lineups: Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]] = None) -> BattleState:
+    if lineups is None:
+        t1, t2 = create_teams()
+    else:
+        t1, t2 = create_team(lineups[0]), create_team(lineups[1])
+    return BattleState(
+        player1=PlayerState(team=t1, active_index=0),
+        player2=PlayerState(team=t2, active_index=0),
+        rng_seed=game_seed
+    )
+
+
+def play_game(agent1, agent2, game_seed: int, turn_limit: int = 100,
+              common_random: bool = False,
+              lineups: Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]] = None) -> Dict[str, Any]:
+    # Accuracy rolls come from rng_seed, so two games with the same seed see the same
+    # rolls. common_random also reseeds the agents' shared random stream every turn.
+    state = initial_state(game_seed, lineups)
+
+    latencies_1 = []
+    latencies_2 = []
+    turns = 0
+
+    while not state.terminal and turns < turn_limit:
+        if common_random:
+            random.seed(game_seed * 1000 + turns)
+
+        start = time.perf_counter()
+        a1 = agent1.choose_action(state, 1)
+        latencies_1.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        a2 = agent2.choose_action(state, 2)
+        latencies_2.append(time.perf_counter() - start)
+
+        state = step(state, a1, a2)
+        turns += 1
+
+    # A pondering agent would otherwise keep searching into the next game
+    for agent in (agent1, agent2):
+        stop_ponder = getattr(agent, "stop_ponder", None)
+        if stop_ponder is not None:
+            stop_ponder()
+
+    return {
+        "winner": state.winner if state.terminal else 0,
+        "turns": turns,
+        "latencies_1": latencies_1,
+        "latencies_2": latencies_2,
+    }
+
+
+def _play_game_task(spec1: AgentSpec, spec2: AgentSpec, game_seed: int, turn_limit: int,
+                    common_random: bool = False) -> Dict[str, Any]:
+    random.seed(game_seed)
+    agent1 = get_worker_agent(spec1, 1)
+    agent2 = get_worker_agent(spec2, 2)
+    return play_game(agent1, agent2, game_seed, turn_limit, common_random)
+
+
+def _swap_seats(game: Dict[str, Any]) -> Dict[str, Any]:
+    # Re-express a game played with the agents swapped from matchup.agent1's point of view
+    return dict(game,
+                winner={1: 2, 2: 1}.get(game["winner"], game["winner"]),
+                latencies_1=game["latencies_2"],
+                latencies_2=game["latencies_1"])
+
+
+def _game_score(game: Dict[str, Any]) -> float:
+    if game["winner"] == 1:
+        return 1.0
+    if game["winner"] == 2:
+        return 0.0
+    return 0.5
+
+
+def wilson_interval(successes: float, n: int, z: float = 1.96) -> Tuple[float, float]:
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def percentiles(values: List[float], points=(50, 90, 99)) -> Dict[str, float]:
+    if not values:
+        return dict({f"p{p}": 0.0 for p in points}, max=0.0, mean=0.0)
+    ordered = sorted(values)
+    result = {}
+    for p in points:
+        idx = min(len(ordered) - 1, int(math.ceil(p / 100 * len(ordered))) - 1)
+        result[f"p{p}"] = ordered[max(idx, 0)]
+    result["max"] = ordered[-1]
+    result["mean"] = sum(ordered) / len(ordered)
+    return result
+
+
+def paired_statistics(games: List[Dict[str, Any]], z: float = 1.96) -> Dict[str, Any]:
+    # games alternate (agent1 as P1, agent1 as P2) on the same seed. Per pair,
+    # d = score(first) + score(second) - 1 is agent1's net result in [-1, 1].
+    diffs = [_game_score(a) + _game_score(b) - 1 for a, b in zip(games[0::2], games[1::2])]
+    n = len(diffs)
+    if n == 0:
+        return {}
+
+    mean = sum(diffs) / n
+    var = sum((d - mean) ** 2 for d in diffs) / (n - 1) if n > 1 else 0.0
+    se = math.sqrt(var / n)
+
+    # Variance of d if the two games of a pair were independent
+    scores = [_game_score(g) for g in games]
+    score_mean = sum(scores) / len(scores)
+    score_var = sum((x - score_mean) ** 2 for x in scores) / max(len(scores) - 1, 1)
+    independent_var = 2 * score_var
+
+    return {
+        "pairs": n,
+        "pairs_won": sum(1 for d in diffs if d > 0),
+        "pairs_split": sum(1 for d in diffs if d == 0),
+        "pairs_lost": sum(1 for d in diffs if d < 0),
+        "mean_diff": mean,
+        "mean_diff_ci95": [mean - z * se, mean + z * se],
+        "stderr": se,
+        "z": mean / se if se > 0 else 0.0,
+        "variance_reduction": independent_var / var if var > 0 else float('inf'),
+    }
+
+
+def summarize(matchup: Matchup, games: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    n = len(games)
+    wins_1 = sum(1 for g in games if g["winner"] == 1)
+    wins_2 = sum(1 for g in games if g["winner"] == 2)
+    draws = n - wins_1 - wins_2
+    score_1 = wins_1 + 0.5 * draws
+
+    win_ci = wilson_interval(wins_1, n)
+    score_ci = wilson_interval(score_1, n)
+
+    lat_1 = [x * 1000 for g in games for x in g["latencies_1"]]
+    lat_2 = [x * 1000 for g in games for x in g["latencies_2"]]
+
+    result = {
+        "label": matchup.label(),
+        "agent1": dict(asdict(matchup.agent1), display_name=matchup.agent1.display_name()),
+        "agent2": dict(asdict(matchup.agent2), display_name=matchup.agent2.display_name()),
+        "games": n,
+        "seed": matchup.seed,
+        "p1_wins": wins_1,
+        "p2_wins": wins_2,
+        "draws": draws,
+        "win_rate": wins_1 / n * 100 if n else 0.0,
+        "win_rate_ci95": [win_ci[0] * 100, win_ci[1] * 100],
+        "score": score_1 / n if n else 0.0,
+        "score_ci95": list(score_ci),
+        "time": elapsed,
+        "games_per_sec": n / elapsed if elapsed > 0 else 0.0,
+        "avg_turns": sum(g["turns"] for g in games) / n if n else 0.0,
+        "latency_ms": {"agent1": percentiles(lat_1), "agent2": percentiles(lat_2)},
+    }
+    if matchup.paired:
+        result["paired"] = paired_statistics(games)
+    return result
+
+
+def default_workers() -> int:
+    return int(os.environ.get("BENCH_WORKERS", os.cpu_count() or 1))
+
+
+def run_matchup(matchup: Matchup, workers: Optional[int] = None,
+                executor: Optional[ProcessPoolExecutor] = None, verbose: bool = True) -> Dict[str, Any]:
+    workers = default_workers() if workers is None else workers
+    seeds = matchup.game_seeds()
+
+    # Paired mode plays every seed twice, the second time with the agents swapped
+    # so each one gets both seats (and their teams) under the same random numbers.
+    tasks = []
+    for s in seeds:
+        tasks.append((matchup.agent1, matchup.agent2, s, matchup.turn_limit, matchup.paired))
+        if matchup.paired:
+            tasks.append((matchup.agent2, matchup.agent1, s, matchup.turn_limit, True))
+
+    if verbose:
+        print(f"\n{'='*60}")
+        paired = f", {len(seeds)} pairs" if matchup.paired else ""
+        print(f"{matchup.label()} ({len(tasks)} games{paired}, {workers} workers)")
+        print(f"{'='*60}")
+
+    start = time.time()
+    if workers <= 1 and executor is None:
+        games = [_play_game_task(*task) for task in tasks]
+    else:
+        own_executor = executor is None
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [pool.submit(_play_game_task, *task) for task in tasks]
+            games = [f.result() for f in futures]
+        finally:
+            if own_executor:
+                pool.shutdown()
+    elapsed = time.time() - start
+
+    if matchup.paired:
+        games = [g if i % 2 == 0 else _swap_seats(g) for i, g in enumerate(games)]
+
+    result = summarize(matchup, games, elapsed)
+
+    if verbose:
+        print_result(result)
+
+    return result
+
+
+def print_result(result: Dict[str, Any]):
+    n = result["games"]
+    name1 = result["agent1"]["display_name"]
+    name2 = result["agent2"]["display_name"]
+    lo, hi = result["win_rate_ci95"]
+    lat1 = result["latency_ms"]["agent1"]
+    lat2 = result["latency_ms"]["agent2"]
+
+    print(f"\nResults:")
+    print(f"  {name1}: {result['p1_wins']} ({result['p1_wins']/n*100:.1f}%, 95% CI {lo:.1f}-{hi:.1f}%)")
+    print(f"  {name2}: {result['p2_wins']} ({result['p2_wins']/n*100:.1f}%)")
+    print(f"  Draws: {result['draws']}")
+    print(f"  Time: {result['time']:.1f}s ({result['games_per_sec']:.2f} games/s)")
+    print(f"  Move latency p50/p99: {name1} {lat1['p50']:.1f}/{lat1['p99']:.1f}ms, "
+          f"{name2} {lat2['p50']:.1f}/{lat2['p99']:.1f}ms")
+
+    paired = result.get("paired")
+    if paired:
+        lo, hi = paired["mean_diff_ci95"]
+        print(f"  Paired ({paired['pairs']} seeds): {name1} won {paired['pairs_won']}, "
+              f"split {paired['pairs_split']}, lost {paired['pairs_lost']}")
+        print(f"  Paired score diff: {paired['mean_diff']:+.3f} (95% CI {lo:+.3f} to {hi:+.3f}, "
+              f"z={paired['z']:.2f}, variance reduction {paired['variance_reduction']:.2f}x)")
+
+
+def run_matchups(matchups: List[Matchup], workers: Optional[int] = None,
+                 verbose: bool = True) -> List[Dict[str, Any]]:
+    workers = default_workers() if workers is None else workers
+    if workers <= 1:
+        return [run_matchup(m, workers=1, verbose=verbose) for m in matchups]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [run_matchup(m, workers=workers, executor=pool, verbose=verbose) for m in matchups]
+
+
+def write_results(results: List[Dict[str, Any]], output_path: str, suite: Optional[str] = None,
+                  workers: Optional[int] = None):
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump({
+            "suite": suite,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "workers": workers,
+            "matchups": results,
+        }, f, indent=2)
+    print(f"\nWrote {len(results)} matchup results to {output_path}")
+
+
+def quick_suite(games: int = 100, simulations: int = 100) -> List[Matchup]:
+    return [
+        Matchup(AgentSpec("greedy"), AgentSpec("random"), games),
+        Matchup(AgentSpec("mcts", simulations), AgentSpec("greedy"), games),
+        Matchup(AgentSpec("rave", simulations, {"rave_k": 500}), AgentSpec("greedy"), games),
+        Matchup(AgentSpec("valuenet", simulations), AgentSpec("greedy"), games),
+    ]
+
+
+def baseline_suite(games: int = 50) -> List[Matchup]:
+    matchups = [Matchup(AgentSpec("greedy"), AgentSpec("random"), games)]
+    for sims in [50, 100, 200, 500]:
+        matchups.append(Matchup(AgentSpec("mcts", sims), AgentSpec("greedy"), games))
+    return matchups
+
+
+def rave_suite(games: int = 50) -> List[Matchup]:
+    matchups = []
+    for sims in [50, 100, 200]:
+        matchups.append(Matchup(AgentSpec("mcts", sims), AgentSpec("greedy"), games))
+        matchups.append(Matchup(AgentSpec("rave", sims, {"rave_k": 500}), AgentSpec("greedy"), games))
+    for sims in [100, 200]:
+        matchups.append(Matchup(AgentSpec("mcts", sims), AgentSpec("rave", sims, {"rave_k": 500}), games))
+    for k in [100, 500, 1000, 3000]:
+        matchups.append(Matchup(AgentSpec("rave", 100, {"rave_k": k}, label=f"RAVE(k={k})"),
+                                AgentSpec("greedy"), games))
+    return matchups
+
+
+def valuenet_suite(games: int = 50, simulations: int = 100,
+                   network_path: Optional[str] = "value_network_v1.pkl") -> List[Matchup]:
+    valuenet = AgentSpec("valuenet", simulations, {"network_path": network_path},
+                         label=f"MCTS-ValueNet-{simulations}")
+    mcts = AgentSpec("mcts", simulations, label=f"MCTS-Random-{simulations}")
+    return [
+        Matchup(mcts, AgentSpec("greedy"), games),
+        Matchup(valuenet, AgentSpec("greedy"), games),
+        Matchup(valuenet, mcts, games),
+    ]
+
+
+def duct_suite(games: int = 50, budgets: Tuple[int, ...] = (50, 100, 200)) -> List[Matchup]:
+    # Head-to-heads are paired (each seed twice, sides swapped) to cancel the seat advantage
+    matchups = []
+    for sims in budgets:
+        matchups.append(Matchup(AgentSpec("mcts", sims), AgentSpec("greedy"), games))
+        matchups.append(Matchup(AgentSpec("duct", sims), AgentSpec("greedy"), games))
+        matchups.append(Matchup(AgentSpec("duct", sims), AgentSpec("mcts", sims), games, paired=True))
+    return matchups
+
+
+def halving_suite(games: int = 50, budgets: Tuple[int, ...] = (25, 50, 100, 200),
+                  network_path: Optional[str] = "value_network_v1.pkl") -> List[Matchup]:
+    # Sequential-halving root vs plain UCT root, for rollout MCTS and the value network
+    matchups = []
+    for sims in budgets:
+        uct = AgentSpec("mcts", sims)
+        halving = AgentSpec("mcts", sims, {"root_strategy": "halving"}, label=f"MCTS-Halving-{sims}")
+        valuenet = AgentSpec("valuenet", sims, {"network_path": network_path})
+        valuenet_halving = AgentSpec("valuenet", sims, {"network_path": network_path, "root_strategy": "halving"},
+                                     label=f"MCTS-ValueNet-Halving-{sims}")
+        matchups.append(Matchup(uct, AgentSpec("greedy"), games))
+        matchups.append(Matchup(halving, AgentSpec("greedy"), games))
+        matchups.append(Matchup(halving, uct, games, paired=True))
+        matchups.append(Matchup(valuenet_halving, valuenet, games, paired=True))
+    return matchups
+
+
+def bias_suite(games: int = 50, simulations: int = 100,
+               weights: Tuple[float, ...] = (0.25, 0.5, 1.0, 2.0, 4.0)) -> List[Matchup]:
+    # Progressive-bias weights (and prior-ordered expansion alone) vs plain UCB1, paired
+    baseline = AgentSpec("mcts", simulations)
+    matchups = [Matchup(AgentSpec("mcts", simulations, {"progressive_bias": True, "bias_weight": w}, label=f"MCTS-Bias{w:g}-{simulations}"),
+                        baseline, games, paired=True) for w in weights]
+    matchups.append(Matchup(AgentSpec("mcts", simulations, {"order_untried": True},
+                                      label=f"MCTS-Ordered-{simulations}"), baseline, games, paired=True))
+    return matchups
+
+
+def opponent_suite(games: int = 50, simulations: int = 100) -> List[Matchup]:
+    # Opponent-model MCTS (frequency and greedy models) vs joint-action MCTS,
+    # each against Greedy and Random
+    agents = [
+        AgentSpec("mcts", simulations),
+        AgentSpec("opponent", simulations, {"model": "frequency"}, label=f"MCTS-OppFreq-{simulations}"),
+        AgentSpec("opponent", simulations, {"model": "greedy"}, label=f"MCTS-OppGreedy-{simulations}"),
+    ]
+    return [Matchup(agent, AgentSpec(opponent), games) for opponent in ("greedy", "random") for agent in agents]
+
+
+def book_suite(games: int = 50, simulations: int = 100,
+               book_path: str = "books/opening.sqlite") -> List[Matchup]:
+    # Opening book (built with position_book.py) played directly and used to
+    # seed the root, each vs the same MCTS without a book, paired
+    baseline = AgentSpec("mcts", simulations)
+    return [
+        Matchup(AgentSpec("mcts", simulations, {"book": book_path}, label=f"MCTS-Book-{simulations}"),
+                baseline, games, paired=True),
+        Matchup(AgentSpec("mcts", simulations, {"book": book_path, "book_mode": "seed"},
+                          label=f"MCTS-BookSeed-{simulations}"), baseline, games, paired=True),
+    ]
+
+
+SUITES: Dict[str, Callable[..., List[Matchup]]] = {
+    "quick": quick_suite,
+    "baseline": baseline_suite,
+    "rave": rave_suite,
+    "valuenet": valuenet_suite,
+    "duct": duct_suite,
+    "halving": halving_suite,
+    "bias": bias_suite,
+    "opponent": opponent_suite,
+    "book": book_suite,
+}
+
+
+def run_suite(name: str, games: Optional[int] = None, workers: Optional[int] = None,
+              output: Optional[str] = None, seed: int = 0, paired: bool = False) -> List[Dict[str, Any]]:
+    matchups = SUITES[name](games) if games else SUITES[name]()
+    for matchup in matchups:
+        matchup.seed = seed
+        matchup.paired = matchup.paired or paired
+    results = run_matchups(matchups, workers=workers)
+    if output:
+        write_results(results, output, suite=name, workers=workers or default_workers())
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Parallel benchmark harness for the battle agents")
+    parser.add_argument("--suite", choices=sorted(SUITES), help="run a predefined suite")
+    parser.add_argument("--agent1", help="agent spec name[:sims][:k=v,...], e.g. mcts:200")
+    parser.add_argument("--agent2", default="greedy")
+    parser.add_argument("--games", type=int, help="games per matchup (overrides the suite default)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--paired", action="store_true",
+                        help="play each seed twice with sides swapped and report paired statistics")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: all cores)")
+    parser.add_argument("--output", help="write JSON results to this path")
+    parser.add_argument("--list-agents", action="store_true")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.list_agents:
+        for name in sorted(AGENT_REGISTRY):
+            print(f"  {name:<12} {AGENT_DISPLAY_NAMES[name]}")
+        return
+
+    if not args.suite and not args.agent1:
+        parser.error("pass --suite or --agent1")
+
+    profile = resolve_profile_mode(args.profile)
+    workers = args.workers
+    if profile:
+        # Profilers only see this process, so games run in-process
+        workers = 1
+        print(f"Profiling with {profile}; running games in-process (--workers 1)")
+
+    def run():
+        if args.suite:
+            run_suite(args.suite, games=args.games, workers=workers, output=args.output,
+                      seed=args.seed, paired=args.paired)
+        else:
+            matchup = Matchup(parse_agent_spec(args.agent1), parse_agent_spec(args.agent2),
+                              games=args.games or 50, seed=args.seed, paired=args.paired)
+            result = run_matchup(matchup, workers=workers)
+            if args.output:
+                write_results([result], args.output, workers=workers or default_workers())
+
+    run_profiled(run, profile, args.profile_output)
+
+    if profile:
+        timers = [agent.timer for agent in _WORKER_AGENTS.values() if hasattr(agent, "timer")]
+        for timer in timers:
+            timer.print_summary()
+        export_phase_timers(timers, args.profile_output or os.path.join("results", "profile"))
+
+
+if __name__ == "__main__":
+    main()
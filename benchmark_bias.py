@@ -0,0 +1,63 @@
+import argparse
+from typing import List, Optional
+
+from bench_harness import AgentSpec, Matchup, bias_suite, run_matchups
+
+
+def print_paired(rows):
+    print(f"{'Agent':<26} {'Score':<8} {'Paired Diff':<13} {'95% CI':<20}")
+    print("-" * 68)
+    for label, result in rows:
+        paired = result['paired']
+        lo, hi = paired['mean_diff_ci95']
+        print(f"{label:<26} {result['score']:<8.3f} {paired['mean_diff']:<+13.3f} {lo:+.3f} to {hi:+.3f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Tune the progressive-bias weight of MCTSAgent")
+    parser.add_argument("--games", type=int, default=50, help="seeds per matchup (each played twice)")
+    parser.add_argument("--simulations", type=int, default=100, help="baseline budget")
+    parser.add_argument("--weights", nargs="+", type=float, default=[0.25, 0.5, 1.0, 2.0, 4.0])
+    parser.add_argument("--budgets", nargs="+", type=int, default=[25, 50, 100],
+                        help="budgets of the tuned agent matched against the baseline")
+    args = parser.parse_args(argv)
+
+    print("\n" + "="*60)
+    print("Progressive Bias Tuning Benchmark")
+    print("="*60)
+
+    # 1) Each weight (and ordered expansion alone) vs plain UCB1 at the same budget
+    tuning = run_matchups(bias_suite(args.games, args.simulations, tuple(args.weights)))
+    labels = [f"bias_weight={w:g}" for w in args.weights] + ["order_untried"]
+    best_weight = max(zip(args.weights, tuning), key=lambda wr: wr[1]['paired']['mean_diff'])[0]
+
+    # 2) Tuned agent (with ordered expansion) at smaller budgets vs the full-budget baseline
+    baseline = AgentSpec("mcts", args.simulations)
+    tuned = {"progressive_bias": True, "bias_weight": best_weight, "order_untried": True}
+    budgets = sorted(args.budgets)
+    matching = run_matchups([Matchup(AgentSpec("mcts", sims, tuned, label=f"MCTS-Bias{best_weight:g}-{sims}"),
+                                     baseline, args.games, paired=True) for sims in budgets])
+
+    print("\n\n" + "="*60)
+    print("SUMMARY")
+    print("="*60)
+
+    print(f"\n--- Bias vs Plain UCB1 at {args.simulations} Simulations (paired) ---")
+    print_paired(list(zip(labels, tuning)))
+    print(f"\nBest weight: {best_weight:g}")
+
+    print(f"\n--- Tuned Agent (weight {best_weight:g} + ordered) vs MCTS-{args.simulations} (paired) ---")
+    print_paired([(f"{sims} simulations", r) for sims, r in zip(budgets, matching)])
+
+    matched = [sims for sims, r in zip(budgets, matching) if r['paired']['mean_diff'] >= 0]
+    if matched:
+        print(f"\nMatches MCTS-{args.simulations} from {matched[0]} simulations "
+              f"({args.simulations / matched[0]:.1f}x fewer)")
+    else:
+        print(f"\nNo tested budget matches MCTS-{args.simulations}")
+
+    print("\n" + "="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from bench_harness import duct_suite, run_matchups
+
+
+def main():
+    print("\n" + "="*60)
+    print("Decoupled UCT vs Joint-Action MCTS Benchmark")
+    print("="*60)
+
+    num_games = 50
+    budgets = [50, 100, 200]
+
+    # At each budget: MCTS vs Greedy, DUCT vs Greedy, and a paired DUCT vs MCTS
+    results = run_matchups(duct_suite(num_games, tuple(budgets)))
+
+    print("\n\n" + "="*60)
+    print("SUMMARY")
+    print("="*60)
+
+    print("\n--- Win Rate vs Greedy ---")
+    print(f"{'Budget':<10} {'MCTS':<15} {'DUCT':<15} {'Difference':<15}")
+    print("-" * 55)
+    for i, sims in enumerate(budgets):
+        mcts_r, duct_r = results[3 * i], results[3 * i + 1]
+        diff = duct_r['win_rate'] - mcts_r['win_rate']
+        sign = "+" if diff >= 0 else ""
+        print(f"{sims:<10} {mcts_r['win_rate']:<14.1f}% {duct_r['win_rate']:<14.1f}% {sign}{diff:.1f}%")
+
+    print("\n--- DUCT vs MCTS Head-to-Head (paired, sides swapped) ---")
+    print(f"{'Budget':<10} {'DUCT Score':<15} {'Paired Diff':<15} {'95% CI':<20}")
+    print("-" * 60)
+    for i, sims in enumerate(budgets):
+        h2h = results[3 * i + 2]
+        paired = h2h['paired']
+        lo, hi = paired['mean_diff_ci95']
+        print(f"{sims:<10} {h2h['score']:<15.3f} {paired['mean_diff']:<+15.3f} {lo:+.3f} to {hi:+.3f}")
+
+    print("\n--- Time per Move ---")
+    print(f"{'Budget':<10} {'MCTS':<15} {'DUCT':<15}")
+    print("-" * 40)
+    for i, sims in enumerate(budgets):
+        mcts_ms = results[3 * i]['latency_ms']['agent1']['mean']
+        duct_ms = results[3 * i + 1]['latency_ms']['agent1']['mean']
+        print(f"{sims:<10} {mcts_ms:<10.1f}ms    {duct_ms:<10.1f}ms")
+
+    print("\n" + "="*60)
+
+
+if __name__ == "__main__":
+    main()
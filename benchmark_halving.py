@@ -0,0 +1,51 @@
+from bench_harness import halving_suite, run_matchups
+
+
+def main():
+    print("\n" + "="*60)
+    print("Sequential Halving Root vs UCT Root Benchmark")
+    print("="*60)
+
+    num_games = 50
+    budgets = [25, 50, 100, 200]
+
+    # At each budget: UCT vs Greedy, Halving vs Greedy, and paired Halving vs UCT
+    # head-to-heads for rollout MCTS and the value network agent
+    results = run_matchups(halving_suite(num_games, tuple(budgets)))
+
+    print("\n\n" + "="*60)
+    print("SUMMARY")
+    print("="*60)
+
+    print("\n--- MCTS Win Rate vs Greedy ---")
+    print(f"{'Budget':<10} {'UCT Root':<15} {'Halving Root':<15} {'Difference':<15}")
+    print("-" * 55)
+    for i, sims in enumerate(budgets):
+        uct_r, halving_r = results[4 * i], results[4 * i + 1]
+        diff = halving_r['win_rate'] - uct_r['win_rate']
+        sign = "+" if diff >= 0 else ""
+        print(f"{sims:<10} {uct_r['win_rate']:<14.1f}% {halving_r['win_rate']:<14.1f}% {sign}{diff:.1f}%")
+
+    for offset, title in [(2, "MCTS"), (3, "ValueNet")]:
+        print(f"\n--- {title}: Halving vs UCT Head-to-Head (paired, sides swapped) ---")
+        print(f"{'Budget':<10} {'Halving Score':<15} {'Paired Diff':<15} {'95% CI':<20}")
+        print("-" * 60)
+        for i, sims in enumerate(budgets):
+            h2h = results[4 * i + offset]
+            paired = h2h['paired']
+            lo, hi = paired['mean_diff_ci95']
+            print(f"{sims:<10} {h2h['score']:<15.3f} {paired['mean_diff']:<+15.3f} {lo:+.3f} to {hi:+.3f}")
+
+    print("\n--- Time per Move (vs Greedy) ---")
+    print(f"{'Budget':<10} {'UCT Root':<15} {'Halving Root':<15}")
+    print("-" * 40)
+    for i, sims in enumerate(budgets):
+        uct_ms = results[4 * i]['latency_ms']['agent1']['mean']
+        halving_ms = results[4 * i + 1]['latency_ms']['agent1']['mean']
+        print(f"{sims:<10} {uct_ms:<10.1f}ms    {halving_ms:<10.1f}ms")
+
+    print("\n" + "="*60)
+
+
+if __name__ == "__main__":
+    main()
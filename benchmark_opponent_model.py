@@ -0,0 +1,79 @@
+import argparse
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from bench_harness import AgentSpec, opponent_suite, run_matchups
+from microbench import build_corpus, PHASES
+from tree_memory import count_nodes
+
+# Full budgets for a like-for-like sims/sec: no early stopping, no solver
+THROUGHPUT_AGENTS = [
+    ("Joint MCTS", AgentSpec("mcts", kwargs={"early_stop": False, "solver": False})),
+    ("OppModel freq", AgentSpec("opponent", kwargs={"model": "frequency", "early_stop": False})),
+    ("OppModel greedy", AgentSpec("opponent", kwargs={"model": "greedy", "early_stop": False})),
+]
+
+
+def measure_throughput(spec: AgentSpec, simulations: int, positions: int = 2) -> Dict[str, Any]:
+    spec.simulations = simulations
+    agent = spec.build(1)
+    corpus = build_corpus()
+    elapsed = 0.0
+    sims = 0
+    nodes = 0
+    searches = 0
+    for phase in PHASES:
+        for state in corpus[phase][:positions]:
+            random.seed(0)
+            start = time.perf_counter()
+            agent.choose_action(state, 1)
+            elapsed += time.perf_counter() - start
+            sims += agent.simulations_run
+            nodes += count_nodes(agent.last_root)
+            searches += 1
+    return {"sims_per_sec": sims / elapsed, "nodes": nodes / searches,
+            "tree_kb": agent.budget.stats()["tree_bytes"] / 1e3}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Opponent-model MCTS vs joint-action MCTS")
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--simulations", type=int, default=100)
+    parser.add_argument("--throughput-simulations", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    print("\n" + "="*60)
+    print("Opponent-Model MCTS Benchmark")
+    print("="*60)
+
+    # Sims/sec on the microbench corpus, single process
+    throughput = [(label, measure_throughput(spec, args.throughput_simulations))
+                  for label, spec in THROUGHPUT_AGENTS]
+
+    matchups = opponent_suite(args.games, args.simulations)
+    results = run_matchups(matchups)
+
+    print("\n\n" + "="*60)
+    print("SUMMARY")
+    print("="*60)
+
+    print(f"\n--- Throughput ({args.throughput_simulations} simulations per search) ---")
+    print(f"{'Agent':<16} {'Sims/sec':>10} {'Nodes':>9} {'Tree KB':>9}")
+    print("-" * 48)
+    for label, row in throughput:
+        print(f"{label:<16} {row['sims_per_sec']:>10.0f} {row['nodes']:>9.0f} {row['tree_kb']:>9.1f}")
+
+    print(f"\n--- Win Rate at {args.simulations} Simulations ---")
+    print(f"{'Agent':<24} {'vs Greedy':<15} {'vs Random':<15} {'ms/move':<10}")
+    print("-" * 64)
+    half = len(results) // 2
+    for vs_greedy, vs_random, matchup in zip(results[:half], results[half:], matchups[:half]):
+        print(f"{matchup.agent1.display_name():<24} {vs_greedy['win_rate']:<14.1f}% "
+              f"{vs_random['win_rate']:<14.1f}% {vs_greedy['latency_ms']['agent1']['mean']:<10.1f}")
+
+    print("\n" + "="*60)
+
+
+if __name__ == "__main__":
+    main()
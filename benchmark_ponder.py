@@ -0,0 +1,88 @@
+import argparse
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from bench_harness import AgentSpec, play_game, percentiles
+from mcts_v2 import MCTSAgent
+
+
+class ThinkingAgent:
+    # Fixed decision time before the wrapped agent answers, like a human or a
+    # remote player; sleeping releases the GIL to a pondering opponent
+
+    def __init__(self, agent, think_time: float):
+        self.agent = agent
+        self.think_time = think_time
+
+    def choose_action(self, state, player_id: int):
+        time.sleep(self.think_time)
+        return self.agent.choose_action(state, player_id)
+
+
+def run_games(ponder: bool, games: int, simulations: int, think_time: float,
+              opponent: str = "greedy", seed: int = 0) -> Dict[str, Any]:
+    # Sequential in-process games: the ponder thread needs the opponent's
+    # think time, which a process pool of busy games would not leave it
+    agent = MCTSAgent(simulations_per_move=simulations, player_id=1, ponder=ponder)
+    opp = ThinkingAgent(AgentSpec(opponent).build(2), think_time)
+    rng = random.Random(seed)
+
+    score = 0.0
+    latencies: List[float] = []
+    for _ in range(games):
+        game_seed = rng.randint(0, 1000000)
+        random.seed(game_seed)
+        result = play_game(agent, opp, game_seed)
+        score += {1: 1.0, 2: 0.0}.get(result["winner"], 0.5)
+        latencies.extend(result["latencies_1"])
+
+    moves = list(agent.move_stats)
+    return {
+        "score": score / games,
+        "latency_ms": percentiles([1000 * t for t in latencies]),
+        "simulations_run": sum(m["simulations_run"] for m in moves) / len(moves),
+        **agent.ponder_stats(),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Pondering during the opponent's think time")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--simulations", type=int, default=500)
+    parser.add_argument("--think", type=float, default=0.25, help="opponent think time per move (s)")
+    parser.add_argument("--opponent", default="greedy")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print("\n" + "="*60)
+    print("Pondering Benchmark")
+    print("="*60)
+    print(f"MCTS-{args.simulations} vs {args.opponent} thinking {args.think:.2f}s per move, "
+          f"{args.games} games each")
+
+    results = {}
+    for ponder in (False, True):
+        label = "ponder" if ponder else "no ponder"
+        start = time.time()
+        results[label] = run_games(ponder, args.games, args.simulations, args.think, args.opponent, args.seed)
+        print(f"  {label:<10} done in {time.time() - start:.0f}s")
+
+    print("\n\n" + "="*60)
+    print("SUMMARY")
+    print("="*60)
+    print(f"{'Config':<11} {'Score':>6} {'p50 ms':>8} {'p90 ms':>8} {'Sims/move':>10} "
+          f"{'Hit rate':>9} {'Inherited/hit':>14}")
+    print("-" * 72)
+    for label, row in results.items():
+        print(f"{label:<11} {row['score']:>6.2f} {row['latency_ms']['p50']:>8.1f} {row['latency_ms']['p90']:>8.1f} "
+              f"{row['simulations_run']:>10.1f} {row['ponder_hit_rate']:>8.0%} {row['inherited_per_hit']:>14.0f}")
+
+    pondering = results["ponder"]
+    print(f"\nPonder: {pondering['ponder_hits']}/{pondering['ponder_moves']} hits, "
+          f"{pondering['ponder_simulations']} background simulations in {pondering['ponder_seconds']:.1f}s")
+    print("\n" + "="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from bench_harness import AgentSpec, Matchup, run_matchups
+from heuristics import HeuristicEvaluator
+from microbench import build_corpus, PHASES
+from mcts_v2 import MCTSAgent
+
+# (label, MCTSAgent options); "full" is the untruncated baseline
+CONFIGS: List[Tuple[str, Dict[str, Any]]] = [
+    ("full", {}),
+    ("depth-4", {"rollout_depth": 4}),
+    ("depth-8", {"rollout_depth": 8}),
+    ("depth-16", {"rollout_depth": 16}),
+    ("depth-8-mix25", {"rollout_depth": 8, "full_rollout_prob": 0.25}),
+]
+
+
+def percentile(lengths: Counter, q: float) -> int:
+    total = sum(lengths.values())
+    target = q * total
+    seen = 0
+    for length in sorted(lengths):
+        seen += lengths[length]
+        if seen >= target:
+            return length
+    return 0
+
+
+def measure_config(label: str, options: Dict[str, Any], simulations: int, positions: int,
+                   valuenet: Optional[str] = None, seed: int = 0) -> Dict[str, Any]:
+    evaluator = None
+    if valuenet:
+        from value_network import create_default_network
+        evaluator = create_default_network()
+        evaluator.load(valuenet, verbose=False)
+    agent = MCTSAgent(simulations_per_move=simulations, player_id=1, early_stop=False,
+                      evaluator=evaluator or HeuristicEvaluator(), **options)
+
+    corpus = build_corpus()
+    elapsed = 0.0
+    sims = 0
+    for phase in PHASES:
+        for state in corpus[phase][:positions]:
+            random.seed(seed)
+            start = time.perf_counter()
+            agent.choose_action(state, 1)
+            elapsed += time.perf_counter() - start
+            sims += agent.simulations_run
+
+    lengths = agent.rollout_lengths
+    rollouts = sum(lengths.values())
+    return {
+        "label": label,
+        "rollouts": rollouts,
+        "mean_turns": sum(k * v for k, v in lengths.items()) / rollouts if rollouts else 0.0,
+        "p50": percentile(lengths, 0.5),
+        "p90": percentile(lengths, 0.9),
+        "p99": percentile(lengths, 0.99),
+        "max": max(lengths) if lengths else 0,
+        "truncated_pct": 100.0 * agent.truncated_rollouts / rollouts if rollouts else 0.0,
+        "sims_per_sec": sims / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Rollout length and throughput with depth-limited rollouts")
+    parser.add_argument("--simulations", type=int, default=500)
+    parser.add_argument("--positions", type=int, default=3, help="corpus positions per phase")
+    parser.add_argument("--valuenet", default=None,
+                        help="score cutoffs with this value network instead of the heuristic")
+    parser.add_argument("--games", type=int, default=0,
+                        help="also play each config vs Greedy for this many games")
+    parser.add_argument("--game-simulations", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    print("="*60)
+    print("Depth-Limited Rollout Benchmark")
+    print("="*60)
+
+    rows = []
+    for label, options in CONFIGS:
+        row = measure_config(label, options, args.simulations, args.positions, args.valuenet)
+        rows.append(row)
+        print(f"  {label:<14} done ({row['rollouts']} rollouts)")
+
+    print(f"\n{'Config':<14} {'Mean':>6} {'p50':>5} {'p90':>5} {'p99':>5} {'Max':>5} "
+          f"{'Cut %':>6} {'Sims/sec':>9} {'Speedup':>8}")
+    print("-" * 72)
+    base = rows[0]["sims_per_sec"]
+    for row in rows:
+        print(f"{row['label']:<14} {row['mean_turns']:>6.1f} {row['p50']:>5} {row['p90']:>5} {row['p99']:>5} "
+              f"{row['max']:>5} {row['truncated_pct']:>5.1f}% {row['sims_per_sec']:>9.0f} "
+              f"{row['sims_per_sec'] / base:>7.2f}x")
+
+    if args.games:
+        matchups = [Matchup(AgentSpec("mcts", args.game_simulations, dict(options),
+                                      label=f"MCTS-{args.game_simulations} {label}"),
+                            AgentSpec("greedy"), args.games)
+                    for label, options in CONFIGS]
+        results = run_matchups(matchups)
+        print(f"\n{'Config':<14} {'Win % vs Greedy':>16} {'ms/move':>9}")
+        print("-" * 42)
+        for (label, _), result in zip(CONFIGS, results):
+            print(f"{label:<14} {result['win_rate']:>15.1f}% {result['latency_ms']['agent1']['mean']:>9.1f}")
+
+    print("\n" + "="*60)
+
+
+if __name__ == "__main__":
+    main()
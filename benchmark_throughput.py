@@ -0,0 +1,159 @@
+import argparse
+import csv
+import os
+import random
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from bench_harness import AgentSpec, AGENT_DISPLAY_NAMES
+from microbench import build_corpus, PHASES
+from tree_memory import count_nodes
+
+SEARCH_AGENTS = ["mcts", "duct", "opponent", "rave", "rave-greedy", "valuenet"]
+DEFAULT_BUDGETS = [100, 1000, 10000, 100000]
+
+# Full budgets so each row measures the cost of that many simulations:
+# early stopping and the solver would cut the search short
+FULL_BUDGET = {"early_stop": False}
+FULL_BUDGET_OPTIONS = {"mcts": {"early_stop": False, "solver": False}}
+
+
+def measure_search(agent_name: str, simulations: int, phase: str, position: int,
+                   measure_memory: bool = True, seed: int = 0) -> Dict[str, float]:
+    state = build_corpus()[phase][position]
+    player_id = 1
+
+    agent = AgentSpec(agent_name, simulations,
+                      kwargs=FULL_BUDGET_OPTIONS.get(agent_name, FULL_BUDGET)).build(player_id)
+
+    random.seed(seed)
+    start = time.perf_counter()
+    agent.choose_action(state, player_id)
+    latency = time.perf_counter() - start
+    simulations_run = getattr(agent, "simulations_run", simulations)
+    nodes = count_nodes(agent.last_root)
+    agent.last_root = None
+
+    peak_bytes = 0
+    if measure_memory:
+        random.seed(seed)
+        tracemalloc.start()
+        agent.choose_action(state, player_id)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        agent.last_root = None
+
+    return {
+        "agent": agent_name,
+        "simulations": simulations,
+        "phase": phase,
+        "position": position,
+        "simulations_run": simulations_run,
+        "latency_s": latency,
+        "sims_per_sec": simulations_run / latency,
+        "us_per_sim": latency / max(simulations_run, 1) * 1e6,
+        "nodes": nodes,
+        "peak_tree_mb": peak_bytes / 1e6,
+    }
+
+
+def run_throughput(agents: List[str], budgets: List[int], phases: List[str], positions: int = 1,
+                   measure_memory: bool = True, workers: int = 1) -> List[Dict[str, float]]:
+    tasks = [(agent, sims, phase, pos, measure_memory)
+             for agent in agents for sims in budgets for phase in phases for pos in range(positions)]
+
+    rows = []
+    if workers <= 1:
+        for task in tasks:
+            row = measure_search(*task)
+            _print_progress(row)
+            rows.append(row)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for row in pool.map(_measure_task, tasks):
+                _print_progress(row)
+                rows.append(row)
+    return rows
+
+
+def _measure_task(task) -> Dict[str, float]:
+    return measure_search(*task)
+
+
+def _print_progress(row: Dict[str, float]):
+    print(f"  {row['agent']:<12} {row['simulations']:>7} sims  {row['phase']:<5} #{row['position']}  "
+          f"{row['sims_per_sec']:>9.0f} sims/s  {row['nodes']:>7} nodes  {row['peak_tree_mb']:>8.1f} MB")
+
+
+def summarize(rows: List[Dict[str, float]]) -> List[Dict[str, float]]:
+    groups: Dict[tuple, List[Dict[str, float]]] = {}
+    for row in rows:
+        groups.setdefault((row["agent"], row["simulations"]), []).append(row)
+
+    summary = []
+    for (agent, sims), group in groups.items():
+        n = len(group)
+        summary.append({
+            "agent": agent,
+            "simulations": sims,
+            "sims_per_sec": sum(r["sims_per_sec"] for r in group) / n,
+            "us_per_sim": sum(r["us_per_sim"] for r in group) / n,
+            "nodes": sum(r["nodes"] for r in group) / n,
+            "peak_tree_mb": max(r["peak_tree_mb"] for r in group),
+            "latency_s": sum(r["latency_s"] for r in group) / n,
+        })
+    return summary
+
+
+def print_table(summary: List[Dict[str, float]]):
+    print(f"\n{'Agent':<14} {'Sims':>8} {'Sims/sec':>10} {'us/sim':>9} {'vs 1st':>7} "
+          f"{'Nodes':>9} {'Peak MB':>9} {'Latency':>10}")
+    print("-" * 82)
+    first_cost: Dict[str, float] = {}
+    for row in summary:
+        base = first_cost.setdefault(row["agent"], row["us_per_sim"])
+        name = AGENT_DISPLAY_NAMES.get(row["agent"], row["agent"])
+        print(f"{name:<14} {row['simulations']:>8} {row['sims_per_sec']:>10.0f} {row['us_per_sim']:>9.1f} "
+              f"{row['us_per_sim'] / base:>6.2f}x {row['nodes']:>9.0f} {row['peak_tree_mb']:>9.1f} "
+              f"{row['latency_s']:>9.2f}s")
+
+
+def write_csv(rows: List[Dict[str, float]], path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\nWrote {len(rows)} rows to {path}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Search throughput and scaling benchmark")
+    parser.add_argument("--agents", nargs="+", default=SEARCH_AGENTS, choices=SEARCH_AGENTS)
+    parser.add_argument("--budgets", nargs="+", type=int, default=DEFAULT_BUDGETS)
+    parser.add_argument("--phases", nargs="+", default=list(PHASES), choices=PHASES)
+    parser.add_argument("--positions", type=int, default=1, help="positions per phase")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="parallel measurements (contention skews sims/sec; default 1)")
+    parser.add_argument("--csv", default="results/throughput.csv")
+    args = parser.parse_args(argv)
+
+    print("="*60)
+    print("Search Throughput Benchmark")
+    print("="*60)
+
+    rows = run_throughput(args.agents, sorted(args.budgets), args.phases, args.positions,
+                          not args.no_memory, args.workers)
+    summary = summarize(rows)
+    print_table(summary)
+    write_csv(rows, args.csv)
+    write_csv(summary, os.path.splitext(args.csv)[0] + "_summary.csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,54 @@
+import os
 import time
-from typing import List
-from tqdm import tqdm
 
-from battle_v2 import BattleState, PlayerState, PokemonInstance, step, legal_actions_for_player, ActionType
-from dex_v2 import DEX_V2
-from mcts_v2 import MCTSAgent
-from mcts_value_net import create_mcts_with_value_net
-from main_v2 import GreedyAgent
+from bench_harness import AgentSpec, Matchup, run_matchup, run_matchups, valuenet_suite
 
 
-def create_teams():
-    team1 = [PokemonInstance.from_spec(DEX_V2[0]),
-             PokemonInstance.from_spec(DEX_V2[2]),
-             PokemonInstance.from_spec(DEX_V2[7])]
+def benchmark_table_evaluator(simulations: int, num_games: int, results_valuenet):
+    from train_value_network import play_random_game
+    from value_network import create_default_network
+    from value_table import load_or_distill
     
-    team2 = [PokemonInstance.from_spec(DEX_V2[1]),
-             PokemonInstance.from_spec(DEX_V2[4]),
-             PokemonInstance.from_spec(DEX_V2[3])]
+    net = create_default_network()
+    net.load("value_network_v1.pkl", verbose=False)
+    table = load_or_distill(network_path="value_network_v1.pkl", table_path="value_table.npy")
     
-    return team1, team2
-
-
-def play_game(agent1, agent2, verbose=False):
-    team1, team2 = create_teams()
-    state = BattleState(
-        player1=PlayerState(team=team1, active_index=0),
-        player2=PlayerState(team=team2, active_index=0)
-    )
-    
-    while not state.terminal:
-        a1 = agent1.choose_action(state, 1)
-        a2 = agent2.choose_action(state, 2)
-        state = step(state, a1, a2)
-        
-        if verbose and state.turn_number % 5 == 0:
-            print(f"Turn {state.turn_number}")
-    
-    return state.winner
-
-
-def benchmark_matchup(agent1, agent2, name1: str, name2: str, num_games: int = 50):
-    print(f"\n{'='*60}")
-    print(f"{name1} vs {name2} ({num_games} games)")
-    print(f"{'='*60}")
+    states = []
+    for _ in range(100):
+        game_states, _ = play_random_game()
+        states.extend(game_states)
     
-    wins_p1 = 0
-    wins_p2 = 0
-    draws = 0
+    start_time = time.time()
+    for state in states:
+        net.predict(state, 1)
+    net_time = (time.time() - start_time) / len(states)
     
     start_time = time.time()
+    for state in states:
+        table.predict(state, 1)
+    table_time = (time.time() - start_time) / len(states)
+    
+    mean_error = sum(abs(table.predict(s, 1) - net.predict(s, 1)) for s in states) / len(states)
+    
+    print(f"\nEvaluation speed ({len(states)} states):")
+    print(f"  Float network:     {net_time*1e6:.1f}us/eval")
+    print(f"  Lookup table:      {table_time*1e6:.1f}us/eval")
+    print(f"  Speedup:           {net_time/table_time:.2f}x")
+    print(f"  Mean abs error:    {mean_error:.4f}")
     
-    for i in tqdm(range(num_games), desc="Playing"):
-        winner = play_game(agent1, agent2)
-        
-        if winner == 1:
-            wins_p1 += 1
-        elif winner == 2:
-            wins_p2 += 1
-        else:
-            draws += 1
-    
-    elapsed = time.time() - start_time
-    
-    print(f"\nResults:")
-    print(f"  {name1}: {wins_p1} ({wins_p1/num_games*100:.1f}%)")
-    print(f"  {name2}: {wins_p2} ({wins_p2/num_games*100:.1f}%)")
-    print(f"  Draws: {draws}")
-    print(f"  Time: {elapsed:.1f}s ({elapsed/num_games:.3f}s/game)")
-    
-    return wins_p1, wins_p2, draws, elapsed
+    results_table = run_matchup(Matchup(
+        AgentSpec("valuetable", simulations, label=f"MCTS-ValueTable-{simulations}"),
+        AgentSpec("greedy"), num_games))
+    
+    win_rate_net = results_valuenet['win_rate']
+    win_rate_table = results_table['win_rate']
+    latency_net = results_valuenet['latency_ms']['agent1']['mean']
+    latency_table = results_table['latency_ms']['agent1']['mean']
+    
+    print(f"\nVs Greedy Baseline:")
+    print(f"  MCTS (Value Net):    {win_rate_net:.1f}% win rate, {latency_net:.1f}ms/move")
+    print(f"  MCTS (Value Table):  {win_rate_table:.1f}% win rate, {latency_table:.1f}ms/move")
+    print(f"  Difference:          {win_rate_table - win_rate_net:+.1f}%")
 
 
 def main():
@@ -85,65 +65,26 @@ def main():
     num_games = 50
     simulations = 100
     
-    print("Creating agents...")
-    greedy = GreedyAgent()
-    mcts_random = MCTSAgent(simulations_per_move=simulations, player_id=1)
-    
-    try:
-        mcts_valuenet = create_mcts_with_value_net(
-            network_path="value_network_v1.pkl",
-            simulations=simulations,
-            player_id=1
-        )
-        has_trained_network = True
-    except Exception as e:
-        print(f"\nWarning: Could not load trained network: {e}")
+    has_trained_network = os.path.exists("value_network_v1.pkl")
+    if not has_trained_network:
+        print("Warning: value_network_v1.pkl not found.")
         print("Train a network first with: python3 train_value_network.py")
         print("\nUsing untrained value network for demo purposes...")
-        from value_network import create_default_network
-        from mcts_value_net import MCTSAgentValueNet
-        net = create_default_network()
-        mcts_valuenet = MCTSAgentValueNet(net, simulations_per_move=simulations, player_id=1)
-        has_trained_network = False
     
-    print("\n" + "="*60)
-    print("Baseline: MCTS (Random Rollouts) vs Greedy")
-    print("="*60)
-    
-    results_random = benchmark_matchup(
-        mcts_random, greedy,
-        f"MCTS-Random-{simulations}", "Greedy",
-        num_games=num_games
-    )
-    
-    print("\n" + "="*60)
-    print("Enhanced: MCTS (Value Network) vs Greedy")
-    print("="*60)
-    
-    results_valuenet = benchmark_matchup(
-        mcts_valuenet, greedy,
-        f"MCTS-ValueNet-{simulations}", "Greedy",
-        num_games=num_games
-    )
-    
-    print("\n" + "="*60)
-    print("Head-to-Head: Value Network MCTS vs Random Rollout MCTS")
-    print("="*60)
-    
-    mcts_random_p2 = MCTSAgent(simulations_per_move=simulations, player_id=2)
-    results_head2head = benchmark_matchup(
-        mcts_valuenet, mcts_random_p2,
-        f"MCTS-ValueNet-{simulations}", f"MCTS-Random-{simulations}",
-        num_games=num_games
-    )
+    # Baseline: MCTS (Random Rollouts) vs Greedy
+    # Enhanced: MCTS (Value Network) vs Greedy
+    # Head-to-Head: Value Network MCTS vs Random Rollout MCTS
+    results_random, results_valuenet, results_head2head = run_matchups(valuenet_suite(
+        num_games, simulations,
+        network_path="value_network_v1.pkl" if has_trained_network else None))
     
     print("\n" + "="*60)
     print("Summary")
     print("="*60)
     
-    win_rate_random = results_random[0] / num_games * 100
-    win_rate_valuenet = results_valuenet[0] / num_games * 100
-    win_rate_h2h = results_head2head[0] / num_games * 100
+    win_rate_random = results_random['win_rate']
+    win_rate_valuenet = results_valuenet['win_rate']
+    win_rate_h2h = results_head2head['win_rate']
     
     print(f"\nVs Greedy Baseline:")
     print(f"  MCTS (Random):     {win_rate_random:.1f}% win rate")
@@ -153,10 +94,18 @@ def main():
     print(f"\nHead-to-Head:")
     print(f"  MCTS (Value Net):  {win_rate_h2h:.1f}% win rate vs Random MCTS")
     
-    print(f"\nTime per game:")
-    print(f"  MCTS (Random):     {results_random[3]/num_games:.3f}s")
-    print(f"  MCTS (Value Net):  {results_valuenet[3]/num_games:.3f}s")
-    print(f"  Speedup:           {results_random[3]/results_valuenet[3]:.2f}x")
+    latency_random = results_random['latency_ms']['agent1']['mean']
+    latency_valuenet = results_valuenet['latency_ms']['agent1']['mean']
+    print(f"\nTime per move:")
+    print(f"  MCTS (Random):     {latency_random:.1f}ms")
+    print(f"  MCTS (Value Net):  {latency_valuenet:.1f}ms")
+    print(f"  Speedup:           {latency_random/latency_valuenet:.2f}x")
+    
+    if has_trained_network:
+        print("\n" + "="*60)
+        print("Distilled Lookup Table vs Float Network")
+        print("="*60)
+        benchmark_table_evaluator(simulations, num_games, results_valuenet)
     
     if not has_trained_network:
         print("\n" + "="*60)
@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from microbench import build_corpus, PHASES
+
+GOLDEN_PATH = "golden/search_equivalence.json"
+
+# (name, agent, options): seeded searches whose decisions and root statistics
+# must not change when the search internals are refactored
+CASES: List[Tuple[str, str, Dict[str, Any]]] = [
+    ("mcts", "mcts", {}),
+    ("mcts-no-solver", "mcts", {"solver": False, "early_stop": False}),
+    ("mcts-lazy", "mcts", {"state_interval": 3, "promote_visits": 4}),
+    ("mcts-budget", "mcts", {"max_nodes": 60}),
+    ("mcts-halving", "mcts", {"root_strategy": "halving"}),
+    ("mcts-depth", "mcts", {"rollout_depth": 4, "full_rollout_prob": 0.25}),
+    ("mcts-bias", "mcts", {"progressive_bias": True, "order_untried": True}),
+    ("rave", "rave", {}),
+    ("rave-no-stop", "rave", {"early_stop": False}),
+    ("rave-greedy", "rave-greedy", {}),
+    ("valuenet", "valuenet", {}),
+    ("valuenet-plain", "valuenet", {"incremental_features": False, "early_stop": False}),
+    ("valuenet-halving", "valuenet", {"root_strategy": "halving"}),
+]
+
+
+def build_agent(agent: str, simulations: int, player_id: int, options: Dict[str, Any]):
+    if agent == "mcts":
+        from mcts_v2 import MCTSAgent
+        return MCTSAgent(simulations_per_move=simulations, player_id=player_id, **options)
+    if agent == "rave":
+        from mcts_rave import MCTSRAVEAgent
+        return MCTSRAVEAgent(simulations_per_move=simulations, player_id=player_id, **options)
+    if agent == "rave-greedy":
+        from mcts_rave import MCTSRAVEGreedyAgent
+        return MCTSRAVEGreedyAgent(simulations_per_move=simulations, player_id=player_id, **options)
+    if agent == "valuenet":
+        from mcts_value_net import MCTSAgentValueNet
+        from value_network import create_default_network
+        net = create_default_network()
+        net.load("value_network_v1.pkl", verbose=False)
+        return MCTSAgentValueNet(net, simulations_per_move=simulations, player_id=player_id, **options)
+    raise KeyError(agent)
+
+
+def _stat(node, name: str):
+    value = getattr(node, name, None)
+    return round(float(value), 9) if value is not None else None
+
+
+def root_summary(root) -> List[List[Any]]:
+    rows = []
+    for (a1, a2), child in sorted(root.children.items(), key=lambda kv: (kv[0][0].value, kv[0][1].value)):
+        wins = _stat(child, 'wins')
+        if wins is None:
+            wins = _stat(child, 'value_sum')
+        rows.append([a1.name, a2.name, child.visits, wins])
+    return rows
+
+
+def run_case(agent: str, options: Dict[str, Any], simulations: int, positions: int,
+             moves: int = 3) -> List[Dict[str, Any]]:
+    # A few consecutive moves per agent so state carried between moves
+    # (timers, caches, budgets) is exercised too
+    corpus = build_corpus()
+    records = []
+    for player_id in (1, 2):
+        searcher = build_agent(agent, simulations, player_id, options)
+        for phase in PHASES:
+            for index, state in enumerate(corpus[phase][:positions]):
+                for move in range(moves):
+                    random.seed(PHASES.index(phase) * 1000 + index * 100 + player_id * 10 + move)
+                    action = searcher.choose_action(state, player_id)
+                    root = searcher.last_root
+                    records.append({
+                        "phase": phase, "position": index, "player": player_id, "move": move,
+                        "action": action.name,
+                        "simulations_run": searcher.simulations_run,
+                        "root_visits": root.visits,
+                        "children": root_summary(root),
+                    })
+    return records
+
+
+def capture(simulations: int, positions: int, cases: Optional[List[str]] = None,
+            golden: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # With cases, only those are re-recorded into the existing golden outputs
+    golden = golden or {"simulations": simulations, "positions": positions, "cases": {}}
+    for name, agent, options in CASES:
+        if cases and name not in cases:
+            continue
+        golden["cases"][name] = run_case(agent, options, golden["simulations"], golden["positions"])
+        print(f"  {name:<18} {len(golden['cases'][name])} searches")
+    return golden
+
+
+def compare(expected: List[Dict[str, Any]], actual: List[Dict[str, Any]]) -> Optional[str]:
+    for want, got in zip(expected, actual):
+        if want != got:
+            where = f"{want['phase']}#{want['position']} player {want['player']} move {want['move']}"
+            for key in want:
+                if want[key] != got.get(key):
+                    return f"{where}: {key} expected {want[key]!r}, got {got.get(key)!r}"
+    if len(expected) != len(actual):
+        return f"expected {len(expected)} searches, got {len(actual)}"
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Seeded search equivalence check against golden outputs")
+    parser.add_argument("--capture", action="store_true", help="record the golden outputs")
+    parser.add_argument("--golden", default=GOLDEN_PATH)
+    parser.add_argument("--simulations", type=int, default=150)
+    parser.add_argument("--positions", type=int, default=2, help="corpus positions per phase")
+    parser.add_argument("--cases", nargs="+", help="only check (or with --capture, re-record) these cases")
+    args = parser.parse_args(argv)
+
+    print("="*60)
+    print("Search Equivalence Check")
+    print("="*60)
+
+    if args.capture:
+        existing = None
+        if args.cases and os.path.exists(args.golden):
+            with open(args.golden) as f:
+                existing = json.load(f)
+        golden = capture(args.simulations, args.positions, args.cases, existing)
+        directory = os.path.dirname(args.golden)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.golden, 'w') as f:
+            json.dump(golden, f)
+        print(f"\nWrote golden outputs to {args.golden}")
+        return 0
+
+    with open(args.golden) as f:
+        golden = json.load(f)
+
+    failures = 0
+    for name, agent, options in CASES:
+        if args.cases and name not in args.cases:
+            continue
+        expected = golden["cases"].get(name)
+        if expected is None:
+            print(f"  {name:<18} SKIP (no golden output)")
+            continue
+        actual = run_case(agent, options, golden["simulations"], golden["positions"])
+        problem = compare(expected, actual)
+        print(f"  {name:<18} {'OK' if problem is None else 'FAIL'}" + (f"  {problem}" if problem else ""))
+        failures += problem is not None
+
+    print(f"\n{'All cases match' if not failures else f'{failures} case(s) differ'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import math
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# One root child as seen by the deciding player: (score_sum, visits), with the
+# score in [0, 1] from that player's point of view, a float for a proven
+# value, or None if never visited.
+ChildStats = Union[None, float, Tuple[float, int]]
+
+
+def joint_rows(children: Dict, my_actions: List, opp_actions: List, player_id: int,
+               child_stats: Callable[[object], ChildStats]) -> List[List[ChildStats]]:
+    rows = []
+    for my_action in my_actions:
+        row = []
+        for opp_action in opp_actions:
+            joint = (my_action, opp_action) if player_id == 1 else (opp_action, my_action)
+            child = children.get(joint)
+            row.append(child_stats(child) if child is not None else None)
+        rows.append(row)
+    return rows
+
+
+def child_bounds(entry: ChildStats, remaining: int, delta: Optional[float]) -> Tuple[float, float]:
+    if entry is None:
+        return 0.0, 1.0
+    if isinstance(entry, float):
+        return entry, entry
+    score, visits = entry
+    if delta is None:
+        # Range the mean can still reach if all remaining simulations land here
+        return score / (visits + remaining), (score + remaining) / (visits + remaining)
+    margin = math.sqrt(math.log(1 / delta) / (2 * visits))
+    mean = score / visits
+    return mean - margin, mean + margin
+
+
+def maxmin_decided(rows: List[List[ChildStats]], remaining: int,
+                   delta: Optional[float] = None) -> bool:
+    # True when the action picked by the worst-case (max-min) rule can no
+    # longer change: its lowest reachable worst case beats every other
+    # action's highest one. delta=None uses the exact remaining-budget bound,
+    # otherwise a Hoeffding bound at confidence 1 - delta.
+    if len(rows) < 2:
+        return True
+
+    worst_low = []
+    worst_high = []
+    for row in rows:
+        low = high = float('inf')
+        for entry in row:
+            lo, hi = child_bounds(entry, remaining, delta)
+            low = min(low, lo)
+            high = min(high, hi)
+        worst_low.append(low)
+        worst_high.append(high)
+
+    best = max(range(len(rows)), key=lambda i: worst_low[i])
+    return all(worst_low[best] > worst_high[i] for i in range(len(rows)) if i != best)
+
+
+def visits_decided(counts: List[int], remaining: int) -> bool:
+    # Most-visited selection: the leader cannot be caught in the remaining budget
+    if len(counts) < 2:
+        return True
+    ordered = sorted(counts, reverse=True)
+    return ordered[0] - ordered[1] > remaining
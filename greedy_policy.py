@@ -0,0 +1,90 @@
+import random
+from typing import Dict, List, Tuple
+
+from battle_v2 import (
+    BattleState, ActionType, PokemonSpec, PokemonInstance,
+    legal_actions_for_player, calculate_damage
+)
+from dex_v2 import DEX_V2
+
+
+def expected_move_value(move, attacker: PokemonInstance, defender: PokemonInstance) -> float:
+    base_dmg = calculate_damage(move, attacker, defender)
+
+    expected = base_dmg * (move.accuracy / 100)
+    if move.recoil_percent > 0:
+        expected -= base_dmg * (move.recoil_percent / 100) * 0.5
+
+    return expected
+
+
+class GreedyPolicyTable:
+    # The greedy move only depends on the (attacker, defender) species pair, so
+    # we score every pair of a dex once and answer each query with a dict lookup.
+
+    def __init__(self, dex: List[PokemonSpec]):
+        self.best_attack: Dict[Tuple[str, str], ActionType] = {}
+        self.expected: Dict[Tuple[str, str], Tuple[float, float]] = {}
+
+        for attacker in dex:
+            for defender in dex:
+                self._add_pair(attacker, defender)
+
+    def _add_pair(self, attacker: PokemonSpec, defender: PokemonSpec) -> ActionType:
+        attacker_mon = PokemonInstance.from_spec(attacker)
+        defender_mon = PokemonInstance.from_spec(defender)
+
+        expected = tuple(expected_move_value(move, attacker_mon, defender_mon)
+                         for move in attacker.moves[:2])
+
+        best_action = None
+        max_expected = -1
+        for action, value in zip((ActionType.USE_MOVE_1, ActionType.USE_MOVE_2), expected):
+            if value > max_expected:
+                max_expected = value
+                best_action = action
+
+        key = (attacker.name, defender.name)
+        self.expected[key] = expected
+        self.best_attack[key] = best_action
+        return best_action
+
+    def best_attack_for(self, attacker: PokemonSpec, defender: PokemonSpec) -> ActionType:
+        action = self.best_attack.get((attacker.name, defender.name))
+        if action is None:
+            action = self._add_pair(attacker, defender)
+        return action
+
+    def expected_damage(self, attacker: PokemonSpec, defender: PokemonSpec) -> Tuple[float, float]:
+        key = (attacker.name, defender.name)
+        if key not in self.expected:
+            self._add_pair(attacker, defender)
+        return self.expected[key]
+
+    def choose_action(self, state: BattleState, player_id: int) -> ActionType:
+        my_state = state.player1 if player_id == 1 else state.player2
+        my_active = my_state.team[my_state.active_index]
+
+        if state.terminal or my_active.fainted:
+            legal = legal_actions_for_player(state, player_id)
+            return random.choice(legal) if legal else ActionType.USE_MOVE_1
+
+        opp_state = state.player2 if player_id == 1 else state.player1
+        opp_active = opp_state.team[opp_state.active_index]
+
+        return self.best_attack_for(my_active.spec, opp_active.spec)
+
+
+_TABLES: Dict[int, GreedyPolicyTable] = {}
+
+
+def get_greedy_table(dex: List[PokemonSpec] = DEX_V2) -> GreedyPolicyTable:
+    table = _TABLES.get(id(dex))
+    if table is None:
+        table = GreedyPolicyTable(dex)
+        _TABLES[id(dex)] = table
+    return table
+
+
+def greedy_action(state: BattleState, player_id: int) -> ActionType:
+    return get_greedy_table().choose_action(state, player_id)
@@ -0,0 +1,97 @@
+from typing import Dict, Tuple
+
+from battle_v2 import (
+    BattleState, PlayerState, ActionType, PokemonInstance, get_type_multiplier,
+    legal_actions_for_player, is_switch_action, get_switch_index
+)
+from greedy_policy import get_greedy_table
+
+
+def hp_fraction(player: PlayerState) -> float:
+    return sum(mon.current_hp / mon.spec.max_hp for mon in player.team)
+
+
+def alive_count(player: PlayerState) -> int:
+    return sum(not mon.fainted for mon in player.team)
+
+
+def mon_edge(att: PokemonInstance, dfn: PokemonInstance) -> float:
+    # Best type multiplier att can hit dfn with
+    if att.fainted or dfn.fainted:
+        return 1.0
+    return max(get_type_multiplier(move.type, dfn.spec.type) for move in att.spec.moves)
+
+
+def type_edge(attacker: PlayerState, defender: PlayerState) -> float:
+    return mon_edge(attacker.team[attacker.active_index], defender.team[defender.active_index])
+
+
+def _players(state: BattleState, player_id: int) -> Tuple[PlayerState, PlayerState]:
+    if player_id == 1:
+        return state.player1, state.player2
+    return state.player2, state.player1
+
+
+def heuristic_value(state: BattleState, player_id: int, hp_weight: float = 0.5,
+                    alive_weight: float = 0.3, matchup_weight: float = 0.2) -> float:
+    # Cheap estimate in [0, 1] of player_id's chance to win: remaining HP share,
+    # alive-count share and the type matchup of the two active Pokemon
+    if state.terminal:
+        if state.winner == player_id:
+            return 1.0
+        return 0.5 if state.winner is None else 0.0
+
+    me, opp = _players(state, player_id)
+    my_hp, opp_hp = hp_fraction(me), hp_fraction(opp)
+    my_alive, opp_alive = alive_count(me), alive_count(opp)
+    my_edge, opp_edge = type_edge(me, opp), type_edge(opp, me)
+
+    hp_share = my_hp / (my_hp + opp_hp) if my_hp + opp_hp > 0 else 0.5
+    alive_share = my_alive / (my_alive + opp_alive) if my_alive + opp_alive > 0 else 0.5
+    matchup = my_edge / (my_edge + opp_edge) if my_edge + opp_edge > 0 else 0.5
+
+    total = hp_weight + alive_weight + matchup_weight
+    return (hp_weight * hp_share + alive_weight * alive_share + matchup_weight * matchup) / total
+
+
+def action_prior(state: BattleState, player_id: int, action: ActionType) -> float:
+    # Prior in [0, 1] for one player's own action: a move's expected damage
+    # (greedy_action's estimate) as a share of the defender's remaining HP, or
+    # the type matchup of the Pokemon a switch brings in
+    me, opp = _players(state, player_id)
+    active = me.team[me.active_index]
+    target = opp.team[opp.active_index]
+
+    if is_switch_action(action):
+        incoming = me.team[get_switch_index(action)]
+        if target.fainted:
+            return 0.5
+        mine, theirs = mon_edge(incoming, target), mon_edge(target, incoming)
+        return mine / (mine + theirs)
+
+    if active.fainted or target.fainted:
+        return 0.0
+    damage = get_greedy_table().expected_damage(active.spec, target.spec)
+    index = 0 if action == ActionType.USE_MOVE_1 else 1
+    return min(1.0, max(0.0, damage[index]) / target.current_hp)
+
+
+def joint_priors(state: BattleState) -> Dict[Tuple[ActionType, ActionType], float]:
+    # Both players' priors averaged: joint actions where either side plays
+    # well are the ones worth searching first
+    p1 = {a: action_prior(state, 1, a) for a in legal_actions_for_player(state, 1)}
+    p2 = {a: action_prior(state, 2, a) for a in legal_actions_for_player(state, 2)}
+    return {(a1, a2): (v1 + v2) / 2 for a1, v1 in p1.items() for a2, v2 in p2.items()}
+
+
+class HeuristicEvaluator:
+    # Same predict(state, player_id) interface as ValueNetwork, so either can
+    # score truncated rollouts
+
+    def __init__(self, hp_weight: float = 0.5, alive_weight: float = 0.3, matchup_weight: float = 0.2):
+        self.hp_weight = hp_weight
+        self.alive_weight = alive_weight
+        self.matchup_weight = matchup_weight
+
+    def predict(self, state: BattleState, player_id: int) -> float:
+        return heuristic_value(state, player_id, self.hp_weight, self.alive_weight, self.matchup_weight)
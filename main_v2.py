@@ -3,9 +3,10 @@ import random
 from typing import List, Tuple
 from battle_v2 import (
     BattleState, PlayerState, PokemonInstance, ActionType,
-    step, legal_actions_for_player, calculate_damage
+    step, legal_actions_for_player
 )
 from dex_v2 import DEX_V2
+from greedy_policy import greedy_action
 from mcts_v2 import MCTSAgent
 
 
@@ -20,35 +21,7 @@ class RandomAgent(Agent):
 
 class GreedyAgent(Agent):
     def choose_action(self, state: BattleState, player_id: int) -> ActionType:
-        legal = legal_actions_for_player(state, player_id)
-        attacks = [a for a in legal if a in (ActionType.USE_MOVE_1, ActionType.USE_MOVE_2)]
-        switches = [a for a in legal if a not in attacks]
-        
-        if not attacks:
-            return random.choice(switches) if switches else legal[0]
-        
-        my_state = state.player1 if player_id == 1 else state.player2
-        opp_state = state.player2 if player_id == 1 else state.player1
-        my_active = my_state.team[my_state.active_index]
-        opp_active = opp_state.team[opp_state.active_index]
-        
-        best_action = None
-        max_expected = -1
-        
-        for action in attacks:
-            move_idx = 0 if action == ActionType.USE_MOVE_1 else 1
-            move = my_active.spec.moves[move_idx]
-            base_dmg = calculate_damage(move, my_active, opp_active)
-            
-            expected = base_dmg * (move.accuracy / 100)
-            if move.recoil_percent > 0:
-                expected -= base_dmg * (move.recoil_percent / 100) * 0.5
-            
-            if expected > max_expected:
-                max_expected = expected
-                best_action = action
-        
-        return best_action if best_action else legal[0]
+        return greedy_action(state, player_id)
 
 class HumanAgent(Agent):
     def choose_action(self, state: BattleState, player_id: int) -> ActionType:
@@ -161,7 +134,8 @@ def main():
         agent1 = MCTSAgent(simulations_per_move=100, player_id=1)
         agent2 = GreedyAgent()
     elif mode == '8':
-        agent2 = MCTSAgent(simulations_per_move=100, player_id=2)
+        # Searches on in the background while the human decides
+        agent2 = MCTSAgent(simulations_per_move=100, player_id=2, ponder=True)
     
     # Game loop
     while not state.terminal:
@@ -175,8 +149,21 @@ def main():
     
     print_battle_state(state)
     print(f"\nWinner: Player {state.winner if state.winner else 'Draw'}")
+    
+    for agent in (agent1, agent2):
+        if getattr(agent, 'ponder', False):
+            agent.stop_ponder()
+            stats = agent.ponder_stats()
+            print(f"Ponder: {stats['ponder_hits']}/{stats['ponder_moves']} hits ({stats['ponder_hit_rate']:.0%}), "
+                  f"{stats['inherited_per_hit']:.0f} inherited visits per hit")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    from profiling import add_profile_arguments, run_profiled
+    
+    parser = argparse.ArgumentParser(description="Play a Pokemon battle")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    run_profiled(main, args.profile, args.profile_output)
 
 
@@ -0,0 +1,244 @@
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import random
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+from bench_harness import AgentSpec, parse_agent_spec, get_worker_agent, play_game, default_workers
+from dex_v2 import DEX_V2
+
+TEAM_SIZE = 3
+
+
+def all_teams(dex_size: int = len(DEX_V2)) -> List[Tuple[int, ...]]:
+    return list(itertools.combinations(range(dex_size), TEAM_SIZE))
+
+
+def lead_orders(team: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+    # One lineup per choice of lead; the bench keeps dex order
+    return [(lead,) + tuple(i for i in team if i != lead) for lead in team]
+
+
+def team_name(team: Tuple[int, ...]) -> str:
+    return "/".join(DEX_V2[i].name for i in team)
+
+
+def cell_key(lineup1: Tuple[int, ...], lineup2: Tuple[int, ...]) -> str:
+    return f"{'-'.join(map(str, lineup1))}|{'-'.join(map(str, lineup2))}"
+
+
+def build_cells(teams: List[Tuple[int, ...]], all_leads: bool = True) -> List[Tuple[Tuple[int, ...], Tuple[int, ...]]]:
+    lineups = [lineup for team in teams for lineup in (lead_orders(team) if all_leads else [team])]
+    return [(l1, l2) for l1 in lineups for l2 in lineups]
+
+
+def config_hash(agent1: AgentSpec, agent2: AgentSpec, games: int, turn_limit: int, seed: int) -> str:
+    config = {
+        "agent1": [agent1.name, agent1.simulations, sorted(agent1.kwargs.items())],
+        "agent2": [agent2.name, agent2.simulations, sorted(agent2.kwargs.items())],
+        "games": games,
+        "turn_limit": turn_limit,
+        "seed": seed,
+    }
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:12]
+
+
+class MatrixCache:
+    # Append-only JSONL of finished cells, one file per configuration hash, so an
+    # interrupted or extended run only plays the cells that are missing.
+
+    def __init__(self, directory: str, key: str, config: dict):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{key}.jsonl")
+        self.cells: Dict[str, dict] = {}
+
+        config_path = os.path.join(directory, f"{key}.json")
+        if not os.path.exists(config_path):
+            with open(config_path, 'w') as f:
+                json.dump(config, f, indent=2)
+
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        row = json.loads(line)
+                        self.cells[row["cell"]] = row
+
+    def __contains__(self, cell: str) -> bool:
+        return cell in self.cells
+
+    def add(self, row: dict):
+        self.cells[row["cell"]] = row
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(row) + "\n")
+
+
+def play_cell(spec1: AgentSpec, spec2: AgentSpec, lineup1: Tuple[int, ...], lineup2: Tuple[int, ...],
+              games: int, turn_limit: int, seed: int) -> dict:
+    key = cell_key(lineup1, lineup2)
+    rng = random.Random(zlib.crc32(key.encode()) ^ seed)
+
+    agent1 = get_worker_agent(spec1, 1)
+    agent2 = get_worker_agent(spec2, 2)
+
+    wins = losses = draws = turns = 0
+    start = time.time()
+    for _ in range(games):
+        game_seed = rng.randint(0, 1000000)
+        random.seed(game_seed)
+        result = play_game(agent1, agent2, game_seed, turn_limit, lineups=(lineup1, lineup2))
+        if result["winner"] == 1:
+            wins += 1
+        elif result["winner"] == 2:
+            losses += 1
+        else:
+            draws += 1
+        turns += result["turns"]
+
+    return {
+        "cell": key,
+        "lineup1": list(lineup1),
+        "lineup2": list(lineup2),
+        "games": games,
+        "wins": wins,
+        "losses": losses,
+        "draws": draws,
+        "score": (wins + 0.5 * draws) / games,
+        "avg_turns": turns / games,
+        "time": time.time() - start,
+    }
+
+
+def run_matrix(agent1: AgentSpec, agent2: AgentSpec, cells, cache: MatrixCache, games: int,
+               turn_limit: int = 100, seed: int = 0, workers: Optional[int] = None) -> Dict[str, dict]:
+    missing = [(l1, l2) for l1, l2 in cells if cell_key(l1, l2) not in cache]
+    print(f"{len(cells)} cells, {len(cells) - len(missing)} cached, {len(missing)} to play "
+          f"({len(missing) * games} games)")
+
+    workers = workers or default_workers()
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_cell, agent1, agent2, l1, l2, games, turn_limit, seed)
+                   for l1, l2 in missing]
+        report_every = max(1, len(futures) // 20)
+        for done, future in enumerate(as_completed(futures), 1):
+            cache.add(future.result())
+            if done % report_every == 0 or done == len(futures):
+                elapsed = time.time() - start
+                print(f"  {done}/{len(futures)} cells ({elapsed:.0f}s, "
+                      f"{done * games / elapsed:.1f} games/s)")
+
+    return {cell_key(l1, l2): cache.cells[cell_key(l1, l2)] for l1, l2 in cells}
+
+
+def team_matrix(rows: Dict[str, dict], teams: List[Tuple[int, ...]]):
+    import numpy as np
+
+    index = {team: i for i, team in enumerate(teams)}
+    points = np.zeros((len(teams), len(teams)))
+    games = np.zeros((len(teams), len(teams)), dtype=np.int64)
+    for row in rows.values():
+        i = index[tuple(sorted(row["lineup1"]))]
+        j = index[tuple(sorted(row["lineup2"]))]
+        points[i, j] += row["wins"] + 0.5 * row["draws"]
+        games[i, j] += row["games"]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        score = np.where(games > 0, points / games, np.nan)
+    return score, games
+
+
+def write_outputs(rows: Dict[str, dict], teams: List[Tuple[int, ...]], prefix: str):
+    import numpy as np
+
+    directory = os.path.dirname(prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(f"{prefix}_cells.csv", 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["team1", "lead1", "team2", "lead2", "games", "wins", "losses", "draws",
+                         "score", "avg_turns"])
+        for row in rows.values():
+            writer.writerow([team_name(tuple(sorted(row["lineup1"]))), DEX_V2[row["lineup1"][0]].name,
+                             team_name(tuple(sorted(row["lineup2"]))), DEX_V2[row["lineup2"][0]].name,
+                             row["games"], row["wins"], row["losses"], row["draws"],
+                             f"{row['score']:.4f}", f"{row['avg_turns']:.1f}"])
+
+    score, games = team_matrix(rows, teams)
+    names = [team_name(t) for t in teams]
+
+    with open(f"{prefix}_teams.csv", 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["team1"] + names)
+        for name, scores in zip(names, score):
+            writer.writerow([name] + ["" if np.isnan(x) else f"{x:.4f}" for x in scores])
+
+    np.savez(f"{prefix}.npz", score=score, games=games, teams=np.array(teams), team_names=np.array(names))
+    print(f"\nWrote {prefix}_cells.csv, {prefix}_teams.csv and {prefix}.npz")
+    return score
+
+
+def print_summary(score, teams: List[Tuple[int, ...]], agent1: AgentSpec, agent2: AgentSpec, top: int = 5):
+    import numpy as np
+
+    per_team = np.nanmean(score, axis=1)
+    order = [i for i in np.argsort(-per_team) if not np.isnan(per_team[i])]
+
+    print("\n" + "="*60)
+    print(f"{agent1.display_name()} score by own team (vs {agent2.display_name()}, all opponents)")
+    print("="*60)
+    print(f"  Overall: {np.nanmean(score):.3f}")
+    print("  Best teams:")
+    for i in order[:top]:
+        print(f"    {team_name(teams[i]):<32} {per_team[i]:.3f}")
+    print("  Worst teams:")
+    for i in order[-top:]:
+        print(f"    {team_name(teams[i]):<32} {per_team[i]:.3f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Agent performance over every DEX_V2 team pairing")
+    parser.add_argument("--agent1", default="mcts:50")
+    parser.add_argument("--agent2", default="greedy")
+    parser.add_argument("--games", type=int, default=2, help="games per cell")
+    parser.add_argument("--leads", choices=["all", "first"], default="all",
+                        help="every lead order, or only the lowest dex index leading")
+    parser.add_argument("--teams", type=int, default=None, help="only use the first N teams")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--turn-limit", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", default="results/matrix_cache")
+    parser.add_argument("--output", default="results/matrix", help="output path prefix")
+    args = parser.parse_args(argv)
+
+    agent1 = parse_agent_spec(args.agent1)
+    agent2 = parse_agent_spec(args.agent2)
+    teams = all_teams()[:args.teams] if args.teams else all_teams()
+    cells = build_cells(teams, all_leads=args.leads == "all")
+
+    key = config_hash(agent1, agent2, args.games, args.turn_limit, args.seed)
+    cache = MatrixCache(args.cache_dir, key, {
+        "agent1": args.agent1, "agent2": args.agent2, "games": args.games,
+        "turn_limit": args.turn_limit, "seed": args.seed,
+    })
+
+    print("="*60)
+    print(f"Team Matrix: {agent1.display_name()} vs {agent2.display_name()}")
+    print("="*60)
+    print(f"{len(teams)} teams, leads={args.leads}, {args.games} games/cell, cache {cache.path}")
+
+    rows = run_matrix(agent1, agent2, cells, cache, args.games, args.turn_limit, args.seed, args.workers)
+    score = write_outputs(rows, teams, args.output)
+    print_summary(score, teams, agent1, agent2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from typing import List, Tuple
+
+EPS = 1e-12
+
+
+def pure_bounds(lower: List[List[float]], upper: List[List[float]]) -> Tuple[float, float]:
+    # Bounds on the value of a simultaneous-move node for the row player when
+    # each entry is only known to lie in [lower, upper]: committing to a pure
+    # row guarantees max-min, and the column player can hold it to min-max.
+    maxmin = max(min(row) for row in lower)
+    minmax = min(max(upper[i][j] for i in range(len(upper))) for j in range(len(upper[0])))
+    return maxmin, minmax
+
+
+def solve_matrix_game(matrix: List[List[float]]) -> Tuple[float, List[float]]:
+    # Value and optimal mixed strategy of a zero-sum game for the row
+    # (maximizing) player, for payoffs in [0, 1]. Simplex with Bland's rule on
+    #   max sum(y)  s.t.  (A + 1) y <= 1,  y >= 0
+    # gives v = 1 / sum(y) - 1; the row strategy is read off the slack duals.
+    m = len(matrix)
+    n = len(matrix[0])
+    width = n + m
+
+    tableau = [[matrix[i][j] + 1.0 for j in range(n)] + [1.0 if k == i else 0.0 for k in range(m)] + [1.0]
+               for i in range(m)]
+    objective = [-1.0] * n + [0.0] * m + [0.0]
+    basis = [n + i for i in range(m)]
+
+    while True:
+        col = next((j for j in range(width) if objective[j] < -EPS), None)
+        if col is None:
+            break
+
+        row = None
+        best_ratio = float('inf')
+        for i in range(m):
+            if tableau[i][col] > EPS:
+                ratio = tableau[i][-1] / tableau[i][col]
+                if ratio < best_ratio - EPS or (abs(ratio - best_ratio) <= EPS and basis[i] < basis[row]):
+                    best_ratio = ratio
+                    row = i
+
+        pivot = tableau[row][col]
+        tableau[row] = [x / pivot for x in tableau[row]]
+        for i in range(m):
+            if i != row and abs(tableau[i][col]) > EPS:
+                factor = tableau[i][col]
+                tableau[i] = [x - factor * y for x, y in zip(tableau[i], tableau[row])]
+        factor = objective[col]
+        objective = [x - factor * y for x, y in zip(objective, tableau[row])]
+        basis[row] = col
+
+    total = objective[-1]
+    duals = [max(objective[n + i], 0.0) for i in range(m)]
+    dual_sum = sum(duals)
+    strategy = [d / dual_sum for d in duals] if dual_sum > 0 else [1.0 / m] * m
+    return 1.0 / total - 1.0, strategy
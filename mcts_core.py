@@ -0,0 +1,890 @@
+import math
+import random
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from battle_v2 import (
+    BattleState, ActionType, NUM_ACTIONS, step, legal_actions_for_player, action_index
+)
+from early_stopping import joint_rows, maxmin_decided
+from greedy_policy import greedy_action
+from heuristics import heuristic_value, joint_priors
+from matrix_game import pure_bounds, solve_matrix_game
+from position_book import BookEntry, PositionBook, canonical_key
+from profiling import PhaseTimer
+from sequential_halving import select_reply, sequential_halving
+from tree_memory import TreeBudget
+
+SOLVED_EPS = 1e-9
+
+JointAction = Tuple[ActionType, ActionType]
+
+
+def terminal_value(state: BattleState, player_id: int) -> float:
+    if state.winner == player_id:
+        return 1.0
+    elif state.winner is None:
+        return 0.5
+    return 0.0
+
+
+class SearchNode:
+    # Joint-action node shared by every tree agent. Value statistics are kept
+    # from the core's perspective player; the strategies attach what else they
+    # need (AMAF tables, value-net features, heuristic priors).
+
+    def __init__(self, state: BattleState, parent: Optional['SearchNode'] = None,
+                 my_player: int = 1, joint_action: Optional[JointAction] = None,
+                 stores_state: bool = True):
+        self.parent = parent
+        self.my_player = my_player
+        self.joint_action = joint_action
+        self.depth = parent.depth + 1 if parent is not None else 0
+
+        # Lazy nodes drop their state after the evaluation and rebuild it by
+        # replaying step() from the nearest ancestor that still stores one.
+        self._state: Optional[BattleState] = state
+        self.stores_state = stores_state
+        self.terminal = state.terminal
+        self.legal_p1 = legal_actions_for_player(state, 1) if not state.terminal else []
+        self.legal_p2 = legal_actions_for_player(state, 2) if not state.terminal else []
+
+        self.children: Dict[JointAction, 'SearchNode'] = {}
+
+        self.visits = 0
+        self.wins = 0
+        self.draws = 0
+
+        # Proven bounds on the value for the perspective player (MCTS-Solver)
+        self.lower = 0.0
+        self.upper = 1.0
+        self.strategy: Optional[List[float]] = None
+
+        # Progressive bias: this node's heuristic prior, and the priors of
+        # its joint actions once the core has scored them
+        self.prior = 0.0
+        self.priors: Optional[Dict[JointAction, float]] = None
+
+        self.features = None
+        self.amaf_visits: Optional[List[List[int]]] = None
+        self.amaf_wins: Optional[List[List[float]]] = None
+
+    @property
+    def solved(self) -> bool:
+        return self.upper - self.lower <= SOLVED_EPS
+
+    @property
+    def state(self) -> BattleState:
+        if self._state is not None:
+            return self._state
+
+        actions = []
+        node = self
+        while node._state is None:
+            actions.append(node.joint_action)
+            node = node.parent
+
+        state = node._state
+        for a1, a2 in reversed(actions):
+            state = step(state, a1, a2)
+        return state
+
+    def release_state(self):
+        if not self.stores_state:
+            self._state = None
+
+    def promote(self):
+        if not self.stores_state:
+            self._state = self.state
+            self.stores_state = True
+
+    def is_fully_expanded(self) -> bool:
+        if self.terminal:
+            return True
+        return len(self.children) >= len(self.legal_p1) * len(self.legal_p2)
+
+    def get_untried_action(self, ordered: bool = False) -> Optional[JointAction]:
+        all_joint = [(a1, a2) for a1 in self.legal_p1 for a2 in self.legal_p2]
+        untried = [ja for ja in all_joint if ja not in self.children]
+        if ordered and untried and self.priors is not None:
+            return max(untried, key=lambda ja: self.priors[ja])
+        return random.choice(untried) if untried else None
+
+    def expand(self, joint_action: JointAction, stores_state: bool = True) -> 'SearchNode':
+        new_state = step(self.state, joint_action[0], joint_action[1])
+        child = SearchNode(new_state, parent=self, my_player=self.my_player,
+                           joint_action=joint_action, stores_state=stores_state)
+        self.children[joint_action] = child
+        return child
+
+
+# --- Selection ---------------------------------------------------------------
+
+class SelectionPolicy:
+    # phase: timer name for update(); uses_priors: the core scores joint
+    # actions with heuristics.joint_priors before expanding a node
+    phase: Optional[str] = None
+    uses_priors = False
+    records_actions = False
+    exploration_weight = 1.414
+
+    def init_node(self, node: SearchNode):
+        pass
+
+    def select(self, core: 'MCTSCore', node: SearchNode) -> Optional[SearchNode]:
+        raise NotImplementedError
+
+    def update(self, core: 'MCTSCore', leaf: SearchNode,
+               rollout_actions: Optional[List[Tuple[int, ActionType]]], result: float):
+        pass
+
+
+class UCB1Selection(SelectionPolicy):
+    # UCB1 for the node's searching player, skipping children the solver has
+    # proven, plus an optional progressive bias bias_weight * prior / (visits + 1)
+
+    def __init__(self, exploration_weight: float = 1.414, bias_weight: float = 0.0):
+        self.exploration_weight = exploration_weight
+        self.bias_weight = bias_weight
+        self.uses_priors = bias_weight != 0.0
+
+    def select(self, core: 'MCTSCore', node: SearchNode) -> Optional[SearchNode]:
+        best_score = -float('inf')
+        best_child = None
+        log_n = math.log(node.visits) if node.visits > 0 else 0.0
+
+        for child in node.children.values():
+            if child.solved:
+                continue
+            if child.visits == 0:
+                return child
+
+            ucb = core.child_value(child, node.my_player) + \
+                self.exploration_weight * math.sqrt(log_n / child.visits)
+            if self.bias_weight:
+                ucb += self.bias_weight * child.prior / (child.visits + 1)
+
+            if ucb > best_score:
+                best_score = ucb
+                best_child = child
+
+        return best_child
+
+
+class PUCTSelection(SelectionPolicy):
+    # AlphaZero-style PUCT with the normalized heuristic joint priors as P
+    uses_priors = True
+
+    def __init__(self, c_puct: float = 1.5):
+        self.c_puct = c_puct
+        self.exploration_weight = c_puct
+
+    def select(self, core: 'MCTSCore', node: SearchNode) -> Optional[SearchNode]:
+        total = sum(node.priors.values()) if node.priors else 0.0
+        uniform = 1.0 / len(node.children) if node.children else 0.0
+        sqrt_n = math.sqrt(node.visits)
+
+        best_score = -float('inf')
+        best_child = None
+        for child in node.children.values():
+            if child.solved:
+                continue
+            if child.visits == 0:
+                return child
+            p = child.prior / total if total > 0 else uniform
+            score = core.child_value(child, node.my_player) + self.c_puct * p * sqrt_n / (1 + child.visits)
+            if score > best_score:
+                best_score = score
+                best_child = child
+        return best_child
+
+
+class RAVESelection(SelectionPolicy):
+    # UCB1 blended with all-moves-as-first values of the searching player's
+    # own action, beta = sqrt(k / (3n + k))
+    phase = "amaf"
+    records_actions = True
+
+    def __init__(self, rave_k: float = 500, exploration_weight: float = 1.414):
+        self.rave_k = rave_k
+        self.exploration_weight = exploration_weight
+
+    def init_node(self, node: SearchNode):
+        # AMAF visits/wins indexed [player - 1][action_index(action)]
+        node.amaf_visits = [[0] * NUM_ACTIONS, [0] * NUM_ACTIONS]
+        node.amaf_wins = [[0] * NUM_ACTIONS, [0] * NUM_ACTIONS]
+
+    def beta(self, node_visits: int) -> float:
+        return math.sqrt(self.rave_k / (3 * node_visits + self.rave_k))
+
+    def select(self, core: 'MCTSCore', node: SearchNode) -> Optional[SearchNode]:
+        best_score = -float('inf')
+        best_child = None
+        amaf_visits = node.amaf_visits[node.my_player - 1]
+        amaf_wins = node.amaf_wins[node.my_player - 1]
+
+        for joint_action, child in node.children.items():
+            if child.visits == 0:
+                return child
+
+            uct_value = core.child_value(child, node.my_player)
+            exploration = self.exploration_weight * math.sqrt(math.log(node.visits) / child.visits)
+
+            a1, a2 = joint_action
+            idx = action_index(a1 if node.my_player == 1 else a2)
+            amaf_n = amaf_visits[idx]
+
+            if amaf_n > 0:
+                # AMAF wins are recorded from the perspective player's point of view
+                if node.my_player == core.perspective:
+                    amaf_value = amaf_wins[idx] / amaf_n
+                else:
+                    amaf_value = (amaf_n - amaf_wins[idx]) / amaf_n
+                beta = self.beta(child.visits)
+                score = (1 - beta) * uct_value + beta * amaf_value + exploration
+            else:
+                score = uct_value + exploration
+
+            if score > best_score:
+                best_score = score
+                best_child = child
+
+        return best_child
+
+    def update(self, core: 'MCTSCore', leaf: SearchNode,
+               rollout_actions: Optional[List[Tuple[int, ActionType]]], result: float):
+        path = []
+        node = leaf
+        while node.parent is not None:
+            path.append(node.parent)
+            node = node.parent
+        path.reverse()
+
+        actions_played: List[Tuple[int, ActionType]] = []
+        node = leaf
+        tree_actions = []
+        while node.parent is not None:
+            tree_actions.append(node.joint_action)
+            node = node.parent
+        for a1, a2 in reversed(tree_actions):
+            actions_played.append((1, a1))
+            actions_played.append((2, a2))
+        actions_played.extend(rollout_actions or [])
+
+        # An action counts for the node at depth i iff it occurs at or after
+        # index 2*(i+1), i.e. iff its last occurrence does. One pass finds the
+        # last occurrences, so the update is O(path + rollout).
+        last_seen = [[-1] * NUM_ACTIONS, [-1] * NUM_ACTIONS]
+        for idx, (player_id, action) in enumerate(actions_played):
+            last_seen[player_id - 1][action_index(action)] = idx
+
+        for i, path_node in enumerate(path):
+            first_index = 2 * (i + 1)
+            for p in range(2):
+                seen = last_seen[p]
+                visits = path_node.amaf_visits[p]
+                wins = path_node.amaf_wins[p]
+                for a in range(NUM_ACTIONS):
+                    if seen[a] >= first_index:
+                        visits[a] += 1
+                        wins[a] += result
+
+
+# --- Leaf evaluation ---------------------------------------------------------
+
+class LeafEvaluation:
+    # evaluate() returns the leaf's value for core.perspective and whether it
+    # is the result of a finished game (only then is 0.5 a draw rather than an
+    # estimate) and, when given a list, appends the (player, action) pairs it
+    # played
+    phase: Optional[str] = "rollout"
+
+    def init_root(self, core: 'MCTSCore', root: SearchNode):
+        pass
+
+    def evaluate(self, core: 'MCTSCore', node: SearchNode,
+                 actions: Optional[List[Tuple[int, ActionType]]] = None) -> Tuple[float, bool]:
+        raise NotImplementedError
+
+
+class RandomRollout(LeafEvaluation):
+    # Uniform random playout, optionally cut off after depth turns and scored
+    # with evaluator.predict(state, player_id) (default: heuristic_value);
+    # full_rollout_prob of the truncated rollouts still play to the end
+
+    def __init__(self, depth: Optional[int] = None, evaluator=None, full_rollout_prob: float = 0.0):
+        self.depth = depth
+        self.evaluator = evaluator
+        self.full_rollout_prob = full_rollout_prob
+
+    def policy(self, state: BattleState) -> JointAction:
+        legal_p1 = legal_actions_for_player(state, 1)
+        legal_p2 = legal_actions_for_player(state, 2)
+        return random.choice(legal_p1), random.choice(legal_p2)
+
+    def evaluate(self, core: 'MCTSCore', node: SearchNode,
+                 actions: Optional[List[Tuple[int, ActionType]]] = None) -> Tuple[float, bool]:
+        current = node.state.clone()
+        depth = self.depth
+        if depth is not None and self.full_rollout_prob > 0 and random.random() < self.full_rollout_prob:
+            depth = None
+
+        turns = 0
+        while not current.terminal:
+            if depth is not None and turns >= depth:
+                break
+            a1, a2 = self.policy(current)
+            if actions is not None:
+                actions.append((1, a1))
+                actions.append((2, a2))
+            current = step(current, a1, a2)
+            turns += 1
+        core.rollout_lengths[turns] += 1
+
+        if not current.terminal:
+            core.truncated_rollouts += 1
+            if self.evaluator is not None:
+                return self.evaluator.predict(current, core.perspective), False
+            return heuristic_value(current, core.perspective), False
+        return terminal_value(current, core.perspective), True
+
+
+class GreedyRollout(RandomRollout):
+    def policy(self, state: BattleState) -> JointAction:
+        return greedy_action(state, 1), greedy_action(state, 2)
+
+
+class ValueNetEvaluation(LeafEvaluation):
+    # Scores the leaf with the value network instead of a rollout; features
+    # are updated incrementally from the parent's when the network supports it
+    phase = None
+
+    def __init__(self, value_network, incremental_features: bool = True):
+        self.value_network = value_network
+        # Evaluators that only expose predict() (e.g. ValueTableEvaluator) use the plain path
+        self.incremental_features = incremental_features and hasattr(value_network, 'update_features')
+
+    def init_root(self, core: 'MCTSCore', root: SearchNode):
+        if self.incremental_features and not root.terminal and root.features is None:
+            root.features = self.value_network.extract_features(root.state, core.perspective)
+
+    def evaluate(self, core: 'MCTSCore', node: SearchNode,
+                 actions: Optional[List[Tuple[int, ActionType]]] = None) -> Tuple[float, bool]:
+        state = node.state
+        if state.terminal:
+            return terminal_value(state, core.perspective), True
+
+        timer = core.timer
+        if not self.incremental_features:
+            t0 = time.perf_counter()
+            value = self.value_network.predict(state, core.perspective)
+            timer.add("predict", time.perf_counter() - t0)
+            return value, False
+
+        t0 = time.perf_counter()
+        if node.features is None:
+            parent = node.parent
+            if parent is not None and parent.features is not None:
+                node.features = self.value_network.update_features(
+                    parent.features, parent.state, state, core.perspective)
+            else:
+                node.features = self.value_network.extract_features(state, core.perspective)
+        t1 = time.perf_counter()
+
+        value = self.value_network.forward(node.features)
+        timer.add("features", t1 - t0)
+        timer.add("forward", time.perf_counter() - t1)
+        return value, False
+
+
+# --- Final move selection ----------------------------------------------------
+
+class FinalSelection:
+    def choose(self, core: 'MCTSCore', root: SearchNode, player_id: int,
+               legal_actions: List[ActionType], legal_opp: List[ActionType]) -> ActionType:
+        raise NotImplementedError
+
+
+def _own_action_visits(root: SearchNode, player_id: int, legal_actions: List[ActionType],
+                       legal_opp: List[ActionType]) -> Dict[ActionType, int]:
+    action_visits = {}
+    for my_action in legal_actions:
+        visits = 0
+        for opp_action in legal_opp:
+            joint = (my_action, opp_action) if player_id == 1 else (opp_action, my_action)
+            if joint in root.children:
+                visits += root.children[joint].visits
+        action_visits[my_action] = visits
+    return action_visits
+
+
+class MaxMinFinal(FinalSelection):
+    # Own action with the best worst case over the opponent's replies; a root
+    # the solver has proven plays its proven strategy instead
+
+    def choose(self, core: 'MCTSCore', root: SearchNode, player_id: int,
+               legal_actions: List[ActionType], legal_opp: List[ActionType]) -> ActionType:
+        if root.solved and player_id == core.perspective:
+            return core.solved_action(root)
+
+        best_action = None
+        best_worst_case = -float('inf')
+
+        for my_action in legal_actions:
+            worst_case_value = float('inf')
+            total_visits = 0
+
+            for opp_action in legal_opp:
+                joint = (my_action, opp_action) if player_id == 1 else (opp_action, my_action)
+                child = root.children.get(joint)
+                if child is not None and child.visits > 0:
+                    if child.solved:
+                        win_rate = child.lower if player_id == core.perspective else 1 - child.lower
+                    else:
+                        win_rate = core.child_value(child, player_id)
+                    worst_case_value = min(worst_case_value, win_rate)
+                    total_visits += child.visits
+
+            if total_visits > 0 and worst_case_value < float('inf'):
+                if worst_case_value > best_worst_case:
+                    best_worst_case = worst_case_value
+                    best_action = my_action
+
+        if best_action is None:
+            action_visits = _own_action_visits(root, player_id, legal_actions, legal_opp)
+            best_action = max(legal_actions, key=lambda a: action_visits.get(a, 0))
+
+        return best_action
+
+
+class MostVisitedFinal(FinalSelection):
+    # Robust child: own action whose joint children were visited most in total
+
+    def choose(self, core: 'MCTSCore', root: SearchNode, player_id: int,
+               legal_actions: List[ActionType], legal_opp: List[ActionType]) -> ActionType:
+        action_visits = _own_action_visits(root, player_id, legal_actions, legal_opp)
+        return max(legal_actions, key=lambda a: action_visits[a])
+
+
+# --- Search core -------------------------------------------------------------
+
+class MCTSCore:
+    # One joint-action MCTS loop (selection, expansion, leaf evaluation,
+    # backprop, optional solver) shared by MCTSAgent, MCTSRAVEAgent and
+    # MCTSAgentValueNet; they differ only in the strategies they plug in.
+    # Statistics are kept from perspective's point of view and a finished
+    # game that ended in a draw adds draw_credit to the wins; an estimate of
+    # exactly 0.5 (cut-off rollout, value network) is backed up as is.
+
+    def __init__(self, selection: SelectionPolicy, evaluation: LeafEvaluation,
+                 final: Optional[FinalSelection] = None,
+                 simulations_per_move: int = 1000, player_id: int = 1,
+                 perspective: Optional[int] = None, draw_credit: float = 0.5,
+                 max_nodes: Optional[int] = None, max_bytes: Optional[int] = None,
+                 state_interval: int = 1, promote_visits: int = 8, solver: bool = False,
+                 early_stop: bool = True, stop_delta: Optional[float] = None, stop_check: int = 10,
+                 root_strategy: str = "uct", gumbel_scale: float = 1.0, order_untried: bool = False,
+                 book=None, book_mode: str = "play", book_min_visits: int = 1000,
+                 book_seed_visits: Optional[int] = None, ponder: bool = False,
+                 ponder_limit: Optional[int] = None):
+        if root_strategy not in ("uct", "halving"):
+            raise ValueError(f"root_strategy must be 'uct' or 'halving', got '{root_strategy}'")
+        self.selection = selection
+        self.evaluation = evaluation
+        self.final = final or MaxMinFinal()
+        self.simulations_per_move = simulations_per_move
+        self.last_root = None
+        self.player_id = player_id
+        self.perspective = perspective if perspective is not None else player_id
+        self.draw_credit = draw_credit
+        # Store the state on every state_interval-th level (1 = every node) and
+        # on any node that gets expanded again after promote_visits visits
+        self.state_interval = state_interval
+        self.promote_visits = promote_visits
+        self.solver = solver
+        # Early stopping: skip the search for a single legal action, and stop
+        # once the chosen action can no longer change within the remaining
+        # budget (or, with stop_delta, is ahead at confidence 1 - stop_delta)
+        self.early_stop = early_stop
+        self.stop_delta = stop_delta
+        self.stop_check = stop_check
+        # "halving" splits the budget over our own root actions by Gumbel
+        # sequential halving instead of running UCT over all joint actions
+        self.root_strategy = root_strategy
+        self.gumbel_scale = gumbel_scale
+        self.order_untried = order_untried
+        self.use_priors = selection.uses_priors or order_untried
+        # Opening book (a PositionBook or its path): "play" returns the book's
+        # max-min action for positions with at least book_min_visits, "seed"
+        # starts the search from the book's root statistics scaled down to
+        # book_seed_visits (default: the simulation budget)
+        if book_mode not in ("play", "seed"):
+            raise ValueError(f"book_mode must be 'play' or 'seed', got '{book_mode}'")
+        self.book = PositionBook(book) if isinstance(book, str) else book
+        self.book_mode = book_mode
+        self.book_min_visits = book_min_visits
+        self.book_seed_visits = book_seed_visits
+        # Pondering: after committing to an action, keep searching its subtree
+        # in a background thread (at most ponder_limit simulations, default
+        # 20x the budget) until the next choose_action, which re-roots onto
+        # the child matching the new position and only tops its visits up to
+        # simulations_per_move
+        self.ponder = ponder
+        self.ponder_limit = ponder_limit or 20 * simulations_per_move
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        self.ponder_simulations = 0
+        self.ponder_seconds = 0.0
+        self.inherited_visits = 0
+        self.total_inherited_visits = 0
+        self._pondered: Optional[Tuple[SearchNode, int]] = None
+        self._ponder_thread: Optional[threading.Thread] = None
+        self._ponder_stop = threading.Event()
+        self.rollout_lengths: Counter = Counter()
+        self.truncated_rollouts = 0
+        self.timer = PhaseTimer(type(self).__name__)
+        self.move_stats = self.timer.moves
+        self.budget = TreeBudget(max_nodes, max_bytes)
+
+    def choose_action(self, state: BattleState, player_id: int) -> ActionType:
+        self.stop_ponder()
+        self.timer.start_move()
+        action = self._search(state, player_id)
+        extra = {}
+        if self.solver:
+            root = self.last_root
+            extra = {"solved": root.solved, "value_bounds": (root.lower, root.upper)}
+        if self.book is not None:
+            extra.update(self.book.stats())
+        if self.ponder:
+            extra["inherited_visits"] = self.inherited_visits
+        self.timer.end_move(simulations=self.simulations_per_move, simulations_run=self.simulations_run,
+                            saved_simulations=self.simulations_per_move - self.simulations_run,
+                            stop_reason=self.stop_reason, **extra, **self.budget.stats())
+        if self.ponder:
+            self._start_ponder(self.last_root, player_id, action)
+        return action
+
+    def stop_ponder(self):
+        # Game loops call this once the game is over; choose_action does it itself
+        if self._ponder_thread is not None:
+            self._ponder_stop.set()
+            self._ponder_thread.join()
+            self._ponder_thread = None
+
+    def ponder_stats(self) -> Dict[str, float]:
+        attempts = self.ponder_hits + self.ponder_misses
+        return {
+            "ponder_moves": attempts,
+            "ponder_hits": self.ponder_hits,
+            "ponder_hit_rate": self.ponder_hits / attempts if attempts else 0.0,
+            "inherited_visits": self.total_inherited_visits,
+            "inherited_per_hit": self.total_inherited_visits / self.ponder_hits if self.ponder_hits else 0.0,
+            "ponder_simulations": self.ponder_simulations,
+            "ponder_seconds": self.ponder_seconds,
+        }
+
+    def _start_ponder(self, root: SearchNode, player_id: int, action: ActionType):
+        self._pondered = (root, player_id)
+        if root.terminal:
+            return
+        # Fresh phase dicts, so pondering is not charged to the move just recorded
+        self.timer.start_move()
+        self._ponder_stop = threading.Event()
+        self._ponder_thread = threading.Thread(target=self._ponder, args=(root, player_id, action, self._ponder_stop),
+                                               daemon=True)
+        self._ponder_thread.start()
+
+    def _ponder(self, root: SearchNode, player_id: int, action: ActionType, stop: threading.Event):
+        # Only the children with our committed action can become the next
+        # root; the opponent-side UCB of sequential halving spreads the
+        # simulations over its replies, favouring the ones it is likely to play
+        legal_opp = root.legal_p2 if player_id == 1 else root.legal_p1
+        start = time.perf_counter()
+        simulations = 0
+        while not stop.is_set() and simulations < self.ponder_limit:
+            row = joint_rows(root.children, [action], legal_opp, player_id,
+                             lambda child: self._child_stats(child, player_id))[0]
+            if all(isinstance(entry, float) for entry in row):
+                break
+            reply = select_reply(row, legal_opp, self.selection.exploration_weight)
+            self._simulate(root, (action, reply) if player_id == 1 else (reply, action))
+            simulations += 1
+        self.ponder_simulations += simulations
+        self.ponder_seconds += time.perf_counter() - start
+
+    def _ponder_root(self, state: BattleState, player_id: int) -> Optional[SearchNode]:
+        previous, self._pondered = self._pondered, None
+        if previous is None:
+            return None
+        root, pondered_player = previous
+        prev_state = root.state
+        if (pondered_player != player_id or state.rng_seed != prev_state.rng_seed
+                or state.turn_number != prev_state.turn_number + 1):
+            # A new game, not a wrong guess
+            return None
+
+        key = canonical_key(state)
+        for child in root.children.values():
+            if canonical_key(child.state) == key:
+                child.promote()
+                child.parent = None
+                self.ponder_hits += 1
+                return child
+        self.ponder_misses += 1
+        return None
+
+    def _search(self, state: BattleState, player_id: int) -> ActionType:
+        root = self._ponder_root(state, player_id) if self.ponder else None
+        if root is None:
+            root = SearchNode(state, my_player=player_id)
+            self.selection.init_node(root)
+        self.evaluation.init_root(self, root)
+        self.budget.reset(root)
+        self.inherited_visits = root.visits
+        self.total_inherited_visits += root.visits
+        budget = max(0, self.simulations_per_move - root.visits)
+
+        legal_actions = legal_actions_for_player(state, player_id)
+        opp_player = 2 if player_id == 1 else 1
+        legal_opp = legal_actions_for_player(state, opp_player)
+
+        self.last_root = root
+        self.simulations_run = 0
+        self.stop_reason = None
+        if self.early_stop and len(legal_actions) == 1:
+            self.stop_reason = "single_action"
+            return legal_actions[0]
+
+        entry = self.book.lookup(state, player_id) if self.book is not None else None
+        if entry is not None:
+            if self.book_mode == "seed":
+                if not self.inherited_visits:
+                    self._seed_root(root, entry)
+            elif entry.visits >= self.book_min_visits:
+                action = entry.best_action(legal_actions, legal_opp, self.draw_credit)
+                if action is not None:
+                    self.stop_reason = "book"
+                    return action
+
+        if self.root_strategy == "halving":
+            action, self.simulations_run = sequential_halving(
+                root, legal_actions, legal_opp, player_id, budget,
+                lambda joint: self._simulate(root, joint),
+                lambda child: self._child_stats(child, player_id),
+                exploration_weight=self.selection.exploration_weight,
+                gumbel_scale=self.gumbel_scale, stop=lambda: root.solved)
+            if root.solved:
+                self.stop_reason = "solved"
+                if player_id == self.perspective:
+                    return self.solved_action(root)
+            return action
+
+        for i in range(budget):
+            if root.solved:
+                self.stop_reason = "solved"
+                break
+            if self.early_stop and i > 0 and i % self.stop_check == 0:
+                self.stop_reason = self._root_decided(root, player_id, legal_actions, legal_opp,
+                                                      budget - i)
+                if self.stop_reason:
+                    break
+            self._simulate(root)
+            self.simulations_run += 1
+
+        return self.final.choose(self, root, player_id, legal_actions, legal_opp)
+
+    def _seed_root(self, root: SearchNode, entry: BookEntry):
+        # Book wins are from entry.player_id's side and draws are separate, so
+        # they get this search's draw_credit like live simulations do
+        scale = min(1.0, (self.book_seed_visits or self.simulations_per_move) / max(entry.visits, 1))
+        if self.use_priors and root.priors is None:
+            root.priors = joint_priors(root.state)
+        for joint, (visits, wins, draws) in entry.children.items():
+            visits_seeded = int(round(visits * scale))
+            if visits_seeded == 0 or joint[0] not in root.legal_p1 or joint[1] not in root.legal_p2:
+                continue
+            if entry.player_id != self.perspective:
+                wins = visits - wins - draws
+            draw_rate = draws / visits
+            value = (wins + self.draw_credit * draws) / visits
+            child = root.expand(joint)
+            self.selection.init_node(child)
+            if root.priors is not None:
+                child.prior = root.priors[joint]
+            self.budget.add_node(root, leaf=child)
+            child.visits = visits_seeded
+            child.wins = value * visits_seeded
+            child.draws = int(round(draw_rate * visits_seeded))
+            root.visits += visits_seeded
+            root.wins += value * visits_seeded
+            root.draws += child.draws
+
+    def child_value(self, child: SearchNode, player_id: int) -> float:
+        if player_id == self.perspective:
+            return child.wins / child.visits
+        return (child.visits - child.wins) / child.visits
+
+    def _child_stats(self, child: SearchNode, player_id: int):
+        if child.solved:
+            return child.lower if player_id == self.perspective else 1 - child.lower
+        if child.visits == 0:
+            return None
+        score = child.wins if player_id == self.perspective else child.visits - child.wins
+        return (score, child.visits)
+
+    def _root_decided(self, root: SearchNode, player_id: int, legal_actions: List[ActionType],
+                      legal_opp: List[ActionType], remaining: int) -> Optional[str]:
+        rows = joint_rows(root.children, legal_actions, legal_opp, player_id,
+                          lambda child: self._child_stats(child, player_id))
+        if maxmin_decided(rows, remaining):
+            return "budget"
+        if self.stop_delta is not None and maxmin_decided(rows, remaining, self.stop_delta):
+            return "confidence"
+        return None
+
+    def _simulate(self, node: SearchNode, first_action: Optional[JointAction] = None) -> float:
+        timer = self.timer
+        t0 = time.perf_counter()
+        current = node
+        if first_action in node.children:
+            # Root strategies pick the root joint action themselves
+            current = node.children[first_action]
+            first_action = None
+        while first_action is None and not current.terminal and current.is_fully_expanded():
+            child = self.selection.select(self, current)
+            if child is None:
+                break
+            current = child
+        t1 = time.perf_counter()
+
+        if not current.terminal:
+            if self.use_priors and current.priors is None:
+                current.priors = joint_priors(current.state)
+            untried = first_action or current.get_untried_action(self.order_untried)
+            if untried:
+                if not current.stores_state and current.visits >= self.promote_visits:
+                    current.promote()
+                    self.budget.add_state()
+                stores_state = (current.depth + 1) % self.state_interval == 0
+                current = current.expand(untried, stores_state)
+                self.selection.init_node(current)
+                if current.parent.priors is not None:
+                    current.prior = current.parent.priors[untried]
+                self.budget.add_node(node, stores_state, current)
+        t2 = time.perf_counter()
+
+        leaf = current
+        actions = [] if self.selection.records_actions else None
+        result, finished = self.evaluation.evaluate(self, current, actions)
+        draw = finished and result == 0.5
+        if draw:
+            result = self.draw_credit
+        current.release_state()
+        t3 = time.perf_counter()
+
+        while current is not None:
+            current.visits += 1
+            current.draws += draw
+            current.wins += result
+            current = current.parent
+        t4 = time.perf_counter()
+
+        self.selection.update(self, leaf, actions, result)
+        t5 = time.perf_counter()
+
+        if self.solver and leaf.terminal and not leaf.solved:
+            # Proven values use the same draw credit as the statistics
+            leaf.lower = leaf.upper = result
+            self._propagate_bounds(leaf.parent)
+        t6 = time.perf_counter()
+
+        timer.add("selection", t1 - t0)
+        timer.add("expansion", t2 - t1)
+        if self.evaluation.phase:
+            timer.add(self.evaluation.phase, t3 - t2)
+        timer.add("backprop", t4 - t3)
+        if self.selection.phase:
+            timer.add(self.selection.phase, t5 - t4)
+        if self.solver:
+            timer.add("solver", t6 - t5)
+        return result
+
+    def _value_matrices(self, node: SearchNode):
+        if self.perspective == 1:
+            rows, cols = node.legal_p1, node.legal_p2
+        else:
+            rows, cols = node.legal_p2, node.legal_p1
+
+        lower = []
+        upper = []
+        exact = True
+        for r in rows:
+            lower_row = []
+            upper_row = []
+            for c in cols:
+                child = node.children.get((r, c) if self.perspective == 1 else (c, r))
+                if child is None:
+                    lower_row.append(0.0)
+                    upper_row.append(1.0)
+                    exact = False
+                else:
+                    lower_row.append(child.lower)
+                    upper_row.append(child.upper)
+                    exact = exact and child.solved
+            lower.append(lower_row)
+            upper.append(upper_row)
+        return rows, lower, upper, exact
+
+    def _propagate_bounds(self, node: Optional[SearchNode]):
+        # Simultaneous-move proof propagation: a node's value lies between the
+        # pure max-min and min-max of its children's bounds, and once every
+        # child is exact it is the value of that matrix game.
+        while node is not None:
+            _, lower, upper, exact = self._value_matrices(node)
+            if exact:
+                value, strategy = solve_matrix_game(lower)
+                new_lower = new_upper = value
+            else:
+                new_lower, new_upper = pure_bounds(lower, upper)
+                strategy = None
+
+            new_lower = max(new_lower, node.lower)
+            new_upper = max(min(new_upper, node.upper), new_lower)
+            if new_lower == node.lower and new_upper == node.upper:
+                break
+
+            node.lower, node.upper = new_lower, new_upper
+            if strategy is not None:
+                node.strategy = strategy
+            node = node.parent
+
+    def solved_action(self, root: SearchNode) -> ActionType:
+        rows, lower, _, _ = self._value_matrices(root)
+        if root.strategy is not None and max(root.strategy) < 1.0:
+            return random.choices(rows, weights=root.strategy)[0]
+        # Pure proof: any row that guarantees the proven value
+        return max(zip(rows, lower), key=lambda rl: min(rl[1]))[0]
+
+
+SELECTIONS = {"ucb1": UCB1Selection, "puct": PUCTSelection, "rave": RAVESelection}
+EVALUATIONS = {"random": RandomRollout, "greedy": GreedyRollout}
+FINALS = {"maxmin": MaxMinFinal, "visits": MostVisitedFinal}
+
+
+def build_core_agent(simulations_per_move: int = 1000, player_id: int = 1, selection: str = "ucb1",
+                     evaluation: str = "random", final: str = "maxmin",
+                     network_path: str = "value_network_v1.pkl", **options) -> MCTSCore:
+    # Mix-and-match agent by strategy name, e.g. PUCT selection with greedy
+    # rollouts; evaluation="valuenet" loads network_path
+    if evaluation == "valuenet":
+        from value_network import create_default_network
+        network = create_default_network()
+        network.load(network_path, verbose=False)
+        leaf = ValueNetEvaluation(network)
+    else:
+        leaf = EVALUATIONS[evaluation]()
+    return MCTSCore(SELECTIONS[selection](), leaf, FINALS[final](),
+                    simulations_per_move=simulations_per_move, player_id=player_id, **options)
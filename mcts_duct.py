@@ -0,0 +1,172 @@
+import math
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from battle_v2 import (
+    BattleState, ActionType, NUM_ACTIONS, step, legal_actions_for_player, action_index
+)
+from early_stopping import visits_decided
+from profiling import PhaseTimer
+from tree_memory import TreeBudget
+
+
+class DUCTNode:
+    # Decoupled UCT node: each player keeps its own per-action statistics and
+    # picks its action independently; children are still keyed by the joint
+    # action because the successor state depends on both choices.
+
+    def __init__(self, state: BattleState, parent: Optional['DUCTNode'] = None):
+        self.state = state
+        self.parent = parent
+        self.terminal = state.terminal
+        self.legal = (legal_actions_for_player(state, 1) if not state.terminal else [],
+                      legal_actions_for_player(state, 2) if not state.terminal else [])
+
+        self.children: Dict[Tuple[ActionType, ActionType], 'DUCTNode'] = {}
+
+        self.visits = 0
+        # Per-player stats indexed [player - 1][action_index(action)]; wins are
+        # from that player's own point of view
+        self.action_visits: List[List[int]] = [[0] * NUM_ACTIONS, [0] * NUM_ACTIONS]
+        self.action_wins: List[List[float]] = [[0.0] * NUM_ACTIONS, [0.0] * NUM_ACTIONS]
+
+    def select_action(self, player: int, exploration_weight: float) -> ActionType:
+        visits = self.action_visits[player - 1]
+        wins = self.action_wins[player - 1]
+        log_n = math.log(self.visits) if self.visits > 0 else 0.0
+
+        best_score = -float('inf')
+        best_action = None
+        for action in self.legal[player - 1]:
+            idx = action_index(action)
+            n = visits[idx]
+            if n == 0:
+                return action
+            score = wins[idx] / n + exploration_weight * math.sqrt(log_n / n)
+            if score > best_score:
+                best_score = score
+                best_action = action
+        return best_action
+
+    def child_for(self, joint_action: Tuple[ActionType, ActionType]) -> Tuple['DUCTNode', bool]:
+        child = self.children.get(joint_action)
+        if child is not None:
+            return child, False
+        child = DUCTNode(step(self.state, joint_action[0], joint_action[1]), parent=self)
+        self.children[joint_action] = child
+        return child, True
+
+    def update(self, joint_action: Tuple[ActionType, ActionType], result: float):
+        # result is from player 1's point of view
+        self.visits += 1
+        i1 = action_index(joint_action[0])
+        i2 = action_index(joint_action[1])
+        self.action_visits[0][i1] += 1
+        self.action_wins[0][i1] += result
+        self.action_visits[1][i2] += 1
+        self.action_wins[1][i2] += 1 - result
+
+
+class MCTSDUCTAgent:
+    def __init__(self, simulations_per_move: int = 1000, player_id: int = 1,
+                 exploration_weight: float = 1.414, final_selection: str = "visits",
+                 max_nodes: Optional[int] = None, max_bytes: Optional[int] = None,
+                 early_stop: bool = True, stop_check: int = 10):
+        if final_selection not in ("visits", "mixed"):
+            raise ValueError(f"final_selection must be 'visits' or 'mixed', got '{final_selection}'")
+        self.simulations_per_move = simulations_per_move
+        self.last_root = None
+        self.player_id = player_id
+        self.exploration_weight = exploration_weight
+        # "visits" plays the most-visited action; "mixed" samples actions in
+        # proportion to their visits, which approximates the mixed equilibrium
+        self.final_selection = final_selection
+        # Stop once the most-visited action cannot be overtaken (visits selection only)
+        self.early_stop = early_stop
+        self.stop_check = stop_check
+        self.timer = PhaseTimer(type(self).__name__)
+        self.move_stats = self.timer.moves
+        self.budget = TreeBudget(max_nodes, max_bytes)
+
+    def choose_action(self, state: BattleState, player_id: int) -> ActionType:
+        self.timer.start_move()
+        action = self._search(state, player_id)
+        self.timer.end_move(simulations=self.simulations_per_move, simulations_run=self.simulations_run,
+                            saved_simulations=self.simulations_per_move - self.simulations_run,
+                            stop_reason=self.stop_reason, **self.budget.stats())
+        return action
+
+    def _search(self, state: BattleState, player_id: int) -> ActionType:
+        root = DUCTNode(state)
+        self.budget.reset(root)
+
+        legal_actions = legal_actions_for_player(state, player_id)
+        visits = root.action_visits[player_id - 1]
+
+        self.last_root = root
+        self.simulations_run = 0
+        self.stop_reason = None
+        if self.early_stop and len(legal_actions) == 1:
+            self.stop_reason = "single_action"
+            return legal_actions[0]
+
+        stop_on_lead = self.early_stop and self.final_selection == "visits"
+        for i in range(self.simulations_per_move):
+            if stop_on_lead and i > 0 and i % self.stop_check == 0:
+                remaining = self.simulations_per_move - i
+                if visits_decided([visits[action_index(a)] for a in legal_actions], remaining):
+                    self.stop_reason = "budget"
+                    break
+            self._simulate(root)
+            self.simulations_run += 1
+        counts = [visits[action_index(a)] for a in legal_actions]
+
+        if self.final_selection == "mixed" and sum(counts) > 0:
+            return random.choices(legal_actions, weights=counts)[0]
+        return max(zip(legal_actions, counts), key=lambda ac: ac[1])[0]
+
+    def _simulate(self, node: DUCTNode) -> float:
+        timer = self.timer
+        t0 = time.perf_counter()
+        path: List[Tuple[DUCTNode, Tuple[ActionType, ActionType]]] = []
+        current = node
+        expanded = False
+        while not current.terminal and not expanded:
+            joint_action = (current.select_action(1, self.exploration_weight),
+                            current.select_action(2, self.exploration_weight))
+            path.append((current, joint_action))
+            current, expanded = current.child_for(joint_action)
+            if expanded:
+                self.budget.add_node(node, leaf=current)
+        t1 = time.perf_counter()
+
+        result = self._rollout(current.state)
+        t2 = time.perf_counter()
+
+        current.visits += 1
+        for path_node, joint_action in path:
+            path_node.update(joint_action, result)
+        t3 = time.perf_counter()
+
+        timer.add("selection", t1 - t0)
+        timer.add("rollout", t2 - t1)
+        timer.add("backprop", t3 - t2)
+        return result
+
+    def _rollout(self, state: BattleState) -> float:
+        current = state.clone()
+
+        while not current.terminal:
+            legal_p1 = legal_actions_for_player(current, 1)
+            legal_p2 = legal_actions_for_player(current, 2)
+            a1 = random.choice(legal_p1)
+            a2 = random.choice(legal_p2)
+            current = step(current, a1, a2)
+
+        if current.winner == 1:
+            return 1.0
+        elif current.winner == 2:
+            return 0.0
+        else:
+            return 0.5
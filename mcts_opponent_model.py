@@ -0,0 +1,250 @@
+import math
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from battle_v2 import (
+    BattleState, ActionType, NUM_ACTIONS, step, legal_actions_for_player, action_index
+)
+from early_stopping import visits_decided
+from greedy_policy import greedy_action
+from profiling import PhaseTimer
+from tree_memory import TreeBudget
+
+
+class GreedyOpponentModel:
+    # The opponent plays greedy_action, or a random legal action with
+    # probability epsilon
+
+    def __init__(self, epsilon: float = 0.1):
+        self.epsilon = epsilon
+
+    def sample(self, state: BattleState, player_id: int) -> ActionType:
+        if random.random() < self.epsilon:
+            return random.choice(legal_actions_for_player(state, player_id))
+        return greedy_action(state, player_id)
+
+    def observe(self, state: BattleState, player_id: int, action: ActionType, weight: float = 1.0):
+        pass
+
+    def reset(self):
+        pass
+
+
+class FrequencyOpponentModel:
+    # Counts of the opponent's observed actions in the current match, keyed by
+    # the two active species. Unseen contexts fall back to a prior of alpha per
+    # legal action plus greedy_prior on the greedy action.
+
+    def __init__(self, alpha: float = 1.0, greedy_prior: float = 2.0):
+        self.alpha = alpha
+        self.greedy_prior = greedy_prior
+        self.counts: Dict[Tuple, List[float]] = defaultdict(lambda: [0.0] * NUM_ACTIONS)
+
+    @staticmethod
+    def _context(state: BattleState, player_id: int) -> Tuple:
+        me = state.player1 if player_id == 1 else state.player2
+        opp = state.player2 if player_id == 1 else state.player1
+        active = me.team[me.active_index]
+        return (active.spec.name, opp.team[opp.active_index].spec.name, active.fainted)
+
+    def weights(self, state: BattleState, player_id: int, legal: List[ActionType]) -> List[float]:
+        counts = self.counts.get(self._context(state, player_id))
+        greedy = greedy_action(state, player_id) if self.greedy_prior else None
+        weights = []
+        for action in legal:
+            weight = self.alpha + (counts[action_index(action)] if counts else 0.0)
+            if action == greedy:
+                weight += self.greedy_prior
+            weights.append(weight)
+        return weights
+
+    def sample(self, state: BattleState, player_id: int) -> ActionType:
+        legal = legal_actions_for_player(state, player_id)
+        return random.choices(legal, weights=self.weights(state, player_id, legal))[0]
+
+    def observe(self, state: BattleState, player_id: int, action: ActionType, weight: float = 1.0):
+        self.counts[self._context(state, player_id)][action_index(action)] += weight
+
+    def reset(self):
+        self.counts.clear()
+
+
+OPPONENT_MODELS = {
+    "greedy": GreedyOpponentModel,
+    "frequency": FrequencyOpponentModel,
+}
+
+
+def _outcome_key(state: BattleState) -> Tuple:
+    return (state.turn_number, state.terminal, state.winner,
+            tuple((p.active_index, tuple((m.current_hp, m.fainted) for m in p.team))
+                  for p in (state.player1, state.player2)))
+
+
+class OpponentModelNode:
+    # Open-loop node: children are keyed by our own action only and no state is
+    # stored, because the opponent's sampled reply makes the successor random
+    stores_state = False
+
+    def __init__(self, parent: Optional['OpponentModelNode'] = None):
+        self.parent = parent
+        self.children: Dict[ActionType, 'OpponentModelNode'] = {}
+        self.visits = 0
+        self.wins = 0.0
+
+    def best_child(self, legal: List[ActionType], exploration_weight: float) -> Tuple[ActionType, 'OpponentModelNode']:
+        log_n = math.log(self.visits)
+        best_score = -float('inf')
+        best = None
+        for action in legal:
+            child = self.children[action]
+            score = child.wins / child.visits + exploration_weight * math.sqrt(log_n / child.visits)
+            if score > best_score:
+                best_score = score
+                best = (action, child)
+        return best
+
+
+class MCTSOpponentModelAgent:
+    # MCTS that samples the opponent's action from a model at every node
+    # instead of branching on it, so the tree only branches on our own actions.
+    # The frequency model is updated by replaying step() on the previous
+    # position to recover which opponent action(s) produced the current one.
+
+    def __init__(self, simulations_per_move: int = 1000, player_id: int = 1,
+                 model="frequency", exploration_weight: float = 1.414,
+                 model_rollouts: bool = True,
+                 max_nodes: Optional[int] = None, max_bytes: Optional[int] = None,
+                 early_stop: bool = True, stop_check: int = 10):
+        if isinstance(model, str):
+            if model not in OPPONENT_MODELS:
+                raise ValueError(f"model must be one of {sorted(OPPONENT_MODELS)}, got '{model}'")
+            model = OPPONENT_MODELS[model]()
+        self.simulations_per_move = simulations_per_move
+        self.last_root = None
+        self.player_id = player_id
+        self.opp_id = 2 if player_id == 1 else 1
+        self.model = model
+        self.exploration_weight = exploration_weight
+        # Rollouts also draw the opponent from the model (otherwise uniform)
+        self.model_rollouts = model_rollouts
+        self.early_stop = early_stop
+        self.stop_check = stop_check
+        self.timer = PhaseTimer(type(self).__name__)
+        self.move_stats = self.timer.moves
+        self.budget = TreeBudget(max_nodes, max_bytes)
+        self.observed = 0
+        self._previous: Optional[Tuple[BattleState, ActionType]] = None
+
+    def choose_action(self, state: BattleState, player_id: int) -> ActionType:
+        self.timer.start_move()
+        self._observe(state)
+        action = self._search(state, player_id)
+        self._previous = (state, action)
+        self.timer.end_move(simulations=self.simulations_per_move, simulations_run=self.simulations_run,
+                            saved_simulations=self.simulations_per_move - self.simulations_run,
+                            stop_reason=self.stop_reason, observed=self.observed, **self.budget.stats())
+        return action
+
+    def _observe(self, state: BattleState):
+        previous = self._previous
+        if previous is None or state.turn_number <= previous[0].turn_number:
+            # New match: the frequency model only describes the current opponent
+            self.model.reset()
+            self.observed = 0
+            return
+
+        prev_state, my_action = previous
+        if state.turn_number != prev_state.turn_number + 1:
+            return
+        target = _outcome_key(state)
+        matches = []
+        for opp_action in legal_actions_for_player(prev_state, self.opp_id):
+            joint = (my_action, opp_action) if self.player_id == 1 else (opp_action, my_action)
+            if _outcome_key(step(prev_state, joint[0], joint[1])) == target:
+                matches.append(opp_action)
+        # Several actions can explain the same outcome (e.g. two missed moves)
+        for opp_action in matches:
+            self.model.observe(prev_state, self.opp_id, opp_action, 1.0 / len(matches))
+        self.observed += bool(matches)
+
+    def _search(self, state: BattleState, player_id: int) -> ActionType:
+        root = OpponentModelNode()
+        self.budget.reset(root)
+        self.last_root = root
+        self.simulations_run = 0
+        self.stop_reason = None
+
+        legal_actions = legal_actions_for_player(state, player_id)
+        if self.early_stop and len(legal_actions) == 1:
+            self.stop_reason = "single_action"
+            return legal_actions[0]
+
+        for i in range(self.simulations_per_move):
+            if self.early_stop and i > 0 and i % self.stop_check == 0:
+                counts = [root.children[a].visits if a in root.children else 0 for a in legal_actions]
+                if visits_decided(counts, self.simulations_per_move - i):
+                    self.stop_reason = "budget"
+                    break
+            self._simulate(root, state)
+            self.simulations_run += 1
+
+        return max(legal_actions, key=lambda a: root.children[a].visits if a in root.children else 0)
+
+    def _joint(self, state: BattleState, my_action: ActionType) -> Tuple[ActionType, ActionType]:
+        opp_action = self.model.sample(state, self.opp_id)
+        return (my_action, opp_action) if self.player_id == 1 else (opp_action, my_action)
+
+    def _simulate(self, root: OpponentModelNode, state: BattleState) -> float:
+        timer = self.timer
+        t0 = time.perf_counter()
+        node = root
+        path = [root]
+        while not state.terminal:
+            legal = legal_actions_for_player(state, self.player_id)
+            untried = [a for a in legal if a not in node.children]
+            if untried:
+                action = random.choice(untried)
+                child = OpponentModelNode(node)
+                node.children[action] = child
+                self.budget.add_node(root, leaf=child)
+            else:
+                action, child = node.best_child(legal, self.exploration_weight)
+            state = step(state, *self._joint(state, action))
+            node = child
+            path.append(node)
+            if untried:
+                break
+        t1 = time.perf_counter()
+
+        result = self._rollout(state)
+        t2 = time.perf_counter()
+
+        for path_node in path:
+            path_node.visits += 1
+            path_node.wins += result
+        t3 = time.perf_counter()
+
+        timer.add("selection", t1 - t0)
+        timer.add("rollout", t2 - t1)
+        timer.add("backprop", t3 - t2)
+        return result
+
+    def _rollout(self, state: BattleState) -> float:
+        current = state
+        while not current.terminal:
+            my_action = random.choice(legal_actions_for_player(current, self.player_id))
+            if self.model_rollouts:
+                a1, a2 = self._joint(current, my_action)
+            else:
+                opp_action = random.choice(legal_actions_for_player(current, self.opp_id))
+                a1, a2 = (my_action, opp_action) if self.player_id == 1 else (opp_action, my_action)
+            current = step(current, a1, a2)
+
+        if current.winner == self.player_id:
+            return 1.0
+        elif current.winner is None:
+            return 0.5
+        return 0.0
@@ -0,0 +1,278 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from battle_v2 import (
+    BattleState, PlayerState, step, legal_actions_for_player,
+    calculate_damage, check_game_over
+)
+from bench_harness import create_teams
+
+PHASES = ("early", "mid", "end")
+
+
+def build_corpus(seed: int = 1234, per_phase: int = 6) -> Dict[str, List[BattleState]]:
+    # Fixed set of non-terminal positions from seeded random games:
+    # early = nobody fainted and little damage, end = at least three fainted.
+    rng = random.Random(seed)
+    corpus: Dict[str, List[BattleState]] = {phase: [] for phase in PHASES}
+
+    while any(len(states) < per_phase for states in corpus.values()):
+        t1, t2 = create_teams()
+        state = BattleState(
+            player1=PlayerState(team=t1, active_index=0),
+            player2=PlayerState(team=t2, active_index=0),
+            rng_seed=rng.randint(0, 1000000)
+        )
+
+        while not state.terminal:
+            fainted = sum(m.fainted for m in state.player1.team + state.player2.team)
+            hp_left = sum(m.current_hp for m in state.player1.team + state.player2.team)
+            hp_max = sum(m.spec.max_hp for m in state.player1.team + state.player2.team)
+
+            if fainted == 0 and hp_left > 0.8 * hp_max:
+                phase = "early"
+            elif fainted >= 3:
+                phase = "end"
+            else:
+                phase = "mid"
+
+            if len(corpus[phase]) < per_phase and rng.random() < 0.3:
+                corpus[phase].append(state.clone())
+
+            a1 = rng.choice(legal_actions_for_player(state, 1))
+            a2 = rng.choice(legal_actions_for_player(state, 2))
+            state = step(state, a1, a2)
+
+    return corpus
+
+
+def _first_legal(state: BattleState):
+    return legal_actions_for_player(state, 1)[0], legal_actions_for_player(state, 2)[0]
+
+
+def build_primitives(states: List[BattleState]) -> Dict[str, Callable[[], None]]:
+    joint_actions = [_first_legal(s) for s in states]
+    actives = []
+    for s in states:
+        attacker = s.player1.team[s.player1.active_index]
+        defender = s.player2.team[s.player2.active_index]
+        actives.append((attacker.spec.moves[0], attacker, defender))
+
+    def run_clone():
+        for s in states:
+            s.clone()
+
+    def run_step():
+        for s, (a1, a2) in zip(states, joint_actions):
+            step(s, a1, a2)
+
+    def run_legal_actions():
+        for s in states:
+            legal_actions_for_player(s, 1)
+            legal_actions_for_player(s, 2)
+
+    def run_calculate_damage():
+        for move, attacker, defender in actives:
+            calculate_damage(move, attacker, defender)
+
+    def run_check_game_over():
+        for s in states:
+            check_game_over(s)
+
+    primitives = {
+        "clone": run_clone,
+        "step": run_step,
+        "legal_actions_for_player": run_legal_actions,
+        "calculate_damage": run_calculate_damage,
+        "check_game_over": run_check_game_over,
+    }
+
+    try:
+        from value_network import create_default_network
+    except ImportError:
+        return primitives
+
+    net = create_default_network()
+    features = [net.extract_features(s, 1) for s in states]
+
+    def run_extract_features():
+        for s in states:
+            net.extract_features(s, 1)
+
+    def run_forward():
+        for f in features:
+            net.forward(f)
+
+    primitives["extract_features"] = run_extract_features
+    primitives["forward"] = run_forward
+    return primitives
+
+
+def time_callable(fn: Callable[[], None], calls_per_run: int, warmup: int = 2,
+                  repeat: int = 7, min_time: float = 0.05) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+
+    # Calibrate the loop count so one repeat lasts at least min_time
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / (loops * calls_per_run) * 1e9)
+
+    return {
+        "median_ns": statistics.median(samples),
+        "min_ns": min(samples),
+        "mean_ns": statistics.mean(samples),
+        "stdev_ns": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def run_microbenchmarks(warmup: int = 2, repeat: int = 7, min_time: float = 0.05,
+                        only: Optional[List[str]] = None,
+                        rounds: int = 3) -> Dict[str, Dict[str, Dict[str, float]]]:
+    # The whole suite runs `rounds` times and each primitive keeps the median
+    # of its round medians: a shared machine has fast and slow stretches that
+    # last seconds, long enough to skew every primitive timed inside one
+    corpus = build_corpus()
+    primitives = {phase: build_primitives(corpus[phase]) for phase in PHASES}
+    samples: Dict[str, Dict[str, List[Dict[str, float]]]] = {}
+
+    for _ in range(rounds):
+        for phase in PHASES:
+            for name, fn in primitives[phase].items():
+                if only and name not in only:
+                    continue
+                stats = time_callable(fn, len(corpus[phase]), warmup, repeat, min_time)
+                samples.setdefault(name, {}).setdefault(phase, []).append(stats)
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name, phases in samples.items():
+        for phase, runs in phases.items():
+            medians = [run["median_ns"] for run in runs]
+            stats = {
+                "median_ns": statistics.median(medians),
+                "min_ns": min(run["min_ns"] for run in runs),
+                "mean_ns": statistics.mean(run["mean_ns"] for run in runs),
+                "stdev_ns": statistics.stdev(medians) if len(medians) > 1 else runs[0]["stdev_ns"],
+                "loops": runs[0]["loops"],
+                "repeat": repeat,
+                "rounds": len(runs),
+            }
+            results.setdefault(name, {})[phase] = stats
+            print(f"  {name:<26} {phase:<6} {stats['median_ns']/1000:>10.2f}us "
+                  f"(min {stats['min_ns']/1000:.2f}us, stdev {stats['stdev_ns']/1000:.2f}us)")
+
+    return results
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float) -> List[Tuple[str, str, float]]:
+    regressions = []
+    print(f"\n{'Primitive':<26} {'Phase':<6} {'Baseline':>12} {'Current':>12} {'Change':>9}")
+    print("-" * 69)
+    for name, phases in results.items():
+        for phase, stats in phases.items():
+            base = baseline.get(name, {}).get(phase)
+            if base is None:
+                print(f"{name:<26} {phase:<6} {'-':>12} {stats['median_ns']/1000:>10.2f}us {'new':>9}")
+                continue
+            change = stats["median_ns"] / base["median_ns"] - 1
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressions.append((name, phase, change))
+            print(f"{name:<26} {phase:<6} {base['median_ns']/1000:>10.2f}us "
+                  f"{stats['median_ns']/1000:>10.2f}us {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for engine and value-net primitives")
+    parser.add_argument("--output", default="perf/results.json")
+    parser.add_argument("--baseline", default="perf/baseline.json")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="fail when a primitive is this fraction slower than the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per repeat")
+    parser.add_argument("--only", nargs="*", help="restrict to these primitives")
+    parser.add_argument("--rounds", type=int, default=3, help="passes over the whole suite")
+    parser.add_argument("--allow-foreign-baseline", action="store_true",
+                        help="report but do not fail on a baseline from another host or Python")
+    args = parser.parse_args(argv)
+
+    print("="*60)
+    print("Engine Microbenchmarks")
+    print("="*60)
+
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run make perf-baseline (--update-baseline) first.")
+        return 2
+
+    results = run_microbenchmarks(args.warmup, args.repeat, args.min_time, args.only, args.rounds)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "host": platform.node(),
+        "results": results,
+    }
+
+    for path in (args.output, args.baseline if args.update_baseline else None):
+        if not path:
+            continue
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {path}")
+
+    if args.update_baseline:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare_to_baseline(results, baseline["results"], args.threshold)
+    # Microsecond timings only compare on the machine and Python that
+    # recorded them; a foreign baseline still fails unless explicitly allowed
+    same_machine = all(baseline.get(k) == report[k] for k in ("host", "machine", "python"))
+    if not same_machine:
+        print(f"\nBaseline was recorded on {baseline.get('host', 'another machine')} "
+              f"(Python {baseline.get('python')}); run make perf-baseline here to gate on it.")
+        if regressions and args.allow_foreign_baseline:
+            return 0
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for name, phase, change in regressions:
+            print(f"  {name}/{phase}: {change:+.1%}")
+        return 1
+
+    print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from battle_v2 import BattleState, PlayerState, ActionType, step, legal_actions_for_player
+
+JointAction = Tuple[ActionType, ActionType]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    hash TEXT NOT NULL,
+    player INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    searches INTEGER NOT NULL,
+    simulations INTEGER NOT NULL,
+    children TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (hash, player)
+)
+"""
+
+
+def canonical_key(state: BattleState) -> Tuple:
+    # Everything that decides the rest of the game except the accuracy rolls:
+    # rng_seed and turn_number only feed step()'s random.Random, so the same
+    # board reached in another game (or on another turn) shares one entry
+    return (state.terminal, state.winner,
+            tuple((p.active_index, tuple((m.spec.name, m.current_hp, m.fainted) for m in p.team))
+                  for p in (state.player1, state.player2)))
+
+
+def position_hash(state: BattleState) -> str:
+    # Stable across processes and Python runs, unlike hash()
+    return hashlib.blake2b(repr(canonical_key(state)).encode(), digest_size=8).hexdigest()
+
+
+@dataclass
+class BookEntry:
+    # Root statistics of one position for one player: per joint action the
+    # visits, wins from that player's point of view and draws, kept apart so
+    # each search can credit draws the way its own statistics do
+    hash: str
+    player_id: int
+    searches: int = 0
+    simulations: int = 0
+    children: Dict[JointAction, List[float]] = field(default_factory=dict)
+
+    @property
+    def visits(self) -> int:
+        return int(sum(stats[0] for stats in self.children.values()))
+
+    def merge(self, children: Dict[JointAction, List[float]], simulations: int, searches: int = 1):
+        for joint, (visits, wins, draws) in children.items():
+            stats = self.children.setdefault(joint, [0, 0.0, 0])
+            stats[0] += visits
+            stats[1] += wins
+            stats[2] += draws
+        self.simulations += simulations
+        self.searches += searches
+
+    def value(self, joint: JointAction, draw_credit: float = 0.5) -> Optional[float]:
+        visits, wins, draws = self.children.get(joint, (0, 0.0, 0))
+        return (wins + draw_credit * draws) / visits if visits > 0 else None
+
+    def best_action(self, legal_actions: List[ActionType], legal_opp: List[ActionType],
+                    draw_credit: float = 0.5) -> Optional[ActionType]:
+        # Same max-min rule as the search agents' final choice
+        best_action = None
+        best_worst_case = -float('inf')
+        for my_action in legal_actions:
+            values = []
+            for opp_action in legal_opp:
+                joint = (my_action, opp_action) if self.player_id == 1 else (opp_action, my_action)
+                value = self.value(joint, draw_credit)
+                if value is not None:
+                    values.append(value)
+            if values and min(values) > best_worst_case:
+                best_worst_case = min(values)
+                best_action = my_action
+        return best_action
+
+
+def _encode_children(children: Dict[JointAction, List[float]]) -> str:
+    return json.dumps([[a1.name, a2.name, visits, wins, draws]
+                       for (a1, a2), (visits, wins, draws) in children.items()])
+
+
+def _decode_children(text: str) -> Dict[JointAction, List[float]]:
+    # Rows written before draws were stored have no draw column
+    children = {}
+    for a1, a2, visits, wins, *draws in json.loads(text):
+        children[(ActionType[a1], ActionType[a2])] = [visits, wins, draws[0] if draws else 0]
+    return children
+
+
+class PositionBook:
+    # SQLite file of root statistics keyed by (position_hash, player). The
+    # whole book is read into memory on open, so a lookup during a game is a
+    # dict access; only the builder writes.
+
+    def __init__(self, path: str = "books/opening.sqlite"):
+        self.path = path
+        self.entries: Dict[Tuple[str, int], BookEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        if os.path.exists(path):
+            with sqlite3.connect(path) as conn:
+                conn.execute(SCHEMA)
+                for h, player, searches, simulations, children in conn.execute(
+                        "SELECT hash, player, searches, simulations, children FROM positions"):
+                    self.entries[(h, player)] = BookEntry(h, player, searches, simulations,
+                                                          _decode_children(children))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, state: BattleState, player_id: int) -> Optional[BookEntry]:
+        entry = self.entries.get((position_hash(state), player_id))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def add(self, state: BattleState, player_id: int, children: Dict[JointAction, List[float]],
+            simulations: int):
+        h = position_hash(state)
+        entry = self.entries.setdefault((h, player_id), BookEntry(h, player_id))
+        entry.merge(children, simulations)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with sqlite3.connect(self.path) as conn:
+            conn.execute(SCHEMA)
+            conn.execute("INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (h, player_id, repr(canonical_key(state)), entry.searches, entry.simulations,
+                          _encode_children(entry.children), time.time()))
+
+    def stats(self) -> Dict[str, int]:
+        return {"book_entries": len(self.entries), "book_hits": self.hits, "book_misses": self.misses}
+
+
+def opening_positions(depth: int, seeds: List[int],
+                      lineups: Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]] = None) -> List[BattleState]:
+    # Every distinct position within depth turns of the standard start, over
+    # all joint actions and the accuracy outcomes of the given game seeds
+    from bench_harness import create_teams, create_team
+    t1, t2 = create_teams() if lineups is None else (create_team(lineups[0]), create_team(lineups[1]))
+
+    positions: Dict[str, BattleState] = {}
+    frontier = [BattleState(player1=PlayerState(team=t1, active_index=0),
+                            player2=PlayerState(team=t2, active_index=0), rng_seed=seed).clone()
+                for seed in seeds]
+    # A position reached under another seed still gets expanded under this
+    # one, since its accuracy rolls lead to different successors
+    seen = set()
+    for turn in range(depth + 1):
+        next_frontier = []
+        for state in frontier:
+            h = position_hash(state)
+            if state.terminal or (h, state.rng_seed) in seen:
+                continue
+            seen.add((h, state.rng_seed))
+            positions.setdefault(h, state)
+            if turn < depth:
+                for a1 in legal_actions_for_player(state, 1):
+                    for a2 in legal_actions_for_player(state, 2):
+                        next_frontier.append(step(state, a1, a2))
+        frontier = next_frontier
+    return list(positions.values())
+
+
+def search_position(state: BattleState, player_id: int, seed: int, simulations: int) -> Tuple:
+    # One deep search with early stopping off; root statistics are from
+    # player_id's point of view with draws taken out of the wins
+    from mcts_v2 import MCTSAgent
+    random.seed(seed)
+    state = state.clone()
+    state.rng_seed = seed
+    agent = MCTSAgent(simulations_per_move=simulations, player_id=player_id, early_stop=False)
+    agent.choose_action(state, player_id)
+    children = {joint: [child.visits, child.wins - agent.draw_credit * child.draws, child.draws]
+                for joint, child in agent.last_root.children.items()}
+    return state, player_id, children, agent.simulations_run
+
+
+def build_book(book: PositionBook, positions: List[BattleState], simulations: int, searches: int,
+               seed: int = 0, workers: Optional[int] = None):
+    # Each (position, player) gets `searches` independent searches under
+    # different game seeds, so the entry averages over the accuracy rolls
+    from bench_harness import default_workers
+    rng = random.Random(seed)
+    tasks = [(state, player_id, rng.randint(0, 1000000))
+             for state in positions for player_id in (1, 2)
+             if legal_actions_for_player(state, player_id)
+             for _ in range(searches)]
+
+    workers = workers or default_workers()
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(search_position, state, player_id, task_seed, simulations)
+                   for state, player_id, task_seed in tasks]
+        report_every = max(1, len(futures) // 10)
+        for done, future in enumerate(as_completed(futures), 1):
+            state, player_id, children, run = future.result()
+            book.add(state, player_id, children, run)
+            if done % report_every == 0 or done == len(futures):
+                elapsed = time.time() - start
+                print(f"  {done}/{len(futures)} searches ({elapsed:.0f}s, "
+                      f"{done * simulations / elapsed:.0f} sims/s)")
+
+
+def print_book(book: PositionBook, limit: int = 10):
+    from bench_harness import create_teams
+    t1, t2 = create_teams()
+    start = BattleState(player1=PlayerState(team=t1, active_index=0),
+                        player2=PlayerState(team=t2, active_index=0))
+    print(f"{len(book)} entries in {book.path}")
+    for player_id in (1, 2):
+        entry = book.lookup(start, player_id)
+        if entry is None:
+            print(f"  start position, player {player_id}: not in book")
+            continue
+        action = entry.best_action(legal_actions_for_player(start, player_id),
+                                   legal_actions_for_player(start, 3 - player_id))
+        print(f"  start position, player {player_id}: {action.name} "
+              f"({entry.searches} searches, {entry.visits} visits)")
+        rows = sorted(entry.children.items(), key=lambda kv: -kv[1][0])[:limit]
+        for (a1, a2), (visits, wins, draws) in rows:
+            print(f"    {a1.name:<12} {a2.name:<12} {int(visits):>7} visits  {entry.value((a1, a2)):.3f}  "
+                  f"({int(draws)} draws)")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Build the opening book from deep offline searches")
+    parser.add_argument("--book", default="books/opening.sqlite")
+    parser.add_argument("--depth", type=int, default=1, help="turns from the start position to cover")
+    parser.add_argument("--simulations", type=int, default=5000, help="simulations per search")
+    parser.add_argument("--searches", type=int, default=4, help="searches (game seeds) per position and player")
+    parser.add_argument("--position-seeds", type=int, default=4,
+                        help="game seeds whose accuracy outcomes define the positions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--show", action="store_true", help="only print the book's start-position entries")
+    args = parser.parse_args(argv)
+
+    print("="*60)
+    print("Opening Book")
+    print("="*60)
+
+    book = PositionBook(args.book)
+    if args.show:
+        print_book(book)
+        return
+
+    rng = random.Random(args.seed)
+    positions = opening_positions(args.depth, [rng.randint(0, 1000000) for _ in range(args.position_seeds)])
+    print(f"{len(positions)} positions within {args.depth} turn(s), {args.searches} searches x "
+          f"{args.simulations} sims per position and player")
+    build_book(book, positions, args.simulations, args.searches, args.seed, args.workers)
+    print()
+    print_book(book)
+
+
+if __name__ == "__main__":
+    main()
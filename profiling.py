@@ -0,0 +1,179 @@
+import cProfile
+import json
+import os
+import pstats
+import signal
+import sys
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+PROFILE_ENV = "BENCH_PROFILE"
+PROFILE_MODES = ("cprofile", "sample")
+
+
+class PhaseTimer:
+    # Cheap always-on timers: agents add perf_counter deltas per phase, and
+    # end_move() closes one record per choose_action call.
+
+    def __init__(self, name: str, history: int = 10000):
+        self.name = name
+        self.moves: deque = deque(maxlen=history)
+        self.current: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.move_start = 0.0
+
+    def start_move(self):
+        self.current = {}
+        self.counts = {}
+        self.move_start = time.perf_counter()
+
+    def add(self, phase: str, seconds: float):
+        self.current[phase] = self.current.get(phase, 0.0) + seconds
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def end_move(self, **extra) -> Dict[str, Any]:
+        record = dict(extra, total=time.perf_counter() - self.move_start,
+                      phases=self.current, counts=self.counts)
+        self.moves.append(record)
+        return record
+
+    def totals(self) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        for move in self.moves:
+            for phase, seconds in move["phases"].items():
+                totals[phase] = totals.get(phase, 0.0) + seconds
+        return totals
+
+    def summary(self) -> Dict[str, Any]:
+        total = sum(m["total"] for m in self.moves)
+        phases = self.totals()
+        return {
+            "agent": self.name,
+            "moves": len(self.moves),
+            "total_s": total,
+            "phases_s": phases,
+            "phases_share": {p: s / total for p, s in phases.items()} if total > 0 else {},
+        }
+
+    def collapsed(self) -> List[str]:
+        # Flamegraph "folded" lines in microseconds; time outside the named
+        # phases (final action choice, bookkeeping) is reported as "other".
+        total = sum(m["total"] for m in self.moves)
+        phases = self.totals()
+        lines = [f"{self.name};choose_action;{phase} {int(seconds * 1e6)}"
+                 for phase, seconds in sorted(phases.items())]
+        other = total - sum(phases.values())
+        if other > 0:
+            lines.append(f"{self.name};choose_action;other {int(other * 1e6)}")
+        return lines
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"\n{self.name}: {summary['moves']} moves, {summary['total_s']:.2f}s")
+        for phase, seconds in sorted(summary["phases_s"].items(), key=lambda kv: -kv[1]):
+            print(f"  {phase:<12} {seconds:>8.3f}s  {summary['phases_share'][phase]:>6.1%}")
+
+
+def export_phase_timers(timers: Iterable[PhaseTimer], path_prefix: str):
+    timers = [t for t in timers if t.moves]
+    if not timers:
+        return
+    directory = os.path.dirname(path_prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(f"{path_prefix}.phases.json", 'w') as f:
+        json.dump({
+            "summary": [t.summary() for t in timers],
+            "moves": {t.name: list(t.moves) for t in timers},
+        }, f, indent=2)
+    with open(f"{path_prefix}.phases.folded", 'w') as f:
+        for timer in timers:
+            f.write("\n".join(timer.collapsed()) + "\n")
+    print(f"Wrote {path_prefix}.phases.json and {path_prefix}.phases.folded")
+
+
+class SamplingProfiler:
+    # Statistical profiler driven by SIGPROF (Unix, main thread only). Stacks
+    # are stored in collapsed form, ready for flamegraph.pl or speedscope.
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Dict[str, int] = {}
+
+    def _handler(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        key = ";".join(reversed(stack))
+        self.samples[key] = self.samples.get(key, 0) + 1
+
+    def start(self):
+        signal.signal(signal.SIGPROF, self._handler)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+    def write(self, path: str):
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+
+    def print_top(self, limit: int = 20):
+        leaf_counts: Dict[str, int] = {}
+        for stack, count in self.samples.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            leaf_counts[leaf] = leaf_counts.get(leaf, 0) + count
+        total = sum(leaf_counts.values()) or 1
+        print(f"\nTop {limit} functions by self samples ({total} samples):")
+        for leaf, count in sorted(leaf_counts.items(), key=lambda kv: -kv[1])[:limit]:
+            print(f"  {count / total:>6.1%}  {leaf}")
+
+
+def add_profile_arguments(parser):
+    parser.add_argument("--profile", choices=PROFILE_MODES, default=None,
+                        help=f"profile this run (or set {PROFILE_ENV}=cprofile|sample)")
+    parser.add_argument("--profile-output", default=None,
+                        help="profile output path prefix (default: results/profile-<timestamp>)")
+
+
+def resolve_profile_mode(mode: Optional[str] = None) -> Optional[str]:
+    mode = mode or os.environ.get(PROFILE_ENV) or None
+    if mode is not None and mode not in PROFILE_MODES:
+        raise ValueError(f"{PROFILE_ENV} must be one of {PROFILE_MODES}, got '{mode}'")
+    return mode
+
+
+def run_profiled(fn: Callable[[], Any], mode: Optional[str] = None, output: Optional[str] = None):
+    mode = resolve_profile_mode(mode)
+    if mode is None:
+        return fn()
+
+    output = output or os.path.join("results", f"profile-{time.strftime('%Y%m%d-%H%M%S')}")
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(fn)
+        finally:
+            profiler.dump_stats(f"{output}.prof")
+            print(f"\nWrote {output}.prof")
+            pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(25)
+
+    sampler = SamplingProfiler()
+    sampler.start()
+    try:
+        return fn()
+    finally:
+        sampler.stop()
+        sampler.write(f"{output}.folded")
+        print(f"\nWrote {output}.folded")
+        sampler.print_top()
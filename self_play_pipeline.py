@@ -0,0 +1,269 @@
+import argparse
+import collections
+import multiprocessing as mp
+import os
+import queue
+import random
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from battle_v2 import BattleState, PlayerState, step, legal_actions_for_player
+from train_value_network import create_teams
+from value_network import ValueNetwork, create_default_network
+from mcts_value_net import MCTSAgentValueNet
+
+
+def publish_weights(net: ValueNetwork, weights_path: str):
+    tmp_path = weights_path + ".tmp"
+    net.save(tmp_path, verbose=False)
+    os.replace(tmp_path, weights_path)
+
+
+def play_self_play_game(net: ValueNetwork, simulations: int,
+                        random_move_prob: float = 0.0) -> Tuple[np.ndarray, np.ndarray, Optional[int]]:
+    team1, team2 = create_teams()
+    state = BattleState(
+        player1=PlayerState(team=team1, active_index=0),
+        player2=PlayerState(team=team2, active_index=0),
+        rng_seed=random.randint(0, 1000000)
+    )
+
+    agent1 = MCTSAgentValueNet(net, simulations_per_move=simulations, player_id=1)
+    agent2 = MCTSAgentValueNet(net, simulations_per_move=simulations, player_id=2)
+
+    features_p1 = []
+    features_p2 = []
+
+    while not state.terminal:
+        features_p1.append(net.extract_features(state, 1))
+        features_p2.append(net.extract_features(state, 2))
+
+        if random.random() < random_move_prob:
+            a1 = random.choice(legal_actions_for_player(state, 1))
+        else:
+            a1 = agent1.choose_action(state, 1)
+
+        if random.random() < random_move_prob:
+            a2 = random.choice(legal_actions_for_player(state, 2))
+        else:
+            a2 = agent2.choose_action(state, 2)
+
+        state = step(state, a1, a2)
+
+    if state.winner == 1:
+        target_p1 = 1.0
+    elif state.winner == 2:
+        target_p1 = 0.0
+    else:
+        target_p1 = 0.5
+
+    features = np.concatenate(features_p1 + features_p2, axis=0)
+    targets = np.array([target_p1] * len(features_p1) + [1.0 - target_p1] * len(features_p2),
+                       dtype=np.float32)
+
+    return features, targets, state.winner
+
+
+def actor_loop(actor_id: int, weights_path: str, trajectory_queue, weights_version,
+               games_played, stop_event, simulations: int, random_move_prob: float):
+    random.seed((os.getpid() << 8) ^ actor_id ^ int(time.time()))
+
+    net = create_default_network()
+    loaded_version = -1
+
+    while not stop_event.is_set():
+        if weights_version.value != loaded_version:
+            loaded_version = weights_version.value
+            net.load(weights_path, verbose=False)
+
+        features, targets, winner = play_self_play_game(net, simulations, random_move_prob)
+
+        while not stop_event.is_set():
+            try:
+                trajectory_queue.put((features, targets, winner), timeout=0.5)
+                break
+            except queue.Full:
+                continue
+
+        with games_played.get_lock():
+            games_played.value += 1
+
+
+def learner_loop(weights_path: str, trajectory_queue, weights_version, samples_trained,
+                 stop_event, buffer_size: int, batch_size: int, min_buffer: int,
+                 learning_rate: float, publish_every: int, max_replay_ratio: float):
+    net = create_default_network()
+    net.load(weights_path, verbose=False)
+
+    replay_features = collections.deque(maxlen=buffer_size)
+    replay_targets = collections.deque(maxlen=buffer_size)
+    steps = 0
+    samples_received = 0
+
+    while not stop_event.is_set():
+        try:
+            while True:
+                features, targets, _ = trajectory_queue.get_nowait()
+                replay_features.extend(features)
+                replay_targets.extend(targets)
+                samples_received += len(targets)
+        except queue.Empty:
+            pass
+
+        if len(replay_features) < min_buffer:
+            time.sleep(0.1)
+            continue
+
+        if steps * batch_size >= max_replay_ratio * samples_received:
+            time.sleep(0.01)
+            continue
+
+        indices = np.random.randint(0, len(replay_features), size=batch_size)
+        batch_features = np.stack([replay_features[i] for i in indices])
+        batch_targets = np.array([replay_targets[i] for i in indices], dtype=np.float32)
+
+        net.train_batch(batch_features, batch_targets, learning_rate)
+        steps += 1
+
+        with samples_trained.get_lock():
+            samples_trained.value += batch_size
+
+        if steps % publish_every == 0:
+            publish_weights(net, weights_path)
+            with weights_version.get_lock():
+                weights_version.value += 1
+
+    publish_weights(net, weights_path)
+
+
+def run_pipeline(num_actors: int = 2,
+                 simulations: int = 50,
+                 duration: float = 600.0,
+                 init_path: Optional[str] = "value_network_v1.pkl",
+                 weights_path: str = "value_network_selfplay.pkl",
+                 queue_size: int = 64,
+                 buffer_size: int = 50000,
+                 batch_size: int = 64,
+                 min_buffer: int = 1000,
+                 learning_rate: float = 0.005,
+                 publish_every: int = 200,
+                 max_replay_ratio: float = 8.0,
+                 random_move_prob: float = 0.1,
+                 report_interval: float = 30.0) -> dict:
+    print("="*60)
+    print("Value Network Self-Play Pipeline")
+    print("="*60)
+    print(f"Actors: {num_actors}, MCTS simulations: {simulations}")
+    print(f"Replay buffer: {buffer_size} samples, batch size: {batch_size}")
+
+    net = create_default_network()
+    if init_path and os.path.exists(init_path):
+        net.load(init_path)
+    else:
+        print("Starting from random initialization.")
+    publish_weights(net, weights_path)
+
+    trajectory_queue = mp.Queue(maxsize=queue_size)
+    weights_version = mp.Value('i', 0)
+    games_played = mp.Value('l', 0)
+    samples_trained = mp.Value('l', 0)
+    stop_event = mp.Event()
+
+    learner = mp.Process(target=learner_loop, args=(
+        weights_path, trajectory_queue, weights_version, samples_trained, stop_event,
+        buffer_size, batch_size, min_buffer, learning_rate, publish_every, max_replay_ratio))
+    actors = [mp.Process(target=actor_loop, args=(
+        i, weights_path, trajectory_queue, weights_version, games_played, stop_event,
+        simulations, random_move_prob)) for i in range(num_actors)]
+
+    start = time.time()
+    learner.start()
+    for actor in actors:
+        actor.start()
+
+    last_report = start
+    try:
+        while time.time() - start < duration:
+            time.sleep(min(1.0, duration))
+            if time.time() - last_report >= report_interval:
+                last_report = time.time()
+                elapsed = last_report - start
+                print(f"[{elapsed:7.1f}s] games: {games_played.value} "
+                      f"({games_played.value / elapsed * 3600:.0f}/hour), "
+                      f"learner: {samples_trained.value / elapsed:.0f} samples/sec, "
+                      f"weights v{weights_version.value}")
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        stop_event.set()
+        for actor in actors:
+            actor.join(timeout=60)
+        learner.join(timeout=60)
+        # An actor blocked on a full queue or a learner mid-batch would
+        # otherwise keep the interpreter from exiting
+        for process in actors + [learner]:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        trajectory_queue.cancel_join_thread()
+
+    elapsed = time.time() - start
+    stats = {
+        "actors": num_actors,
+        "elapsed": elapsed,
+        "games": games_played.value,
+        "games_per_hour": games_played.value / elapsed * 3600,
+        "samples_trained": samples_trained.value,
+        "samples_per_sec": samples_trained.value / elapsed,
+        "weights_version": weights_version.value,
+    }
+
+    print("\n" + "="*60)
+    print("Summary")
+    print("="*60)
+    print(f"  Games played:    {stats['games']} ({stats['games_per_hour']:.0f}/hour)")
+    print(f"  Samples trained: {stats['samples_trained']} ({stats['samples_per_sec']:.0f}/sec)")
+    print(f"  Weights:         v{stats['weights_version']} -> {weights_path}")
+
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Actor/learner self-play training for the value network")
+    parser.add_argument("--actors", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument("--simulations", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=600.0, help="seconds to run")
+    parser.add_argument("--init", default="value_network_v1.pkl")
+    parser.add_argument("--output", default="value_network_selfplay.pkl")
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--buffer-size", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--min-buffer", type=int, default=1000)
+    parser.add_argument("--learning-rate", type=float, default=0.005)
+    parser.add_argument("--publish-every", type=int, default=200)
+    parser.add_argument("--max-replay-ratio", type=float, default=8.0,
+                        help="max trained samples per sample produced by the actors")
+    parser.add_argument("--random-move-prob", type=float, default=0.1)
+    parser.add_argument("--report-interval", type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    run_pipeline(num_actors=args.actors,
+                 simulations=args.simulations,
+                 duration=args.duration,
+                 init_path=args.init,
+                 weights_path=args.output,
+                 queue_size=args.queue_size,
+                 buffer_size=args.buffer_size,
+                 batch_size=args.batch_size,
+                 min_buffer=args.min_buffer,
+                 learning_rate=args.learning_rate,
+                 publish_every=args.publish_every,
+                 max_replay_ratio=args.max_replay_ratio,
+                 random_move_prob=args.random_move_prob,
+                 report_interval=args.report_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import math
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+from battle_v2 import ActionType
+from early_stopping import ChildStats, joint_rows
+
+
+def gumbel() -> float:
+    return -math.log(-math.log(max(random.random(), 1e-12)))
+
+
+def halving_rounds(num_actions: int) -> int:
+    rounds = 0
+    while num_actions > 1:
+        num_actions = (num_actions + 1) // 2
+        rounds += 1
+    return max(rounds, 1)
+
+
+def row_value(row: List[ChildStats]) -> Tuple[Optional[float], int]:
+    # Worst case over the opponent replies tried so far, matching the max-min
+    # rule the agents use for their final choice; None until one is visited
+    worst = None
+    visits = 0
+    for entry in row:
+        if entry is None:
+            continue
+        if isinstance(entry, float):
+            q = entry
+            visits += 1
+        else:
+            q = entry[0] / entry[1]
+            visits += entry[1]
+        worst = q if worst is None else min(worst, q)
+    return worst, visits
+
+
+def select_reply(row: List[ChildStats], opp_actions: List[ActionType],
+                 exploration_weight: float) -> ActionType:
+    # Every reply is tried once so the row's worst case is defined, then UCB
+    # from the opponent's side concentrates visits on its best replies
+    untried = [reply for reply, entry in zip(opp_actions, row) if entry is None]
+    if untried:
+        return random.choice(untried)
+    total = sum(1 if isinstance(entry, float) else entry[1] for entry in row)
+    log_n = math.log(total)
+
+    best_score = -float('inf')
+    best_reply = None
+    for reply, entry in zip(opp_actions, row):
+        if isinstance(entry, float):
+            # Proven entries need no more visits
+            score = 1 - entry
+        else:
+            score = 1 - entry[0] / entry[1] + exploration_weight * math.sqrt(log_n / entry[1])
+        if score > best_score:
+            best_score = score
+            best_reply = reply
+    return best_reply
+
+
+def sequential_halving(root, my_actions: List[ActionType], opp_actions: List[ActionType],
+                       player_id: int, budget: int,
+                       simulate: Callable[[Tuple[ActionType, ActionType]], float],
+                       child_stats: Callable[[object], ChildStats],
+                       exploration_weight: float = 1.414, gumbel_scale: float = 1.0,
+                       c_visit: float = 50.0, c_scale: float = 0.1,
+                       stop: Optional[Callable[[], bool]] = None) -> Tuple[ActionType, int]:
+    # Gumbel-style sequential halving over our own root actions: each round
+    # splits its share of the budget evenly over the surviving candidates,
+    # then keeps the better half by g(a) + sigma(q(a)). The Gumbel draw g(a)
+    # stands in for sampling without replacement from a (uniform) prior, q is
+    # min-max normalized over the candidates and sigma = (c_visit + max
+    # visits) * c_scale makes it dominate the noise as evidence grows.
+    # The first round always covers the whole root matrix, so the worst case
+    # of every row is known before anything is discarded.
+    # simulate(joint_action) runs one simulation through that root child.
+    noise: Dict[ActionType, float] = {a: gumbel_scale * gumbel() for a in my_actions}
+    candidates = list(my_actions)
+    rounds = halving_rounds(len(candidates))
+    used = 0
+
+    def scores(with_noise: bool = True) -> Dict[ActionType, float]:
+        rows = joint_rows(root.children, candidates, opp_actions, player_id, child_stats)
+        values = [row_value(row) for row in rows]
+        known = [q for q, _ in values if q is not None]
+        low, high = (min(known), max(known)) if known else (0.0, 0.0)
+        max_visits = max(visits for _, visits in values)
+        sigma = (c_visit + max_visits) * c_scale
+        ranked = {}
+        for action, (q, _) in zip(candidates, values):
+            if q is None:
+                normalized = 0.0
+            elif high > low:
+                normalized = (q - low) / (high - low)
+            else:
+                normalized = 0.5
+            ranked[action] = (noise[action] if with_noise else 0.0) + sigma * normalized
+        return ranked
+
+    for r in range(rounds):
+        round_budget = (budget - used) // (rounds - r)
+        if r == 0:
+            # Cover every (own action, reply) pair once before the first cut
+            round_budget = min(max(round_budget, len(candidates) * len(opp_actions)), budget)
+        for i in range(round_budget):
+            if stop is not None and stop():
+                break
+            action = candidates[i % len(candidates)]
+            row = joint_rows(root.children, [action], opp_actions, player_id, child_stats)[0]
+            reply = select_reply(row, opp_actions, exploration_weight)
+            simulate((action, reply) if player_id == 1 else (reply, action))
+            used += 1
+        if used >= budget:
+            break
+        ranked = scores()
+        candidates.sort(key=lambda a: ranked[a], reverse=True)
+        candidates = candidates[:(len(candidates) + 1) // 2]
+        if stop is not None and stop():
+            break
+
+    # The noise only decides the cuts; the final pick is the best worst case
+    ranked = scores(with_noise=False)
+    return max(candidates, key=lambda a: ranked[a]), used
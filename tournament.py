@@ -0,0 +1,301 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Tuple
+
+from bench_harness import AgentSpec, parse_agent_spec, _play_game_task, default_workers
+
+
+def elo_to_score(elo: float) -> float:
+    return 1.0 / (1.0 + 10 ** (-elo / 400.0))
+
+
+def score_to_elo(score: float) -> float:
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+class SPRT:
+    # Sequential probability ratio test of H0: elo = elo0 vs H1: elo = elo1,
+    # using the normal (GSPRT) approximation to the trinomial W/D/L model.
+
+    def __init__(self, elo0: float = 0.0, elo1: float = 20.0, alpha: float = 0.05, beta: float = 0.05):
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    def record(self, score: float):
+        if score == 1.0:
+            self.wins += 1
+        elif score == 0.0:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+    def score(self) -> float:
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.5
+
+    def llr(self) -> float:
+        if self.games == 0:
+            return 0.0
+
+        # Half a pseudo-draw keeps the variance positive on a clean sweep, so
+        # 20-0 gives a large LLR instead of none while 2-0 is still undecided
+        n = self.games + 0.5
+        s = (self.wins + 0.5 * (self.draws + 0.5)) / n
+        var = (self.wins * (1 - s) ** 2 + (self.draws + 0.5) * (0.5 - s) ** 2 + self.losses * s ** 2) / n
+        if var <= 0:
+            # Only draws: no evidence either way
+            return 0.0
+
+        s0 = elo_to_score(self.elo0)
+        s1 = elo_to_score(self.elo1)
+        return n * (s1 - s0) * (2 * s - s0 - s1) / (2 * var)
+
+    def status(self) -> Optional[str]:
+        llr = self.llr()
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
+
+    def elo_estimate(self) -> Tuple[float, float]:
+        n = self.games
+        if n == 0:
+            return 0.0, float('inf')
+        s = self.score()
+        var = (self.wins * (1 - s) ** 2 + self.draws * (0.5 - s) ** 2 + self.losses * s ** 2) / n
+        margin = 1.96 * math.sqrt(var / n)
+        return score_to_elo(s), (score_to_elo(min(s + margin, 1)) - score_to_elo(max(s - margin, 0))) / 2
+
+
+class EloTable:
+    # Pairwise W/D/L records for every agent ever played, persisted as JSON,
+    # with ratings fitted jointly by maximum likelihood (draws as half wins).
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.records: Dict[str, Dict[str, List[int]]] = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.records = json.load(f).get("records", {})
+
+    def add(self, name_a: str, name_b: str, wins: int, draws: int, losses: int):
+        rec = self.records.setdefault(name_a, {}).setdefault(name_b, [0, 0, 0])
+        rec[0] += wins
+        rec[1] += draws
+        rec[2] += losses
+        rev = self.records.setdefault(name_b, {}).setdefault(name_a, [0, 0, 0])
+        rev[0] += losses
+        rev[1] += draws
+        rev[2] += wins
+
+    def ratings(self, iterations: int = 2000) -> Dict[str, float]:
+        names = sorted(self.records)
+        ratings = {name: 0.0 for name in names}
+        for _ in range(iterations):
+            for name in names:
+                games = 0
+                grad = 0.0
+                for opp, (w, d, l) in self.records[name].items():
+                    n = w + d + l
+                    if n == 0:
+                        continue
+                    expected = elo_to_score(ratings[name] - ratings[opp])
+                    grad += (w + 0.5 * d) - n * expected
+                    games += n
+                if games:
+                    ratings[name] += 400.0 * grad / games * 0.5
+            mean = sum(ratings.values()) / len(ratings) if ratings else 0.0
+            for name in names:
+                ratings[name] -= mean
+        return ratings
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({"records": self.records, "ratings": self.ratings()}, f, indent=2)
+
+    def print_table(self):
+        ratings = self.ratings()
+        print(f"\n{'Agent':<24} {'Elo':>8} {'Games':>8}")
+        print("-" * 42)
+        for name, rating in sorted(ratings.items(), key=lambda kv: -kv[1]):
+            games = sum(sum(rec) for rec in self.records[name].values())
+            print(f"{name:<24} {rating:>+8.1f} {games:>8}")
+
+
+def run_sprt_pair(agent_a: AgentSpec, agent_b: AgentSpec, sprt: SPRT, pool: ProcessPoolExecutor,
+                  in_flight: int, max_games: int, seed: int = 0, turn_limit: int = 100) -> dict:
+    # Games alternate seats so that neither agent always plays player 1; each
+    # pair of games shares a seed so both agents see the same random numbers.
+    rng = random.Random(seed)
+    pending = {}
+    submitted = 0
+    game_seed = 0
+    start = time.time()
+
+    def submit():
+        nonlocal submitted, game_seed
+        a_first = submitted % 2 == 0
+        if a_first:
+            game_seed = rng.randint(0, 1000000)
+            future = pool.submit(_play_game_task, agent_a, agent_b, game_seed, turn_limit, True)
+        else:
+            future = pool.submit(_play_game_task, agent_b, agent_a, game_seed, turn_limit, True)
+        pending[future] = a_first
+        submitted += 1
+
+    while submitted < min(in_flight, max_games):
+        submit()
+
+    result = None
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            a_first = pending.pop(future)
+            if result is not None:
+                continue
+            winner = future.result()["winner"]
+            a_seat = 1 if a_first else 2
+            if winner == a_seat:
+                sprt.record(1.0)
+            elif winner in (1, 2):
+                sprt.record(0.0)
+            else:
+                sprt.record(0.5)
+
+            result = sprt.status()
+            if result is None and sprt.games >= max_games:
+                result = "inconclusive"
+
+        if result is not None:
+            for future in pending:
+                future.cancel()
+        else:
+            while len(pending) < in_flight and submitted < max_games:
+                submit()
+
+    elo, margin = sprt.elo_estimate()
+    return {
+        "agent_a": agent_a.display_name(),
+        "agent_b": agent_b.display_name(),
+        "result": result,
+        "games": sprt.games,
+        "wins": sprt.wins,
+        "draws": sprt.draws,
+        "losses": sprt.losses,
+        "llr": sprt.llr(),
+        "bounds": [sprt.lower, sprt.upper],
+        "elo": elo,
+        "elo_margin": margin,
+        "time": time.time() - start,
+    }
+
+
+def run_tournament(agents: List[AgentSpec], elo0: float = 0.0, elo1: float = 20.0,
+                   alpha: float = 0.05, beta: float = 0.05, max_games: int = 1000,
+                   workers: Optional[int] = None, baseline: Optional[AgentSpec] = None,
+                   elo_path: Optional[str] = "results/elo.json", seed: int = 0) -> List[dict]:
+    workers = workers or default_workers()
+    table = EloTable(elo_path)
+
+    if baseline is not None:
+        pairs = [(agent, baseline) for agent in agents]
+    else:
+        pairs = list(itertools.combinations(agents, 2))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i, (agent_a, agent_b) in enumerate(pairs):
+            print(f"\n{'='*60}")
+            print(f"SPRT: {agent_a.display_name()} vs {agent_b.display_name()} "
+                  f"(elo0={elo0}, elo1={elo1}, alpha={alpha}, beta={beta})")
+            print(f"{'='*60}")
+
+            sprt = SPRT(elo0, elo1, alpha, beta)
+            result = run_sprt_pair(agent_a, agent_b, sprt, pool, in_flight=workers,
+                                   max_games=max_games, seed=seed + i)
+            results.append(result)
+
+            table.add(result["agent_a"], result["agent_b"], result["wins"], result["draws"], result["losses"])
+            table.save()
+
+            print(f"  Result: {result['result']} after {result['games']} games "
+                  f"(+{result['wins']} ={result['draws']} -{result['losses']}), "
+                  f"LLR {result['llr']:.2f} [{result['bounds'][0]:.2f}, {result['bounds'][1]:.2f}]")
+            print(f"  Elo: {result['elo']:+.1f} +/- {result['elo_margin']:.1f}  ({result['time']:.1f}s)")
+
+    played = sum(r["games"] for r in results)
+    print("\n" + "="*60)
+    print("Elo Table")
+    print("="*60)
+    table.print_table()
+    print(f"\nGames played: {played} of {len(pairs) * max_games} allowed "
+          f"({played / max(len(pairs) * max_games, 1):.1%})")
+    return results
+
+
+def check_sprt():
+    # Decisions on lopsided, drawn and empty records, fed through record()
+    for wins, draws, losses, expected in ((20, 0, 0, "H1"), (0, 0, 20, "H0"), (2, 0, 0, None),
+                                          (0, 0, 0, None), (0, 1, 0, None), (0, 30, 0, None),
+                                          (30, 10, 0, "H1"), (0, 10, 30, "H0"), (25, 10, 25, None)):
+        sprt = SPRT()
+        for score, count in ((1.0, wins), (0.5, draws), (0.0, losses)):
+            for _ in range(count):
+                sprt.record(score)
+        record = f"{wins}-{draws}-{losses}"
+        assert sprt.status() == expected, f"{record}: {sprt.status()} (llr {sprt.llr():.2f})"
+        print(f"  {record:<9} llr {sprt.llr():8.2f} -> {sprt.status()}")
+    print("SPRT checks passed.")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="SPRT tournament runner with a persistent Elo table")
+    parser.add_argument("agents", nargs="*", help="agent specs name[:sims][:k=v,...]")
+    parser.add_argument("--baseline", help="play every agent against this spec instead of round-robin")
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=20.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    parser.add_argument("--max-games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--elo-file", default="results/elo.json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check-sprt", action="store_true", help="only run the SPRT decision checks")
+    args = parser.parse_args(argv)
+
+    if args.check_sprt:
+        check_sprt()
+        return
+    if not args.agents:
+        parser.error("at least one agent spec is required")
+
+    run_tournament([parse_agent_spec(a) for a in args.agents],
+                   elo0=args.elo0, elo1=args.elo1, alpha=args.alpha, beta=args.beta,
+                   max_games=args.max_games, workers=args.workers,
+                   baseline=parse_agent_spec(args.baseline) if args.baseline else None,
+                   elo_path=args.elo_file, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
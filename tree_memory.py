@@ -0,0 +1,179 @@
+import sys
+from enum import Enum
+from typing import Any, Dict, Optional, Set
+
+# Shared or immutable objects that a node points at but does not own
+_SKIP_TYPES = (type, Enum, str, int, float, bool, type(None))
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None, skip: Optional[Set[int]] = None) -> int:
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or (skip and id(obj) in skip) or isinstance(obj, _SKIP_TYPES):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen, skip) + deep_sizeof(value, seen, skip)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, seen, skip)
+    elif hasattr(obj, '__dict__'):
+        size += deep_sizeof(obj.__dict__, seen, skip)
+    return size
+
+
+def _spec_ids(state) -> Set[int]:
+    if state is None:
+        return set()
+    return {id(mon.spec) for player in (state.player1, state.player2) for mon in player.team}
+
+
+def node_bytes(node) -> int:
+    # Bytes owned by one node: itself, its state and stats, but not its parent,
+    # its children or the dex specs that every cloned state shares.
+    skip = {id(node.parent)} | {id(child) for child in node.children.values()}
+    skip.update(_spec_ids(getattr(node, 'state', None)))
+    return deep_sizeof(node, skip=skip)
+
+
+def state_bytes(state) -> int:
+    # Open-loop nodes keep no state at all
+    if state is None:
+        return 0
+    return deep_sizeof(state, skip=_spec_ids(state))
+
+
+def stores_state(node) -> bool:
+    # Nodes without lazy state support always hold their state
+    return getattr(node, 'stores_state', True)
+
+
+def count_nodes(root) -> int:
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children.values())
+    return count
+
+
+class TreeBudget:
+    # Tracks how many nodes a search tree holds and, past max_nodes/max_bytes,
+    # collapses the least-visited subtrees into their roots. A collapsed node
+    # keeps its visit and win totals (they already include the whole subtree)
+    # and is simply re-expanded if the search comes back to it.
+
+    def __init__(self, max_nodes: Optional[int] = None, max_bytes: Optional[int] = None,
+                 low_water: float = 0.75):
+        self.limit_nodes = max_nodes
+        self.limit_bytes = max_bytes
+        self.max_nodes = max_nodes
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.bytes_per_node = 0
+        self.state_bytes = 0
+        self.nodes = 0
+        self.states = 0
+        self.peak_nodes = 0
+        self.pruned = 0
+        self.prunes = 0
+
+    def reset(self, root):
+        self.nodes = 0
+        self.states = 0
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            self.nodes += 1
+            self.states += stores_state(node)
+            stack.extend(node.children.values())
+        self.peak_nodes = self.nodes
+        self.pruned = 0
+        self.prunes = 0
+        self.max_nodes = self.limit_nodes
+        self.max_bytes = self.limit_bytes
+        if not self.bytes_per_node:
+            self.bytes_per_node = node_bytes(root)
+            self.state_bytes = state_bytes(getattr(root, 'state', None))
+
+    def tree_bytes(self) -> int:
+        return self.nodes * (self.bytes_per_node - self.state_bytes) + self.states * self.state_bytes
+
+    def over_limit(self) -> bool:
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            return True
+        return self.max_bytes is not None and self.tree_bytes() > self.max_bytes
+
+    def add_node(self, root, stored: bool = True, leaf=None):
+        # leaf is the node just expanded; the simulation still has to
+        # evaluate it and back up through its ancestors
+        self.nodes += 1
+        self.states += stored
+        if self.nodes > self.peak_nodes:
+            self.peak_nodes = self.nodes
+        if self.over_limit():
+            self.prune(root, leaf)
+
+    def add_state(self):
+        self.states += 1
+
+    def prune(self, root, leaf=None):
+        nodes_target = self.max_nodes * self.low_water if self.max_nodes is not None else float('inf')
+        bytes_target = self.max_bytes * self.low_water if self.max_bytes is not None else float('inf')
+
+        # A node's first visit comes before any child exists, so children always
+        # have fewer visits than their parent and sorting by visits handles
+        # descendants before ancestors; the subtree counts stay exact.
+        protected = set()
+        while leaf is not None:
+            protected.add(id(leaf))
+            leaf = leaf.parent
+        internal = []
+        stack = list(root.children.values())
+        while stack:
+            node = stack.pop()
+            if node.children:
+                if id(node) not in protected:
+                    internal.append(node)
+                stack.extend(node.children.values())
+        internal.sort(key=lambda n: n.visits)
+
+        for node in internal:
+            if self.nodes <= nodes_target and self.tree_bytes() <= bytes_target:
+                break
+            if not node.children:
+                continue
+            stack = list(node.children.values())
+            while stack:
+                child = stack.pop()
+                self.nodes -= 1
+                self.states -= stores_state(child)
+                self.pruned += 1
+                stack.extend(child.children.values())
+            node.children = {}
+        self.prunes += 1
+
+        # Nothing left to collapse (e.g. max_nodes below the root's own
+        # children): raise this move's limit so that the tree that remains is
+        # the low-water mark, instead of walking the whole tree again on every
+        # expansion; reset() restores the configured limits
+        if self.over_limit():
+            if self.max_nodes is not None:
+                self.max_nodes = max(self.max_nodes, int(self.nodes / self.low_water) + 1)
+            if self.max_bytes is not None:
+                self.max_bytes = max(self.max_bytes, int(self.tree_bytes() / self.low_water) + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "nodes": self.nodes,
+            "peak_nodes": self.peak_nodes,
+            "stored_states": self.states,
+            "tree_bytes": self.tree_bytes(),
+            "bytes_per_node": self.bytes_per_node,
+            "pruned_nodes": self.pruned,
+            "prunes": self.prunes,
+        }
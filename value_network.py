@@ -4,6 +4,25 @@ from typing import List, Tuple
 from battle_v2 import BattleState, PokemonInstance, PlayerState
 
 
+FEATURE_MY_ACTIVE_HP = 17
+FEATURE_OPP_ACTIVE_HP = 21
+FEATURE_MY_ALIVE = 24
+FEATURE_OPP_ALIVE = 25
+FEATURE_HP_SHARE = 28
+FEATURE_TURN = 29
+
+
+def _hp_ratio(mon: PokemonInstance) -> float:
+    return mon.current_hp / mon.spec.max_hp if not mon.fainted else 0.0
+
+
+def _hp_share(my_state: PlayerState, opp_state: PlayerState) -> float:
+    my_total_hp = sum(m.current_hp for m in my_state.team)
+    opp_total_hp = sum(m.current_hp for m in opp_state.team)
+    total = my_total_hp + opp_total_hp
+    return my_total_hp / total if total > 0 else 0.5
+
+
 class ValueNetwork:
     def __init__(self, input_size: int = 30, hidden_sizes: List[int] = [64, 32]):
         self.layer_sizes = [input_size] + hidden_sizes + [1]
@@ -28,12 +47,10 @@ class ValueNetwork:
         opp_state = state.player2 if player_id == 1 else state.player1
         
         for mon in my_state.team:
-            hp_ratio = mon.current_hp / mon.spec.max_hp if not mon.fainted else 0.0
-            features.append(hp_ratio)
+            features.append(_hp_ratio(mon))
         
         for mon in opp_state.team:
-            hp_ratio = mon.current_hp / mon.spec.max_hp if not mon.fainted else 0.0
-            features.append(hp_ratio)
+            features.append(_hp_ratio(mon))
         
         my_active = my_state.team[my_state.active_index]
         opp_active = opp_state.team[opp_state.active_index]
@@ -46,12 +63,12 @@ class ValueNetwork:
         features.append(my_active.spec.attack / 20.0)
         features.append(my_active.spec.defense / 20.0)
         features.append(my_active.spec.speed / 20.0)
-        features.append(my_active.current_hp / my_active.spec.max_hp if not my_active.fainted else 0.0)
+        features.append(_hp_ratio(my_active))
         
         features.append(opp_active.spec.attack / 20.0)
         features.append(opp_active.spec.defense / 20.0)
         features.append(opp_active.spec.speed / 20.0)
-        features.append(opp_active.current_hp / opp_active.spec.max_hp if not opp_active.fainted else 0.0)
+        features.append(_hp_ratio(opp_active))
         
         from battle_v2 import get_type_multiplier
         my_advantage = get_type_multiplier(my_active.spec.type, opp_active.spec.type)
@@ -73,16 +90,48 @@ class ValueNetwork:
         features.append(my_max_priority)
         features.append(opp_max_priority)
         
-        my_total_hp = sum(m.current_hp for m in my_state.team)
-        opp_total_hp = sum(m.current_hp for m in opp_state.team)
-        total = my_total_hp + opp_total_hp
-        hp_ratio = my_total_hp / total if total > 0 else 0.5
-        features.append(hp_ratio)
+        features.append(_hp_share(my_state, opp_state))
         
         features.append(min(state.turn_number / 30.0, 1.0))
         
         return np.array(features, dtype=np.float32).reshape(1, -1)
     
+    def update_features(self, parent_features: np.ndarray, parent_state: BattleState,
+                        state: BattleState, player_id: int = 1) -> np.ndarray:
+        # Incremental version of extract_features for a single step() transition.
+        # Everything derived from the active pair only changes on a switch, so
+        # in that case we fall back to a full extraction.
+        my_parent = parent_state.player1 if player_id == 1 else parent_state.player2
+        opp_parent = parent_state.player2 if player_id == 1 else parent_state.player1
+        my_state = state.player1 if player_id == 1 else state.player2
+        opp_state = state.player2 if player_id == 1 else state.player1
+        
+        if (my_state.active_index != my_parent.active_index or
+                opp_state.active_index != opp_parent.active_index):
+            return self.extract_features(state, player_id)
+        
+        features = parent_features.copy()
+        row = features[0]
+        hp_changed = False
+        
+        for offset, team, parent_team in ((0, my_state.team, my_parent.team),
+                                          (3, opp_state.team, opp_parent.team)):
+            for i, (mon, parent_mon) in enumerate(zip(team, parent_team)):
+                if mon.current_hp != parent_mon.current_hp or mon.fainted != parent_mon.fainted:
+                    row[offset + i] = _hp_ratio(mon)
+                    hp_changed = True
+        
+        if hp_changed:
+            row[FEATURE_MY_ACTIVE_HP] = row[my_state.active_index]
+            row[FEATURE_OPP_ACTIVE_HP] = row[3 + opp_state.active_index]
+            row[FEATURE_MY_ALIVE] = sum(1 for m in my_state.team if not m.fainted) / 3.0
+            row[FEATURE_OPP_ALIVE] = sum(1 for m in opp_state.team if not m.fainted) / 3.0
+            row[FEATURE_HP_SHARE] = _hp_share(my_state, opp_state)
+        
+        row[FEATURE_TURN] = min(state.turn_number / 30.0, 1.0)
+        
+        return features
+    
     def relu(self, x: np.ndarray) -> np.ndarray:
         return np.maximum(0, x)
     
@@ -101,6 +150,16 @@ class ValueNetwork:
         
         return float(output[0, 0])
     
+    def forward_batch(self, x: np.ndarray) -> np.ndarray:
+        activation = x
+        
+        for i in range(len(self.weights) - 1):
+            activation = activation @ self.weights[i] + self.biases[i]
+            activation = self.relu(activation)
+        
+        activation = activation @ self.weights[-1] + self.biases[-1]
+        return self.sigmoid(activation)[:, 0]
+    
     def predict(self, state: BattleState, player_id: int = 1) -> float: 
         features = self.extract_features(state, player_id)
         return self.forward(features)
@@ -138,22 +197,56 @@ class ValueNetwork:
         
         return float(error ** 2)
     
-    def save(self, filepath: str):
+    def train_batch(self, features: np.ndarray, targets: np.ndarray, learning_rate: float = 0.01) -> float:
+        targets = targets.reshape(-1, 1)
+        batch_size = features.shape[0]
+        
+        activations = [features]
+        activation = features
+        
+        for i in range(len(self.weights) - 1):
+            z = activation @ self.weights[i] + self.biases[i]
+            activation = self.relu(z)
+            activations.append(activation)
+        
+        z_out = activation @ self.weights[-1] + self.biases[-1]
+        output = self.sigmoid(z_out)
+        
+        error = output - targets
+        delta = error * output * (1 - output) / batch_size
+        
+        weight_grads = [activations[-1].T @ delta]
+        bias_grads = [delta.sum(axis=0, keepdims=True)]
+        
+        for i in range(len(self.weights) - 2, -1, -1):
+            delta = (delta @ self.weights[i + 1].T) * (activations[i + 1] > 0)
+            weight_grads.insert(0, activations[i].T @ delta)
+            bias_grads.insert(0, delta.sum(axis=0, keepdims=True))
+        
+        for i in range(len(self.weights)):
+            self.weights[i] -= learning_rate * weight_grads[i]
+            self.biases[i] -= learning_rate * bias_grads[i]
+        
+        return float(np.mean(error ** 2))
+    
+    def save(self, filepath: str, verbose: bool = True):
         with open(filepath, 'wb') as f:
             pickle.dump({
                 'weights': self.weights,
                 'biases': self.biases,
                 'layer_sizes': self.layer_sizes
             }, f)
-        print(f"Value network saved to {filepath}")
+        if verbose:
+            print(f"Value network saved to {filepath}")
     
-    def load(self, filepath: str):
+    def load(self, filepath: str, verbose: bool = True):
         with open(filepath, 'rb') as f:
             data = pickle.load(f)
             self.weights = data['weights']
             self.biases = data['biases']
             self.layer_sizes = data['layer_sizes']
-        print(f"Value network loaded from {filepath}")
+        if verbose:
+            print(f"Value network loaded from {filepath}")
 
 
 def create_default_network() -> ValueNetwork:
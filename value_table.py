@@ -0,0 +1,199 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from battle_v2 import BattleState, PlayerState, PokemonInstance, PokemonSpec
+from value_network import ValueNetwork, create_default_network
+
+TURN_HORIZON = 30
+
+
+def _meta_path(table_path: str) -> str:
+    return os.path.splitext(table_path)[0] + ".json"
+
+
+def _file_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+
+
+def _bucket_hp(spec: PokemonSpec, bucket: int, hp_buckets: int) -> int:
+    if bucket == 0:
+        return 0
+    return max(1, round(spec.max_hp * (bucket - 0.5) / hp_buckets))
+
+
+def distill_value_network(net: ValueNetwork,
+                          team1: List[PokemonSpec],
+                          team2: List[PokemonSpec],
+                          table_path: str = "value_table.npy",
+                          hp_buckets: int = 5,
+                          turn_buckets: int = 4,
+                          network_hash: Optional[str] = None) -> dict:
+    # Axes: player, p1 active, p2 active, p1 HP buckets x3, p2 HP buckets x3, turn bucket.
+    # HP bucket 0 means fainted; buckets 1..hp_buckets split (0, max_hp].
+    n_hp = hp_buckets + 1
+    shape = (2, 3, 3) + (n_hp,) * 6 + (turn_buckets,)
+    table = np.lib.format.open_memmap(table_path, mode='w+', dtype=np.float32, shape=shape)
+
+    start = time.time()
+
+    hp_values = [[np.array([_bucket_hp(spec, b, hp_buckets) for b in range(n_hp)], dtype=np.int64)
+                  for spec in team] for team in (team1, team2)]
+    max_hps = [[spec.max_hp for spec in team] for team in (team1, team2)]
+
+    grid = np.meshgrid(*([np.arange(n_hp)] * 6), np.arange(turn_buckets), indexing='ij')
+    grid = [g.reshape(-1) for g in grid]
+    hp = [[hp_values[p][i][grid[3 * p + i]] for i in range(3)] for p in range(2)]
+    ratios = [[np.where(grid[3 * p + i] == 0, 0.0, hp[p][i] / max_hps[p][i]) for i in range(3)]
+              for p in range(2)]
+    alive = [sum((grid[3 * p + i] > 0).astype(np.int64) for i in range(3)) / 3.0 for p in range(2)]
+    totals = [hp[p][0] + hp[p][1] + hp[p][2] for p in range(2)]
+    turn_rep = (grid[6] + 0.5) * TURN_HORIZON / turn_buckets
+    turn_feature = np.minimum(np.floor(turn_rep) / 30.0, 1.0)
+
+    for player_id in (1, 2):
+        me = player_id - 1
+        opp = 1 - me
+        hp_sum = totals[me] + totals[opp]
+        hp_share = np.where(hp_sum > 0, totals[me] / np.maximum(hp_sum, 1), 0.5)
+
+        for a1 in range(3):
+            for a2 in range(3):
+                state = BattleState(
+                    player1=PlayerState(team=[PokemonInstance.from_spec(s) for s in team1], active_index=a1),
+                    player2=PlayerState(team=[PokemonInstance.from_spec(s) for s in team2], active_index=a2)
+                )
+                template = net.extract_features(state, player_id)[0]
+                my_active = a1 if player_id == 1 else a2
+                opp_active = a2 if player_id == 1 else a1
+
+                features = np.tile(template, (len(grid[0]), 1))
+                for i in range(3):
+                    features[:, i] = ratios[me][i]
+                    features[:, 3 + i] = ratios[opp][i]
+                features[:, 17] = ratios[me][my_active]
+                features[:, 21] = ratios[opp][opp_active]
+                features[:, 24] = alive[me]
+                features[:, 25] = alive[opp]
+                features[:, 28] = hp_share
+                features[:, 29] = turn_feature
+
+                values = net.forward_batch(features)
+                table[player_id - 1, a1, a2] = values.reshape(shape[3:])
+
+    table.flush()
+    elapsed = time.time() - start
+
+    meta = {
+        "team1": [spec.name for spec in team1],
+        "team2": [spec.name for spec in team2],
+        "hp_buckets": hp_buckets,
+        "turn_buckets": turn_buckets,
+        "shape": list(shape),
+        "network_hash": network_hash,
+    }
+    with open(_meta_path(table_path), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    return {"entries": int(table.size), "bytes": int(table.nbytes), "time": elapsed}
+
+
+class ValueTableEvaluator:
+    def __init__(self, table_path: str = "value_table.npy",
+                 fallback: Optional[ValueNetwork] = None):
+        with open(_meta_path(table_path)) as f:
+            meta = json.load(f)
+
+        self.team1_names = tuple(meta["team1"])
+        self.team2_names = tuple(meta["team2"])
+        self.hp_buckets = meta["hp_buckets"]
+        self.turn_buckets = meta["turn_buckets"]
+        self.fallback = fallback
+
+        table = np.load(table_path, mmap_mode='r')
+        self.table = table.reshape(-1)
+        self.strides = [s // table.itemsize for s in table.strides]
+
+    def matches(self, state: BattleState) -> bool:
+        return (tuple(m.spec.name for m in state.player1.team) == self.team1_names and
+                tuple(m.spec.name for m in state.player2.team) == self.team2_names)
+
+    def predict(self, state: BattleState, player_id: int = 1) -> float:
+        if not self.matches(state):
+            if self.fallback is None:
+                raise ValueError("State teams do not match the distilled value table")
+            return self.fallback.predict(state, player_id)
+
+        b = self.hp_buckets
+        strides = self.strides
+        p1 = state.player1
+        p2 = state.player2
+
+        index = ((player_id - 1) * strides[0] + p1.active_index * strides[1] +
+                 p2.active_index * strides[2])
+        for i, mon in enumerate(p1.team):
+            if not mon.fainted:
+                index += ((mon.current_hp * b + mon.spec.max_hp - 1) // mon.spec.max_hp) * strides[3 + i]
+        for i, mon in enumerate(p2.team):
+            if not mon.fainted:
+                index += ((mon.current_hp * b + mon.spec.max_hp - 1) // mon.spec.max_hp) * strides[6 + i]
+        index += min(self.turn_buckets - 1, state.turn_number * self.turn_buckets // TURN_HORIZON)
+
+        return float(self.table[index])
+
+
+def load_or_distill(network_path: str = "value_network_v1.pkl",
+                    table_path: str = "value_table.npy",
+                    hp_buckets: int = 5,
+                    turn_buckets: int = 4) -> ValueTableEvaluator:
+    # The network doubles as the fallback for other team pairs, and a table
+    # distilled from an older network file is rebuilt
+    net = None
+    network_hash = None
+    if os.path.exists(network_path):
+        net = create_default_network()
+        net.load(network_path, verbose=False)
+        network_hash = _file_hash(network_path)
+
+    stale = not os.path.exists(table_path) or not os.path.exists(_meta_path(table_path))
+    if not stale and network_hash is not None:
+        with open(_meta_path(table_path)) as f:
+            meta = json.load(f)
+        stale = (meta.get("network_hash") != network_hash or meta.get("hp_buckets") != hp_buckets or
+                 meta.get("turn_buckets") != turn_buckets)
+
+    if stale:
+        from train_value_network import create_teams
+
+        if net is None:
+            raise FileNotFoundError(f"Value network {network_path} not found")
+        team1, team2 = create_teams()
+        stats = distill_value_network(net, [m.spec for m in team1], [m.spec for m in team2],
+                                      table_path, hp_buckets, turn_buckets, network_hash)
+        print(f"Distilled {stats['entries']} entries ({stats['bytes'] / 1e6:.1f} MB) "
+              f"in {stats['time']:.1f}s -> {table_path}")
+
+    return ValueTableEvaluator(table_path, fallback=net)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distil a value network into a memory-mapped lookup table")
+    parser.add_argument("--network", default="value_network_v1.pkl")
+    parser.add_argument("--output", default="value_table.npy")
+    parser.add_argument("--hp-buckets", type=int, default=5)
+    parser.add_argument("--turn-buckets", type=int, default=4)
+    args = parser.parse_args()
+
+    if os.path.exists(args.output):
+        os.remove(args.output)
+    load_or_distill(args.network, args.output, args.hp_buckets, args.turn_buckets)
+
+
+if __name__ == "__main__":
+    main()